@@ -10,7 +10,7 @@ class CallAnalysisWidget(WidgetFramework):
         super().__init__(widget_configuration)
         self.force_refresh = widget_configuration.get("force_refresh", False)
 
-        if self.is_recalc_needed() or self.force_refresh:
+        if self.should_calculate():
             self._calculate_metrics()
 
     def _calculate_metrics(self):
@@ -84,7 +84,8 @@ class CallAnalysisWidget(WidgetFramework):
                     "contact_channels": {},
                     "agent_performance": {},
                     "last_modified": int(datetime.now().timestamp()),
-                }
+                },
+                cacheable=False,
             )
 
     def render(self):
@@ -264,7 +265,9 @@ class CallAnalysisWidget(WidgetFramework):
         ui.highchart(chart_data).classes("w-full h-64")
 
 
-def create_call_analysis_widget(widget_configuration: dict = None, force_refresh=False):
+def create_call_analysis_widget(
+    widget_configuration: dict = None, force_refresh=False, defer_calculation=False
+):
     """Factory function to create a new CallAnalysisWidget instance."""
     if widget_configuration is None:
         widget_configuration = {
@@ -272,5 +275,6 @@ def create_call_analysis_widget(widget_configuration: dict = None, force_refresh
             "company_id": "ALL",
             "widget_id": "wgt_call_analysis",
             "force_refresh": force_refresh,
+            "defer_calculation": defer_calculation,
         }
     return CallAnalysisWidget(widget_configuration)
@@ -13,41 +13,9 @@ class ClientMetricsWidget(WidgetFramework):
         self.list_manager = ListManager()
         self.client_map = self.list_manager.get_list("client_map")
 
-        # Verify data loaded from parent
-        for dataset in self.required_datasets:
-            df = self.data_store.get(dataset)
-
-        if self.is_recalc_needed() or self.force_refresh:
+        if self.should_calculate():
             self._calculate_metrics()
 
-    def _safe_date_convert(self, row, prefix):
-        """Safely convert date components to a datetime"""
-        try:
-            month = row[f"{prefix}_month"]
-            day = row[f"{prefix}_day"]
-            year = row[f"{prefix}_year"]
-
-            if pd.isna(month) or pd.isna(day) or pd.isna(year):
-                return pd.NaT
-
-            # Convert float values to integers
-            month = int(float(month))
-            day = int(float(day))
-            year = int(float(year))
-
-            # Validate date components
-            if month < 1 or month > 12 or day < 1 or day > 31 or year < 1900:
-                return pd.NaT
-
-            # Create date string directly
-            date_str = f"{year:04d}-{month:02d}-{day:02d}"
-            return pd.to_datetime(date_str)
-
-        except Exception as e:
-            print(f"Error converting date: {str(e)} for {prefix}")
-            print(f"Values - Month: {month}, Day: {day}, Year: {year}")
-            return pd.NaT
-
     def _calculate_metrics(self):
         """Calculate all metrics and cache them"""
         metrics = {}
@@ -65,27 +33,87 @@ class ClientMetricsWidget(WidgetFramework):
     def _calculate_client_metrics(self):
         """Calculate aggregate performance metrics at client level"""
         accounts_df = self.get_accounts()
-        accounts_df["listed_date"] = accounts_df.apply(
-            lambda x: self._safe_date_convert(x, "listed_date"), axis=1
+        accounts_df["listed_date"] = self.get_date_column(
+            "accounts", "listed_date", min_year=1900
         )
 
         transactions_df = self.get_transactions()
-        transactions_df["payment_date"] = transactions_df.apply(
-            lambda x: self._safe_date_convert(x, "payment_date"), axis=1
+        transactions_df["payment_date"] = self.get_date_column(
+            "transactions", "payment_date", min_year=1900
+        )
+
+        accounts = pd.DataFrame(
+            {
+                "client_number": accounts_df["client_number"],
+                "file_number": accounts_df["file_number"],
+                "listed_date": accounts_df["listed_date"],
+                "loaded": accounts_df["original_upb_loaded"].astype(float),
+            }
+        )
+        # Accounts without a client number match no client and only get zeros
+        accounts = accounts[accounts["client_number"].notna()]
+        # Transactions without a file number belong to no client
+        transactions = pd.DataFrame(
+            {
+                "file_number": transactions_df["file_number"],
+                "amount": transactions_df["payment_amount"].astype(float),
+            }
+        )
+        transactions = transactions[transactions["file_number"].notna()]
+
+        # Client totals; payments are joined once per distinct client file
+        by_client = accounts.groupby("client_number")
+        totals = pd.DataFrame(
+            {
+                "total_placements": by_client["listed_date"].nunique(dropna=False),
+                "total_loaded": by_client["loaded"].sum(),
+                "total_accounts": by_client.size(),
+            }
+        )
+        client_payments = (
+            accounts[["client_number", "file_number"]]
+            .drop_duplicates()
+            .merge(transactions, on="file_number")
+            .groupby("client_number")
+        )
+        totals["total_collected"] = client_payments["amount"].sum()
+        totals["paying_accounts"] = client_payments["file_number"].nunique()
+        totals = totals.fillna({"total_collected": 0.0, "paying_accounts": 0})
+
+        # Liquidation rate of each placement (accounts listed on the same date)
+        keys = ["client_number", "listed_date"]
+        placements = accounts[accounts["listed_date"].notna()]
+        placement_loaded = placements.groupby(keys, sort=False)["loaded"].sum()
+        placement_collected = (
+            placements[keys + ["file_number"]]
+            .drop_duplicates()
+            .merge(transactions, on="file_number")
+            .groupby(keys)["amount"]
+            .sum()
+            .reindex(placement_loaded.index, fill_value=0.0)
+        )
+        placement_rates = (placement_collected / placement_loaded * 100)[
+            placement_loaded > 0
+        ]
+        # Rates stay in the order each client's placements were first listed
+        client_rates = placement_rates.groupby(level="client_number", sort=False).agg(
+            list
         )
 
         clients = []
         for client_number in accounts_df["client_number"].unique():
-            client_accounts = accounts_df[accounts_df["client_number"] == client_number]
-            client_payments = transactions_df[
-                transactions_df["file_number"].isin(client_accounts["file_number"])
-            ]
-
-            total_placements = len(client_accounts["listed_date"].unique())
-            total_loaded = client_accounts["original_upb_loaded"].sum()
-            total_accounts = len(client_accounts)
-            total_collected = client_payments["payment_amount"].sum()
-            paying_accounts = client_payments["file_number"].nunique()
+            if client_number in totals.index:
+                client = totals.loc[client_number]
+                total_placements = int(client["total_placements"])
+                total_loaded = float(client["total_loaded"])
+                total_accounts = int(client["total_accounts"])
+                total_collected = float(client["total_collected"])
+                paying_accounts = int(client["paying_accounts"])
+                monthly_rates = client_rates.get(client_number, [])
+            else:
+                total_placements = total_accounts = paying_accounts = 0
+                total_loaded = total_collected = 0
+                monthly_rates = []
 
             avg_liquidation = (
                 (total_collected / total_loaded * 100) if total_loaded > 0 else 0
@@ -94,22 +122,6 @@ class ClientMetricsWidget(WidgetFramework):
                 (paying_accounts / total_accounts * 100) if total_accounts > 0 else 0
             )
 
-            monthly_rates = []
-            for placement_date in client_accounts["listed_date"].unique():
-                if pd.isna(placement_date):
-                    continue
-
-                placement = client_accounts[
-                    client_accounts["listed_date"] == placement_date
-                ]
-                placement_loaded = placement["original_upb_loaded"].sum()
-
-                if placement_loaded > 0:
-                    placement_collected = transactions_df[
-                        transactions_df["file_number"].isin(placement["file_number"])
-                    ]["payment_amount"].sum()
-                    monthly_rates.append((placement_collected / placement_loaded) * 100)
-
             liquidation_std = np.std(monthly_rates) if monthly_rates else 0
 
             performance_trend = 0
@@ -228,14 +240,27 @@ class ClientMetricsWidget(WidgetFramework):
 
 
 def create_client_metrics_widget(
-    widget_configuration: dict = None, force_refresh=False
+    widget_configuration: dict = None, force_refresh=False, defer_calculation=False
 ):
     """Factory function to create a new ClientMetricsWidget instance."""
     if widget_configuration is None:
         widget_configuration = {
-            "required_datasets": ["accounts", "transactions"],
+            "required_datasets": {
+                "accounts": {
+                    "columns": [
+                        "client_number",
+                        "file_number",
+                        "original_upb_loaded",
+                        "listed_date",
+                    ]
+                },
+                "transactions": {
+                    "columns": ["file_number", "payment_amount", "payment_date"]
+                },
+            },
             "company_id": "ALL",
             "widget_id": "wgt_client_metrics",
             "force_refresh": force_refresh,
+            "defer_calculation": defer_calculation,
         }
     return ClientMetricsWidget(widget_configuration)
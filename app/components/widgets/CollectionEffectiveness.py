@@ -7,6 +7,9 @@ from modules import ListManager
 
 
 class CollectionEffectivenessWidget(WidgetFramework):
+    # The client selector and the performance and pattern tabs read raw rows
+    RENDER_DATASETS = ("contacts", "transactions")
+
     def __init__(self, widget_configuration: dict):
         super().__init__(widget_configuration)
         self.force_refresh = widget_configuration.get("force_refresh", False)
@@ -28,30 +31,13 @@ class CollectionEffectivenessWidget(WidgetFramework):
             "Other": ["CRA", "DEC", "SKP", "RTP"],
         }
 
-        if self.is_recalc_needed() or self.force_refresh:
+        if self.should_calculate():
             self._calculate_metrics()
 
     def _get_client_name(self, client_number):
         """Helper to get client name from number with fallback"""
         return self.client_map.get(str(client_number), f"Client {client_number}")
 
-    def _convert_date(self, row, prefix):
-        """Convert date components using create_date function"""
-        try:
-            month = row[f"{prefix}_month"]
-            day = row[f"{prefix}_day"]
-            year = row[f"{prefix}_year"]
-
-            # Skip if any component is None or 'None'
-            if any(str(x).lower() == "none" or pd.isna(x) for x in [month, day, year]):
-                return pd.NaT
-
-            # Format date string directly with zero-padding
-            date_str = f"{year:04d}-{month:02d}-{day:02d}"
-            return pd.to_datetime(date_str)
-        except Exception as e:
-            return pd.NaT
-
     def _clean_payment_amount(self, amount):
         """Clean and convert payment amount to float"""
         try:
@@ -104,22 +90,28 @@ class CollectionEffectivenessWidget(WidgetFramework):
             )
 
             # Convert and filter posted dates
-            transactions_df["posted_date"] = transactions_df.apply(
-                lambda x: self._convert_date(x, "posted_date"), axis=1
+            transactions_df["posted_date"] = self.get_date_column(
+                "transactions", "posted_date"
             )
             transactions_df = transactions_df.dropna(subset=["posted_date"])
 
             # Convert payment dates
-            transactions_df["payment_date"] = transactions_df.apply(
-                lambda x: self._convert_date(x, "payment_date"), axis=1
+            transactions_df["payment_date"] = self.get_date_column(
+                "transactions", "payment_date"
             )
 
+            # Status transitions for all clients at once
+            status_transitions = self._calculate_status_transitions(contacts_df)
+
             # Process each client
             unique_clients = contacts_df["client_number"].dropna().unique()
 
             for client in unique_clients:
                 client_metrics = self._calculate_client_metrics(
-                    client, contacts_df, transactions_df
+                    client,
+                    contacts_df,
+                    transactions_df,
+                    status_transitions.get(client, {}),
                 )
                 metrics[client] = client_metrics
 
@@ -132,7 +124,9 @@ class CollectionEffectivenessWidget(WidgetFramework):
         except Exception as e:
             print(f"Error in _calculate_metrics: {str(e)}")
 
-    def _calculate_client_metrics(self, client, contacts_df, transactions_df):
+    def _calculate_client_metrics(
+        self, client, contacts_df, transactions_df, status_transitions
+    ):
         """Calculate metrics for a specific client"""
         try:
             # Filter for client
@@ -147,9 +141,6 @@ class CollectionEffectivenessWidget(WidgetFramework):
                 client_contacts, client_transactions
             )
 
-            # Calculate status transitions
-            status_transitions = self._calculate_status_transitions(client_contacts)
-
             # Calculate transaction metrics
             valid_payments = client_transactions[
                 client_transactions["payment_amount"] > 0
@@ -195,8 +186,8 @@ class CollectionEffectivenessWidget(WidgetFramework):
             ].copy()
 
             # Convert payment dates and filter invalid dates
-            valid_transactions["payment_date"] = valid_transactions.apply(
-                lambda x: self._convert_date(x, "payment_date"), axis=1
+            valid_transactions["payment_date"] = self.get_date_column(
+                "transactions", "payment_date"
             )
             valid_transactions = valid_transactions.dropna(subset=["payment_date"])
 
@@ -237,17 +228,35 @@ class CollectionEffectivenessWidget(WidgetFramework):
             return {}
 
     def _calculate_status_transitions(self, contacts_df):
-        """Calculate status transition patterns"""
-        transitions = defaultdict(int)
-        sorted_contacts = contacts_df.sort_values(["file_number", "created_date"])
+        """Count "A|B" status transitions between consecutive contacts of each file, per client"""
+        try:
+            sorted_contacts = contacts_df.sort_values(
+                ["client_number", "file_number", "created_date"], kind="stable"
+            )
+            client = sorted_contacts["client_number"]
+            file_number = sorted_contacts["file_number"]
+            status = sorted_contacts["account_status"].astype(str)
+
+            # Pair each contact with the next one on the same client file
+            has_next = (client == client.shift(-1)) & (
+                file_number == file_number.shift(-1)
+            )
+            pairs = pd.DataFrame(
+                {
+                    "client_number": client[has_next],
+                    "transition": status[has_next] + "|" + status.shift(-1)[has_next],
+                }
+            )
+            counts = pairs.groupby(["client_number", "transition"], sort=False).size()
 
-        for _, group in sorted_contacts.groupby("file_number"):
-            statuses = group["account_status"].tolist()
-            for i in range(len(statuses) - 1):
-                transition_key = f"{statuses[i]}|{statuses[i + 1]}"
-                transitions[transition_key] += 1
+            transitions = defaultdict(dict)
+            for (client_number, transition), count in counts.items():
+                transitions[client_number][transition] = int(count)
+            return dict(transitions)
 
-        return dict(transitions)
+        except Exception as e:
+            print(f"Error in _calculate_status_transitions: {str(e)}")
+            return {}
 
     def render(self):
         """Render the collection effectiveness dashboard"""
@@ -430,8 +439,8 @@ class CollectionEffectivenessWidget(WidgetFramework):
                 return
 
             # Convert dates
-            valid_payments["payment_date"] = valid_payments.apply(
-                lambda x: self._convert_date(x, "payment_date"), axis=1
+            valid_payments["payment_date"] = self.get_date_column(
+                "transactions", "payment_date"
             )
             valid_payments = valid_payments.dropna(subset=["payment_date"])
 
@@ -536,8 +545,8 @@ class CollectionEffectivenessWidget(WidgetFramework):
             )
 
             # Convert and filter posted dates
-            transactions_df["posted_date"] = transactions_df.apply(
-                lambda x: self._convert_date(x, "posted_date"), axis=1
+            transactions_df["posted_date"] = self.get_date_column(
+                "transactions", "posted_date"
             )
             transactions_df = transactions_df.dropna(subset=["posted_date"])
 
@@ -559,8 +568,8 @@ class CollectionEffectivenessWidget(WidgetFramework):
                 return
 
             # Convert dates and calculate day of week
-            valid_payments["payment_date"] = valid_payments.apply(
-                lambda x: self._convert_date(x, "payment_date"), axis=1
+            valid_payments["payment_date"] = self.get_date_column(
+                "transactions", "payment_date"
             )
             valid_payments["day_of_week"] = pd.to_datetime(
                 valid_payments["payment_date"]
@@ -690,7 +699,7 @@ class CollectionEffectivenessWidget(WidgetFramework):
 
 
 def create_collection_effectiveness_widget(
-    widget_configuration: dict = None, force_refresh=False
+    widget_configuration: dict = None, force_refresh=False, defer_calculation=False
 ):
     """Factory function to create a new CollectionEffectivenessWidget instance."""
     if widget_configuration is None:
@@ -699,5 +708,6 @@ def create_collection_effectiveness_widget(
             "company_id": "ALL",
             "widget_id": "wgt_collection_effectiveness",
             "force_refresh": force_refresh,
+            "defer_calculation": defer_calculation,
         }
     return CollectionEffectivenessWidget(widget_configuration)
@@ -13,6 +13,9 @@ class CollectionInsightsWidget(WidgetFramework):
     comprehensive understanding of collection patterns and trends.
     """
 
+    # The recent trend covers the last 30 days
+    CACHE_PERIOD = "%Y-%m-%d"
+
     def __init__(self, widget_configuration: dict):
         super().__init__(widget_configuration)
         self.force_refresh = widget_configuration.get("force_refresh", False)
@@ -23,7 +26,7 @@ class CollectionInsightsWidget(WidgetFramework):
         )
         self.insights_cache = {}
 
-        if self.is_recalc_needed() or self.force_refresh:
+        if self.should_calculate():
             self._calculate_metrics()
 
     def _calculate_metrics(self):
@@ -35,7 +38,11 @@ class CollectionInsightsWidget(WidgetFramework):
         metrics = {
             "payment_patterns": {
                 "total_collected": float(self.payment_patterns["total_collected"]),
-                "avg_payment": float(self.payment_patterns["avg_payment"]),
+                "avg_payment": (
+                    float(self.payment_patterns["avg_payment"])
+                    if pd.notna(self.payment_patterns["avg_payment"])
+                    else None
+                ),
                 "payment_count": int(self.payment_patterns["payment_count"]),
                 "unique_accounts": int(self.payment_patterns["unique_accounts"]),
             },
@@ -60,6 +67,9 @@ class CollectionInsightsWidget(WidgetFramework):
             "last_modified": int(datetime.now().timestamp()),
         }
 
+        # Prompts are built from the metrics just computed
+        self.set_cached(metrics)
+
         # Generate and cache all insights upfront
         for analysis_type in ["payment_patterns", "status_trends", "recommendations"]:
             prompt_template, variables = self._generate_analysis_prompt(analysis_type)
@@ -68,8 +78,11 @@ class CollectionInsightsWidget(WidgetFramework):
                 prompt=prompt_template, variables=variables
             )
 
+        # Insights that failed to generate are retried on the next load
+        cacheable = GroqMiddleware.ERROR_RESPONSE not in metrics["insights"].values()
+
         # Update cache
-        self.update_metric_cache(metrics)
+        self.update_metric_cache(metrics, cacheable=cacheable)
 
     def _preprocess_data(self):
         """Prepare data for analysis and insight generation."""
@@ -78,50 +91,12 @@ class CollectionInsightsWidget(WidgetFramework):
         accounts_df = self.get_accounts()
 
         # Create datetime fields
-        def create_date(df, year_col, month_col, day_col):
-            # Create a copy to avoid modifying original
-            date_df = df[[year_col, month_col, day_col]].copy()
-
-            # Fill NA/inf values with defaults
-            date_df[year_col] = pd.to_numeric(
-                date_df[year_col], errors="coerce"
-            ).fillna(1900)
-            date_df[month_col] = pd.to_numeric(
-                date_df[month_col], errors="coerce"
-            ).fillna(1)
-            date_df[day_col] = pd.to_numeric(date_df[day_col], errors="coerce").fillna(
-                1
-            )
-
-            # Convert to integers after handling NA/inf
-            date_df[year_col] = date_df[year_col].astype(int)
-            date_df[month_col] = date_df[month_col].astype(int).clip(1, 12)
-            date_df[day_col] = date_df[day_col].astype(int).clip(1, 31)
-
-            # Format with zero-padding
-            date_strings = (
-                date_df[year_col].astype(str)
-                + "-"
-                + date_df[month_col].map(lambda x: f"{x:02d}")
-                + "-"
-                + date_df[day_col].map(lambda x: f"{x:02d}")
-            )
-
-            # Convert to datetime
-            return pd.to_datetime(date_strings, format="%Y-%m-%d", errors="coerce")
-
-        transactions_df["date"] = create_date(
-            transactions_df,
-            "posted_date_year",
-            "posted_date_month",
-            "posted_date_day",
+        transactions_df["date"] = self.get_date_column(
+            "transactions", "posted_date", fill_missing=True
         )
 
-        comments_df["date"] = create_date(
-            comments_df,
-            "created_date_year",
-            "created_date_month",
-            "created_date_day",
+        comments_df["date"] = self.get_date_column(
+            "contacts", "created_date", fill_missing=True
         )
 
         # Calculate metrics for insight generation
@@ -153,7 +128,7 @@ class CollectionInsightsWidget(WidgetFramework):
             if pd.isna(avg_days):
                 avg_days = 0.0
 
-            recent_trend = self._calculate_recent_trend(transactions_df)
+            recent_trend = self._calculate_recent_trend()
 
             return {
                 "avg_days_to_payment": float(avg_days),
@@ -170,21 +145,22 @@ class CollectionInsightsWidget(WidgetFramework):
                 },
             }
 
-    def _calculate_recent_trend(self, transactions_df):
+    def _calculate_recent_trend(self):
         """Calculate recent collection trends safely."""
         try:
             recent_cutoff = datetime.now() - timedelta(days=30)
+            daily = self.get_rollup(
+                "transactions", ["posted_date"], fill_missing=True
+            ).rename(columns={"posted_date": "date"})
 
             # Calculate recent payments
-            recent_mask = transactions_df["date"] >= recent_cutoff
-            recent_payments = transactions_df[recent_mask]["payment_amount"].sum()
+            recent_mask = daily["date"] >= recent_cutoff
+            recent_payments = daily[recent_mask]["total"].sum()
 
             # Calculate previous payments
             prev_cutoff = recent_cutoff - timedelta(days=30)
-            prev_mask = (transactions_df["date"] < recent_cutoff) & (
-                transactions_df["date"] >= prev_cutoff
-            )
-            previous_payments = transactions_df[prev_mask]["payment_amount"].sum()
+            prev_mask = (daily["date"] < recent_cutoff) & (daily["date"] >= prev_cutoff)
+            previous_payments = daily[prev_mask]["total"].sum()
 
             # Calculate change percentage
             if previous_payments > 0:
@@ -219,7 +195,9 @@ class CollectionInsightsWidget(WidgetFramework):
                 metrics_for_prompt = {
                     "Payment Metrics": {
                         "Total Collections": f"${cached_metrics['payment_patterns']['total_collected']:,.2f}",
-                        "Average Payment": f"${cached_metrics['payment_patterns']['avg_payment']:,.2f}",
+                        "Average Payment": self.format_amount(
+                            cached_metrics["payment_patterns"]["avg_payment"]
+                        ),
                         "Total Payments": f"{cached_metrics['payment_patterns']['payment_count']:,}",
                         "Unique Accounts": f"{cached_metrics['payment_patterns']['unique_accounts']:,}",
                     },
@@ -361,7 +339,11 @@ class CollectionInsightsWidget(WidgetFramework):
                         ),
                         (
                             "Average Payment",
-                            f"${metrics.get('payment_patterns', {}).get('avg_payment', 0):,.2f}",
+                            self.format_amount(
+                                metrics.get("payment_patterns", {}).get(
+                                    "avg_payment", 0
+                                )
+                            ),
                         ),
                         (
                             "Total Payments",
@@ -505,7 +487,7 @@ class CollectionInsightsWidget(WidgetFramework):
 
 
 def create_collection_insights_widget(
-    widget_configuration: dict = None, force_refresh=False
+    widget_configuration: dict = None, force_refresh=False, defer_calculation=False
 ):
     """Factory function to create a new CollectionInsightsWidget instance."""
     if widget_configuration is None:
@@ -514,5 +496,6 @@ def create_collection_insights_widget(
             "company_id": "ALL",
             "widget_id": "wgt_collection_insights",
             "force_refresh": force_refresh,
+            "defer_calculation": defer_calculation,
         }
     return CollectionInsightsWidget(widget_configuration)
@@ -6,43 +6,16 @@ from utils.func.create_date import create_date
 
 
 class MTDMetricsWidget(WidgetFramework):
+    # Month-to-date figures move with the calendar
+    CACHE_PERIOD = "%Y-%m-%d"
+
     def __init__(self, widget_configuration: dict):
         super().__init__(widget_configuration)
         self.force_refresh = widget_configuration.get("force_refresh", False)
 
-        # Verify data loaded from parent
-        for dataset in self.required_datasets:
-            df = self.data_store.get(dataset)
-
-        if self.is_recalc_needed() or self.force_refresh:
+        if self.should_calculate():
             self._calculate_metrics()
 
-    def _safe_date_convert(self, row, prefix):
-        """Safely convert date components to a datetime"""
-        try:
-            month = row[f"{prefix}_month"]
-            day = row[f"{prefix}_day"]
-            year = row[f"{prefix}_year"]
-
-            if pd.isna(month) or pd.isna(day) or pd.isna(year):
-                return pd.NaT
-
-            # Convert float values to integers
-            month = int(float(month))
-            day = int(float(day))
-            year = int(float(year))
-
-            # Validate date components
-            if month < 1 or month > 12 or day < 1 or day > 31 or year < 1900:
-                return pd.NaT
-
-            # Create date string directly
-            date_str = f"{year:04d}-{month:02d}-{day:02d}"
-            return pd.to_datetime(date_str)
-
-        except Exception as e:
-            return pd.NaT
-
     def _calculate_metrics(self):
         """Calculate all metrics and cache them"""
         metrics = {}
@@ -62,34 +35,26 @@ class MTDMetricsWidget(WidgetFramework):
         current_date = pd.Timestamp.now()
         current_month = current_date.replace(day=1)
 
-        # Get transactions data
-        transactions_df = self.get_transactions()
-
-        # Convert date columns using create_date
-        transactions_df["posted_date"] = transactions_df.apply(
-            lambda x: self._safe_date_convert(x, "posted_date"), axis=1
-        )
-        transactions_df["payment_date"] = transactions_df.apply(
-            lambda x: self._safe_date_convert(x, "payment_date"), axis=1
+        # Daily rollups of the transaction history
+        posted = self.get_rollup("transactions", ["posted_date"], min_year=1900)
+        scheduled = self.get_rollup(
+            "transactions", ["payment_date", "posted_date"], min_year=1900
         )
 
-        if not transactions_df.empty:
+        mtd_collected = 0.0
+        projected_futures = 0.0
+        if posted is not None and scheduled is not None:
             # Calculate MTD collected
-            mtd_filter = (transactions_df["posted_date"] >= current_month) & (
-                transactions_df["posted_date"].notna()
-            )
-            mtd_collected = transactions_df[mtd_filter]["payment_amount"].sum()
+            mtd_filter = posted["posted_date"] >= current_month
+            mtd_collected = posted[mtd_filter]["total"].sum()
 
             # Calculate projected futures
             futures_filter = (
-                (transactions_df["payment_date"] > current_date)
-                & (
-                    transactions_df["payment_date"]
-                    <= current_date + pd.offsets.MonthEnd(0)
-                )
-                & (transactions_df["posted_date"].isna())
+                (scheduled["payment_date"] > current_date)
+                & (scheduled["payment_date"] <= current_date + pd.offsets.MonthEnd(0))
+                & (scheduled["posted_date"].isna())
             )
-            projected_futures = transactions_df[futures_filter]["payment_amount"].sum()
+            projected_futures = scheduled[futures_filter]["total"].sum()
 
         # Calculate total
         projected_total = mtd_collected + projected_futures
@@ -133,13 +98,25 @@ class MTDMetricsWidget(WidgetFramework):
                             ui.label(f"PRA: ${mtd['projected_pra']:,.2f}")
 
 
-def create_mtd_metrics_widget(widget_configuration: dict = None, force_refresh=False):
+def create_mtd_metrics_widget(
+    widget_configuration: dict = None, force_refresh=False, defer_calculation=False
+):
     """Factory function to create a new MTDMetricsWidget instance."""
     if widget_configuration is None:
         widget_configuration = {
-            "required_datasets": ["transactions", "contacts"],
+            "required_datasets": {
+                "transactions": {
+                    "columns": [
+                        "file_number",
+                        "payment_amount",
+                        "posted_date",
+                        "payment_date",
+                    ]
+                },
+            },
             "company_id": "ALL",
             "widget_id": "wgt_mtd_metrics",
             "force_refresh": force_refresh,
+            "defer_calculation": defer_calculation,
         }
     return MTDMetricsWidget(widget_configuration)
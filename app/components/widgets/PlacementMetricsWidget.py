@@ -18,7 +18,7 @@ class PlacementMetricsWidget(WidgetFramework):
             for item, name in self.list_manager.get_list("client_map").items()
         }
 
-        if self.is_recalc_needed() or self.force_refresh:
+        if self.should_calculate():
             self._calculate_metrics()
         else:
             print("Using cached metrics...")
@@ -27,141 +27,32 @@ class PlacementMetricsWidget(WidgetFramework):
         """Helper to get client name from number with fallback"""
         return self.client_map.get(str(client_number), f"Client {client_number}")
 
-    def _safe_date_convert(self, row, date_column_prefix):
-        """Convert separate date columns into a datetime object"""
-        try:
-            year = row.get(f"{date_column_prefix}_date_year", None)
-            month = row.get(f"{date_column_prefix}_date_month", None)
-            day = row.get(f"{date_column_prefix}_date_day", None)
-
-            if pd.isna(year) or pd.isna(month) or pd.isna(day):
-                return pd.NaT
-
-            # Convert to integers and handle float values
-            year = int(float(year))
-            month = int(float(month))
-            day = int(float(day))
-
-            # Construct date string directly
-            date_str = f"{year:04d}-{month:02d}-{day:02d}"
-            date = pd.to_datetime(date_str)
-            return date
-
-        except Exception as e:
-            return pd.NaT
-
     def _calculate_metrics(self):
         """Calculate placement metrics from accounts and transactions data"""
-        accounts_df = self.data_store.get("accounts")
-        transactions_df = self.data_store.get("transactions")
+        accounts_df = self.get_accounts()
+        transactions_df = self.get_transactions()
 
         if accounts_df is None or transactions_df is None:
-            self.update_metric_cache({"placement_metrics": []})
+            self.update_metric_cache({"placement_metrics": []}, cacheable=False)
             return
 
-        # Print sample of date columns
-        date_cols = [col for col in accounts_df.columns if "date" in col.lower()]
-
-        date_cols = [col for col in transactions_df.columns if "date" in col.lower()]
-
         # Convert date columns
         try:
-            accounts_df["placement_date"] = accounts_df.apply(
-                lambda x: self._safe_date_convert(x, "listed"), axis=1
+            accounts_df["placement_date"] = self.get_date_column(
+                "accounts", "listed_date"
             )
-            transactions_df["payment_date"] = transactions_df.apply(
-                lambda x: self._safe_date_convert(x, "payment"), axis=1
+            transactions_df["payment_date"] = self.get_date_column(
+                "transactions", "payment_date"
             )
         except Exception as e:
-            self.update_metric_cache({"placement_metrics": []})
+            self.update_metric_cache({"placement_metrics": []}, cacheable=False)
             return
 
         if accounts_df["placement_date"].notna().sum() == 0:
             self.update_metric_cache({"placement_metrics": []})
             return
 
-        # Group by month-year for placements
-        accounts_df["placement_month"] = accounts_df["placement_date"].dt.strftime(
-            "%Y-%m"
-        )
-
-        placements = []
-        for client_number in accounts_df["client_number"].unique():
-            client_accounts = accounts_df[accounts_df["client_number"] == client_number]
-
-            for placement_month in client_accounts["placement_month"].unique():
-                if pd.isna(placement_month):
-                    continue
-
-                placement = client_accounts[
-                    client_accounts["placement_month"] == placement_month
-                ]
-                placement_id = f"{client_number}_{placement_month.replace('-', '')}"
-
-                # Basic metrics
-                account_count = len(placement)
-                total_loaded = placement["original_upb_loaded"].sum()
-
-                # Get transactions for this placement
-                placement_transactions = transactions_df[
-                    transactions_df["file_number"].isin(placement["file_number"])
-                ]
-
-                total_collected = placement_transactions["payment_amount"].sum()
-                paying_accounts = placement_transactions["file_number"].nunique()
-
-                # Calculate rates
-                liquidation_rate = (
-                    (total_collected / total_loaded * 100) if total_loaded > 0 else 0
-                )
-                activation_rate = (
-                    (paying_accounts / account_count * 100) if account_count > 0 else 0
-                )
-
-                # Calculate monthly collections
-                monthly_collections = []
-                collection_velocity = []
-
-                placement_start = pd.to_datetime(placement_month)
-                for month in range(12):
-                    month_end = placement_start + pd.DateOffset(months=month + 1)
-                    month_start = placement_start + pd.DateOffset(months=month)
-
-                    month_payments = placement_transactions[
-                        (placement_transactions["payment_date"] >= month_start)
-                        & (placement_transactions["payment_date"] < month_end)
-                    ]
-
-                    month_collected = month_payments["payment_amount"].sum()
-                    monthly_collections.append(month_collected)
-
-                    # Calculate velocity (percentage of total collected this month)
-                    velocity = (
-                        (month_collected / total_loaded * 100)
-                        if total_loaded > 0
-                        else 0
-                    )
-                    collection_velocity.append(velocity)
-
-                placements.append(
-                    {
-                        "placement_id": placement_id,
-                        "client_number": client_number,
-                        "placement_date": placement_month,
-                        "total_loaded": round(total_loaded, 2),
-                        "account_count": account_count,
-                        "total_collected": round(total_collected, 2),
-                        "paying_accounts": paying_accounts,
-                        "liquidation_rate": round(liquidation_rate, 2),
-                        "activation_rate": round(activation_rate, 2),
-                        "monthly_collections": [
-                            round(x, 2) for x in monthly_collections
-                        ],
-                        "collection_velocity": [
-                            round(x, 2) for x in collection_velocity
-                        ],
-                    }
-                )
+        placements = self._build_placement_metrics(accounts_df, transactions_df)
 
         if not placements:
             self.update_metric_cache({"placement_metrics": []})
@@ -169,6 +60,116 @@ class PlacementMetricsWidget(WidgetFramework):
 
         self.update_metric_cache({"placement_metrics": placements})
 
+    def _build_placement_metrics(self, accounts_df, transactions_df):
+        """
+        Placement records for every client and placement month.
+
+        Transactions are joined to the distinct files of each placement once,
+        so a file shared by several placements counts towards each of them,
+        and the 12 monthly collections are bucketed by months since placement.
+        Transactions without a file number belong to no placement.
+        """
+        keys = ["client_number", "placement_start"]
+        accounts = pd.DataFrame(
+            {
+                "client_number": accounts_df["client_number"],
+                "file_number": accounts_df["file_number"],
+                "loaded": accounts_df["original_upb_loaded"].astype(float),
+                "placement_start": accounts_df["placement_date"]
+                .dt.to_period("M")
+                .dt.to_timestamp(),
+            }
+        )
+        accounts = accounts[
+            accounts["client_number"].notna() & accounts["placement_start"].notna()
+        ]
+        if accounts.empty:
+            return []
+
+        # Clients in order of appearance, then their placements in order of appearance
+        summary = (
+            accounts.groupby(keys, sort=False)
+            .agg(account_count=("loaded", "size"), total_loaded=("loaded", "sum"))
+            .reset_index()
+        )
+        client_order = {
+            client: rank
+            for rank, client in enumerate(pd.unique(accounts_df["client_number"]))
+        }
+        summary = summary.sort_values(
+            "client_number", key=lambda column: column.map(client_order), kind="stable"
+        ).set_index(keys)
+
+        transactions = pd.DataFrame(
+            {
+                "file_number": transactions_df["file_number"],
+                "amount": transactions_df["payment_amount"].astype(float),
+                "payment_date": transactions_df["payment_date"],
+            }
+        )
+        payments = (
+            accounts[keys + ["file_number"]]
+            .drop_duplicates()
+            .merge(transactions[transactions["file_number"].notna()], on="file_number")
+        )
+        grouped = payments.groupby(keys)
+        summary["total_collected"] = grouped["amount"].sum()
+        summary["paying_accounts"] = grouped["file_number"].nunique()
+        summary = summary.fillna({"total_collected": 0.0, "paying_accounts": 0})
+
+        # Months between the placement month and the payment month
+        month_offset = (
+            payments["payment_date"].dt.year - payments["placement_start"].dt.year
+        ) * 12 + (
+            payments["payment_date"].dt.month - payments["placement_start"].dt.month
+        )
+        in_window = month_offset.between(0, 11)
+        monthly = (
+            payments[in_window]
+            .groupby(keys + [month_offset[in_window].astype(int)])["amount"]
+            .sum()
+            .unstack()
+            .reindex(index=summary.index, columns=range(12))
+            .fillna(0.0)
+        )
+
+        placements = []
+        for (client_number, placement_start), row in summary.iterrows():
+            total_loaded = float(row["total_loaded"])
+            account_count = int(row["account_count"])
+            total_collected = float(row["total_collected"])
+            paying_accounts = int(row["paying_accounts"])
+            monthly_collections = monthly.loc[(client_number, placement_start)].tolist()
+
+            liquidation_rate = (
+                (total_collected / total_loaded * 100) if total_loaded > 0 else 0
+            )
+            activation_rate = (
+                (paying_accounts / account_count * 100) if account_count > 0 else 0
+            )
+            collection_velocity = [
+                (collected / total_loaded * 100) if total_loaded > 0 else 0
+                for collected in monthly_collections
+            ]
+
+            placements.append(
+                {
+                    "placement_id": f"{client_number}_{placement_start:%Y%m}",
+                    "client_number": client_number,
+                    "placement_date": f"{placement_start:%Y-%m}",
+                    "total_loaded": round(total_loaded, 2),
+                    "account_count": account_count,
+                    "total_collected": round(total_collected, 2),
+                    "paying_accounts": paying_accounts,
+                    "liquidation_rate": round(liquidation_rate, 2),
+                    "activation_rate": round(activation_rate, 2),
+                    "monthly_collections": [round(x, 2) for x in monthly_collections],
+                    "collection_velocity": [round(x, 2) for x in collection_velocity],
+                }
+            )
+
+        return placements
+
     def render(self):
         """Render the placement metrics dashboard"""
         try:
@@ -415,14 +416,27 @@ class PlacementMetricsWidget(WidgetFramework):
 
 
 def create_placement_metrics_widget(
-    widget_configuration: dict = None, force_refresh=False
+    widget_configuration: dict = None, force_refresh=False, defer_calculation=False
 ):
     """Factory function to create a new PlacementMetricsWidget instance."""
     if widget_configuration is None:
         widget_configuration = {
-            "required_datasets": ["accounts", "transactions"],
+            "required_datasets": {
+                "accounts": {
+                    "columns": [
+                        "client_number",
+                        "file_number",
+                        "original_upb_loaded",
+                        "listed_date",
+                    ]
+                },
+                "transactions": {
+                    "columns": ["file_number", "payment_amount", "payment_date"]
+                },
+            },
             "company_id": "ALL",
             "widget_id": "wgt_placement_metrics",
             "force_refresh": force_refresh,
+            "defer_calculation": defer_calculation,
         }
     return PlacementMetricsWidget(widget_configuration)
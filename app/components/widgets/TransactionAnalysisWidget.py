@@ -17,8 +17,9 @@ class TransactionAnalysisWidget(WidgetFramework):
         self.ai_icon_src = (
             "https://lottie.host/77b2ba29-8055-4be9-b699-378f5434c0c4/jptyrmmrGU.json"
         )
+        self.ai_texts = {}
 
-        if self.is_recalc_needed() or self.force_refresh:
+        if self.should_calculate():
             self._calculate_metrics()
 
     def _calculate_metrics(self):
@@ -53,58 +54,46 @@ class TransactionAnalysisWidget(WidgetFramework):
                     "call_metrics": {},
                     "combined_metrics": {},
                     "last_modified": int(datetime.now().timestamp()),
-                }
+                },
+                cacheable=False,
             )
 
     def _analyze_transactions(self, df):
         if df.empty:
             return {}
 
-        # Convert date columns
-        def create_date(df, year_col, month_col, day_col):
-            date_df = df[[year_col, month_col, day_col]].copy()
-            date_df[year_col] = pd.to_numeric(
-                date_df[year_col], errors="coerce"
-            ).fillna(1900)
-            date_df[month_col] = pd.to_numeric(
-                date_df[month_col], errors="coerce"
-            ).fillna(1)
-            date_df[day_col] = pd.to_numeric(date_df[day_col], errors="coerce").fillna(
-                1
-            )
-
-            date_df[year_col] = date_df[year_col].astype(int)
-            date_df[month_col] = date_df[month_col].astype(int).clip(1, 12)
-            date_df[day_col] = date_df[day_col].astype(int).clip(1, 31)
-
-            date_strings = (
-                date_df[year_col].astype(str)
-                + "-"
-                + date_df[month_col].map(lambda x: f"{x:02d}")
-                + "-"
-                + date_df[day_col].map(lambda x: f"{x:02d}")
-            )
-            return pd.to_datetime(date_strings, format="%Y-%m-%d", errors="coerce")
-
-        df["payment_date"] = create_date(
-            df, "payment_date_year", "payment_date_month", "payment_date_day"
-        )
-
+        # Daily rollup of the transaction history
+        daily = self.get_rollup("transactions", ["payment_date"], fill_missing=True)
         daily_totals = (
-            df.groupby(df["payment_date"].dt.day_name())["payment_amount"]
-            .agg(["sum", "count"])
+            daily.groupby(daily["payment_date"].dt.day_name())[["total", "count"]]
+            .sum()
+            .rename(columns={"total": "sum"})
             .to_dict("index")
         )
 
+        total_amount = daily["total"].sum()
+        payment_count = daily["count"].sum()
+
         return {
-            "total_amount": float(df["payment_amount"].sum()),
-            "avg_payment": float(df["payment_amount"].mean()),
-            "payment_count": int(len(df)),
+            "total_amount": float(total_amount),
+            # No average without payments; NaN cannot be stored in the cache
+            "avg_payment": (
+                float(total_amount / payment_count) if payment_count else None
+            ),
+            "payment_count": int(daily["row_count"].sum()),
             "daily_patterns": daily_totals,
-            "payment_types": df["transaction_type"].value_counts().to_dict(),
-            "operator_stats": df["operator"].value_counts().to_dict(),
+            "payment_types": self._value_counts("transaction_type"),
+            "operator_stats": self._value_counts("operator"),
         }
 
+    def _value_counts(self, column):
+        """Row counts per value of a transactions column, most frequent first"""
+        rollup = self.get_rollup("transactions", [column])
+        rollup = rollup[rollup[column].notna()]
+        return (
+            rollup.set_index(column)["row_count"].sort_values(ascending=False).to_dict()
+        )
+
     def _analyze_calls(self, df):
         if df.empty:
             print("DEBUG - Outbound df is empty.")
@@ -163,8 +152,11 @@ class TransactionAnalysisWidget(WidgetFramework):
             return {}
 
         # Analyze payment success rate correlation with call patterns
+        avg_payment = trans_df["payment_amount"].mean()
         payment_success = {
-            "avg_payment_after_call": float(trans_df["payment_amount"].mean()),
+            "avg_payment_after_call": (
+                float(avg_payment) if pd.notna(avg_payment) else None
+            ),
             "payment_correlation": {
                 "same_day": 0.75,  # Example correlation
                 "next_day": 0.45,
@@ -174,6 +166,92 @@ class TransactionAnalysisWidget(WidgetFramework):
 
         return payment_success
 
+    def load_render_data(self):
+        """Generate the AI texts render() shows, so a worker thread can do it first"""
+        super().load_render_data()
+        metrics = self.get_cached()
+        self.ai_texts = {}
+        if metrics and metrics.get("transaction_metrics"):
+            self._ai_text("technical_summary", metrics)
+        if metrics and metrics.get("combined_metrics"):
+            self._ai_text("call_insights", metrics)
+
+    def _ai_text(self, name, metrics):
+        """A Groq response about the metrics, generated once per widget"""
+        if name not in self.ai_texts:
+            build_prompt = {
+                "technical_summary": self._technical_summary_prompt,
+                "call_insights": self._call_insights_prompt,
+            }[name]
+            prompt_template, variables = build_prompt(metrics)
+            self.ai_texts[name] = self.groq.generate_response(
+                prompt=prompt_template, variables=variables
+            )
+        return self.ai_texts[name]
+
+    def _technical_summary_prompt(self, metrics):
+        trans_metrics = metrics.get("transaction_metrics", {})
+        operator_data = trans_metrics.get("operator_stats", {})
+        payment_types = trans_metrics.get("payment_types", {})
+
+        prompt_template = """
+        As a data analyst, provide a brief technical summary of the following metrics:
+
+        Operator Data:
+        {operator_stats}
+
+        Payment Types:
+        {payment_types}
+
+        Key Metrics:
+        - Total Operators: {total_operators}
+        - Total Transactions: {total_transactions}
+        - Average Payment: {avg_payment}
+
+        Focus on statistical observations and operational patterns. Keep the analysis to 2-3 concise, technical sentences.
+        Use ** ** to highlight key statistical findings.
+        """
+
+        variables = {
+            "operator_stats": operator_data,
+            "payment_types": payment_types,
+            "total_operators": len(operator_data),
+            "total_transactions": trans_metrics["payment_count"],
+            "avg_payment": self.format_amount(trans_metrics["avg_payment"], ".2f"),
+        }
+
+        return prompt_template, variables
+
+    def _call_insights_prompt(self, metrics):
+        combined = metrics["combined_metrics"]
+
+        prompt_template = """
+        You are an expert collections analyst. Analyze the following payment-call correlation data
+        and provide 3-4 clear, actionable insights about the relationship between calls and payment
+        patterns. Focus on what the correlations suggest about collection strategy effectiveness.
+        Keep each insight to 2-3 sentences. Use ** ** to emphasize key metrics or important points.
+
+        Correlation Data:
+        - Same day correlation: {same_day}
+        - Next day correlation: {next_day}
+        - Week later correlation: {week_later}
+        - Average payment after call: {avg_payment}
+
+        Provide your analysis in clear, professional language that a business user would understand.
+        Focus on practical implications and actionable insights.
+        """
+
+        variables = {
+            "same_day": combined["payment_correlation"]["same_day"],
+            "next_day": combined["payment_correlation"]["next_day"],
+            "week_later": combined["payment_correlation"]["week_later"],
+            "avg_payment": self.format_amount(
+                combined["avg_payment_after_call"], ".2f"
+            ),
+        }
+
+        return prompt_template, variables
+
     def render(self):
         ui.add_body_html(
             '<script src="https://unpkg.com/@lottiefiles/lottie-player@latest/dist/lottie-player.js"></script>'
@@ -262,7 +340,10 @@ class TransactionAnalysisWidget(WidgetFramework):
         with ui.grid(columns=3).classes("w-full gap-6 mt-4"):
             metrics_cards = [
                 ("Total Collections", f"${trans_metrics['total_amount']:,.2f}"),
-                ("Average Payment", f"${trans_metrics['avg_payment']:.2f}"),
+                (
+                    "Average Payment",
+                    self.format_amount(trans_metrics["avg_payment"], ".2f"),
+                ),
                 ("Payment Count", f"{trans_metrics['payment_count']:,}"),
             ]
 
@@ -313,7 +394,10 @@ class TransactionAnalysisWidget(WidgetFramework):
             metrics_cards = [
                 ("Total Operators", f"{len(operator_data)}"),
                 ("Total Transactions", f"{trans_metrics['payment_count']:,}"),
-                ("Average Amount", f"${trans_metrics['avg_payment']:.2f}"),
+                (
+                    "Average Amount",
+                    self.format_amount(trans_metrics["avg_payment"], ".2f"),
+                ),
             ]
 
             for label, value in metrics_cards:
@@ -321,36 +405,8 @@ class TransactionAnalysisWidget(WidgetFramework):
                     ui.label(label).classes("text-lg font-bold")
                     ui.label(value)
 
-        # Generate AI technical summary
-        prompt_template = """
-        As a data analyst, provide a brief technical summary of the following metrics:
-
-        Operator Data:
-        {operator_stats}
-
-        Payment Types:
-        {payment_types}
-
-        Key Metrics:
-        - Total Operators: {total_operators}
-        - Total Transactions: {total_transactions}
-        - Average Payment: ${avg_payment}
-
-        Focus on statistical observations and operational patterns. Keep the analysis to 2-3 concise, technical sentences.
-        Use ** ** to highlight key statistical findings.
-        """
-
-        variables = {
-            "operator_stats": operator_data,
-            "payment_types": payment_types,
-            "total_operators": len(operator_data),
-            "total_transactions": trans_metrics["payment_count"],
-            "avg_payment": trans_metrics["avg_payment"],
-        }
-
-        technical_summary = self.groq.generate_response(
-            prompt=prompt_template, variables=variables
-        )
+        # AI technical summary, generated ahead of render by load_render_data
+        technical_summary = self._ai_text("technical_summary", metrics)
 
         # Render technical summary
         with ui.card().classes(
@@ -417,33 +473,8 @@ class TransactionAnalysisWidget(WidgetFramework):
 
         ui.highchart(chart_data).classes("w-full")
 
-        # Generate AI insights
-        prompt_template = """
-        You are an expert collections analyst. Analyze the following payment-call correlation data
-        and provide 3-4 clear, actionable insights about the relationship between calls and payment
-        patterns. Focus on what the correlations suggest about collection strategy effectiveness.
-        Keep each insight to 2-3 sentences. Use ** ** to emphasize key metrics or important points.
-
-        Correlation Data:
-        - Same day correlation: {same_day}
-        - Next day correlation: {next_day}
-        - Week later correlation: {week_later}
-        - Average payment after call: ${avg_payment}
-
-        Provide your analysis in clear, professional language that a business user would understand.
-        Focus on practical implications and actionable insights.
-        """
-
-        variables = {
-            "same_day": combined["payment_correlation"]["same_day"],
-            "next_day": combined["payment_correlation"]["next_day"],
-            "week_later": combined["payment_correlation"]["week_later"],
-            "avg_payment": combined["avg_payment_after_call"],
-        }
-
-        insights = self.groq.generate_response(
-            prompt=prompt_template, variables=variables
-        )
+        # AI insights, generated ahead of render by load_render_data
+        insights = self._ai_text("call_insights", metrics)
 
         # Render AI insights in a scrollable container
         with ui.card().classes("w-full p-6 mt-1 bg-white shadow-sm"):
@@ -479,7 +510,7 @@ class TransactionAnalysisWidget(WidgetFramework):
 
 
 def create_transaction_analysis_widget(
-    widget_configuration: dict = None, force_refresh=False
+    widget_configuration: dict = None, force_refresh=False, defer_calculation=False
 ):
     if widget_configuration is None:
         widget_configuration = {
@@ -487,5 +518,6 @@ def create_transaction_analysis_widget(
             "company_id": "ALL",
             "widget_id": "wgt_transaction_analysis",
             "force_refresh": force_refresh,
+            "defer_calculation": defer_calculation,
         }
     return TransactionAnalysisWidget(widget_configuration)
@@ -1,120 +1,377 @@
 from abc import ABC
-from middleware.dynamo import DynamoMiddleware
-from middleware.s3 import S3Middleware
+from contextlib import contextmanager
+from contextvars import ContextVar
+from botocore.exceptions import ClientError
+from middleware.dynamo import DynamoMiddleware, dynamo_serializer
+from middleware.s3 import S3Middleware, dataset_store
 from datetime import datetime
+import hashlib
+import operator
 import pandas as pd
+from utils.func.create_date import create_date_series
+
+S3_BUCKET = "ndl-system-storage-v2"
+S3_MASTER_KEY_MAP = {
+    "accounts": "protected/datasets/by_portfolio/platform/accounts/ac_master.csv",
+    "transactions": "protected/datasets/by_portfolio/platform/transactions/tr_master.csv",
+    "contacts": "protected/datasets/by_portfolio/platform/contacts/co_master.csv",
+    "outbound": "protected/datasets/by_portfolio/platform/outbound/od_master.csv",
+}
+
+# Comparisons allowed in `required_datasets` row filters
+FILTER_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda values, value: values.isin(value),
+    "not in": lambda values, value: ~values.isin(value),
+}
+
+# Decoded metric_cache maps by company_id, set by prefetch_metric_cache
+_prefetched_metric_cache = ContextVar("prefetched_metric_cache", default=None)
+
+
+@contextmanager
+def prefetch_metric_cache(company_id: str):
+    """
+    Read a company's whole metric_cache once for the widgets created inside the block.
+
+    Widgets constructed in the block take their entry from this read
+    instead of each fetching it from DynamoDB.
+    """
+    dynamo_client = DynamoMiddleware("NDL_Companies_Table")
+    item = dynamo_client.get_item(
+        {"company_id": {"S": company_id}}, projection_expression="metric_cache"
+    )
+    metric_cache = {}
+    if item and "metric_cache" in item:
+        metric_cache = dynamo_serializer.deserialize(item["metric_cache"])
+
+    prefetched = dict(_prefetched_metric_cache.get() or {})
+    prefetched[company_id] = metric_cache
+    token = _prefetched_metric_cache.set(prefetched)
+    try:
+        yield metric_cache
+    finally:
+        _prefetched_metric_cache.reset(token)
 
 
 class WidgetFramework(ABC):
+    # Bump when a widget's calculations change so its cached metrics are rebuilt
+    WIDGET_VERSION = 1
+    # strftime format of the period the metrics depend on besides their inputs,
+    # e.g. "%Y-%m-%d" for figures relative to today
+    CACHE_PERIOD = None
+    # Datasets render() reads besides the metrics, see load_render_data
+    RENDER_DATASETS = ()
+
     def __init__(self, widget_configuration: dict):
         self.widget_configuration = widget_configuration
         self.s3_client = S3Middleware()
         self.dynamo_client = DynamoMiddleware("NDL_Companies_Table")
-        self.s3_bucket = "ndl-system-storage-v2"
-        self.s3_master_key_map = {
-            "accounts": "protected/datasets/by_portfolio/platform/accounts/ac_master.csv",
-            "transactions": "protected/datasets/by_portfolio/platform/transactions/tr_master.csv",
-            "contacts": "protected/datasets/by_portfolio/platform/contacts/co_master.csv",
-            "outbound": "protected/datasets/by_portfolio/platform/outbound/od_master.csv",
-        }
+        self.s3_bucket = S3_BUCKET
+        self.s3_master_key_map = S3_MASTER_KEY_MAP
         self.required_datasets = self.widget_configuration["required_datasets"]
         self.company_id = self.widget_configuration["company_id"]
         self.widget_id = self.widget_configuration["widget_id"]
         self.data_store = {}
-        self._pull_required_data()
+        self.cache_key = None
         self.cached_metrics = self.check_cache()
 
     def _pull_metric_cache(self):
-        key = {"company_id": {"S": self.company_id}}
-        item = self.dynamo_client.get_item(key)
-
-        def parse_dynamo_type(value):
-            if isinstance(value, dict):
-                if "M" in value:
-                    return {k: parse_dynamo_type(v) for k, v in value["M"].items()}
-                if "L" in value:
-                    return [parse_dynamo_type(v) for v in value["L"]]
-                for type_key in ["S", "N", "BOOL"]:
-                    if type_key in value:
-                        if type_key == "N":
-                            try:
-                                return int(value[type_key])
-                            except ValueError:
-                                return float(value[type_key])
-                        return value[type_key]
-            return value
+        """Read this widget's entry of the company's metric_cache map"""
+        prefetched = _prefetched_metric_cache.get()
+        if prefetched is not None and self.company_id in prefetched:
+            metric_cache = prefetched[self.company_id]
+            if self.widget_id in metric_cache:
+                return {self.widget_id: metric_cache[self.widget_id]}
+            return {}
 
+        key = {"company_id": {"S": self.company_id}}
+        item = self.dynamo_client.get_item(
+            key,
+            projection_expression="metric_cache.#wid",
+            expression_attribute_names={"#wid": self.widget_id},
+        )
         if item and "metric_cache" in item:
-            return parse_dynamo_type(item["metric_cache"])
+            return dynamo_serializer.deserialize(item["metric_cache"])
         return {}
 
     def is_widget_cached(self):
-        cache = self._pull_metric_cache()
-        if self.widget_id not in cache:
-            key = {"company_id": {"S": self.company_id}}
-            update_expression = "SET metric_cache.#wid = :empty"
-            expression_values = {":empty": {"M": {}}}
-            expression_names = {"#wid": self.widget_id}
-            self.dynamo_client.update_item(
-                key, update_expression, expression_values, expression_names
+        return self._pull_metric_cache().get(self.widget_id, {})
+
+    def _cache_key(self):
+        """Hash of the input dataset versions, the widget version and period"""
+        parts = [type(self).__name__, str(self.WIDGET_VERSION)]
+        for dataset in sorted(self.required_datasets):
+            version = dataset_store.get_version(
+                self.s3_bucket, self.s3_master_key_map[dataset]
             )
-            return {}
-        return cache.get(self.widget_id, {})
+            if version is None:
+                return None
+            parts.append(f"{dataset}={version}")
+        if self.CACHE_PERIOD:
+            parts.append(datetime.now().strftime(self.CACHE_PERIOD))
+        return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
 
-    def is_cache_valid(self):
-        metrics = self.is_widget_cached()
-        if not metrics or "last_modified" not in metrics:
+    def is_cache_valid(self, metrics=None):
+        if metrics is None:
+            metrics = self.is_widget_cached()
+        if not metrics:
             return False
-        last_modified = datetime.fromtimestamp(int(metrics["last_modified"])).date()
-        return last_modified == datetime.now().date()
+        if self.cache_key is None:
+            self.cache_key = self._cache_key()
+        if self.cache_key is None:
+            # Dataset versions are unknown, keep serving the last results
+            return True
+        return metrics.get("cache_key") == self.cache_key
 
     def check_cache(self):
         metrics = self.is_widget_cached()
-        if metrics and "last_modified" in metrics and self.is_cache_valid():
+        self.cache_key = self._cache_key()
+        if self.is_cache_valid(metrics):
             return metrics
         return {}
 
-    def update_metric_cache(self, new_metrics: dict):
-        def to_dynamo_type(value):
-            if isinstance(value, dict):
-                return {"M": {k: to_dynamo_type(v) for k, v in value.items()}}
-            if isinstance(value, list):
-                return {"L": [to_dynamo_type(v) for v in value]}
-            if isinstance(value, bool):
-                return {"BOOL": value}
-            if isinstance(value, (int, float)):
-                return {"N": str(value)}
-            return {"S": str(value)}
-
-        # Get current cache
-        current_cache = self._pull_metric_cache()
-
-        # Update widget portion
-        current_cache[self.widget_id] = new_metrics
-
-        # Update in DynamoDB
-        key = {"company_id": {"S": self.company_id}}
-        update_expression = "SET metric_cache = :mc"
-        expression_values = {":mc": to_dynamo_type(current_cache)}
+    def update_metric_cache(self, new_metrics: dict, cacheable=True):
+        """
+        Store this widget's metrics. Pass `cacheable=False` for placeholder
+        results written after a failure; they are stored without a cache_key
+        so the next load computes them again.
+        """
+        if cacheable and self.cache_key is None:
+            self.cache_key = self._cache_key()
+        if cacheable and self.cache_key is not None:
+            new_metrics = {**new_metrics, "cache_key": self.cache_key}
 
-        self.dynamo_client.update_item(key, update_expression, expression_values)
+        # Only this widget's entry is written, other widgets' entries are untouched
+        self._write_metric_cache(dynamo_serializer.serialize(new_metrics))
         self.cached_metrics = new_metrics
 
+    def _write_metric_cache(self, value):
+        """Set this widget's entry of the company's metric_cache map"""
+        key = {"company_id": {"S": self.company_id}}
+        expression_names = {"#wid": self.widget_id}
+        try:
+            self.dynamo_client.update_item(
+                key, "SET metric_cache.#wid = :m", {":m": value}, expression_names
+            )
+            return
+        except ClientError as e:
+            # The document path is invalid until the company has a metric_cache map
+            if e.response["Error"]["Code"] != "ValidationException":
+                raise
+
+        try:
+            self.dynamo_client.update_item(
+                key,
+                "SET metric_cache = :mc",
+                {":mc": {"M": {self.widget_id: value}}},
+                condition_expression="attribute_not_exists(metric_cache)",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            # Another widget created the map first
+            self.dynamo_client.update_item(
+                key, "SET metric_cache.#wid = :m", {":m": value}, expression_names
+            )
+
     def is_recalc_needed(self):
         return not bool(self.cached_metrics)
 
+    def needs_calculation(self):
+        return self.is_recalc_needed() or self.widget_configuration.get(
+            "force_refresh", False
+        )
+
+    def should_calculate(self):
+        """Whether metrics are computed while the widget is constructed"""
+        if self.widget_configuration.get("defer_calculation", False):
+            return False
+        return self.needs_calculation()
+
+    def receive_metrics(self, metrics: dict):
+        """Take metrics computed elsewhere, e.g. in a worker process"""
+        self.cached_metrics = metrics
+        self.force_refresh = False
+
     def get_cached(self):
         return self.cached_metrics
 
     def set_cached(self, metrics: dict):
         self.cached_metrics = metrics
 
+    @staticmethod
+    def format_amount(value, spec=",.2f"):
+        """Format a dollar amount, or "N/A" for one that could not be computed"""
+        if value is None:
+            return "N/A"
+        return f"${value:{spec}}"
+
     def _pull_required_data(self):
         for dataset in self.required_datasets:
-            self.data_store[dataset] = self.s3_client.read_csv_to_dataframe(
-                bucket_name=self.s3_bucket, file_key=self.s3_master_key_map[dataset]
+            self.data_store[dataset] = self._load_dataset(dataset)
+
+    def _dataset_spec(self, dataset):
+        """
+        Columns and row filters requested for a dataset.
+
+        `required_datasets` is either a list of dataset names or a dict of
+        name -> {"columns": [...], "filters": [...]}. Columns may name a date
+        prefix such as "posted_date" to load its _year/_month/_day parts.
+        Filters are (column, op, value) conditions that must all hold, or a
+        list of such lists of which any may hold; a callable value is called
+        at load time.
+        """
+        if isinstance(self.required_datasets, dict):
+            return self.required_datasets.get(dataset) or {}
+        return {}
+
+    def _load_dataset(self, dataset):
+        spec = self._dataset_spec(dataset)
+        dataframe = self._load_columns(dataset)
+        filters = spec.get("filters")
+        if dataframe is None or not filters:
+            return dataframe
+        mask = self._filter_mask(dataset, dataframe, filters)
+        return dataframe[mask].copy(deep=False)
+
+    def _load_columns(self, dataset, columns=None):
+        """
+        Formatted dataset with `columns`, by default the widget's projection.
+
+        Downloads and formatting are shared by every widget in the process.
+        """
+        if columns is None:
+            columns = self._dataset_spec(dataset).get("columns")
+        name = "widget_framework_v1"
+        if columns is not None:
+            columns = sorted(set(columns))
+            digest = hashlib.sha1(",".join(columns).encode("utf-8")).hexdigest()
+            name = f"{name}-{digest[:12]}"
+
+        def build(dataframe):
+            if columns is not None:
+                dataframe = dataframe.filter(
+                    items=self._expand_columns(dataframe, columns)
+                )
+            return self._apply_datatype_formatting(dataset, dataframe)
+
+        return dataset_store.memoize(
+            self.s3_bucket,
+            self.s3_master_key_map[dataset],
+            name,
+            build,
+            persist=True,
+        )
+
+    def _expand_columns(self, dataframe, columns):
+        """Resolve requested columns, replacing date prefixes with their parts"""
+        expanded = []
+        for column in columns:
+            if column in dataframe.columns:
+                expanded.append(column)
+            else:
+                expanded.extend(
+                    f"{column}_{part}"
+                    for part in ("year", "month", "day")
+                    if f"{column}_{part}" in dataframe.columns
+                )
+        return expanded
+
+    def _filter_mask(self, dataset, dataframe, filters):
+        if isinstance(filters[0], tuple):
+            filters = [filters]
+
+        mask = pd.Series(False, index=dataframe.index)
+        for conditions in filters:
+            matches = pd.Series(True, index=dataframe.index)
+            for column, op, value in conditions:
+                if callable(value):
+                    value = value()
+                if column in dataframe.columns:
+                    values = dataframe[column]
+                elif f"{column}_year" in dataframe.columns:
+                    values = self.get_date_column(dataset, column)
+                else:
+                    raise ValueError(f"Unknown filter column {column} for {dataset}")
+                matches &= FILTER_OPERATORS[op](values, value)
+            mask |= matches
+        return mask
+
+    def get_date_column(
+        self, dataset, prefix, min_year=None, two_digit_years=False, fill_missing=False
+    ):
+        """
+        Date column assembled from a dataset's `<prefix>_year/_month/_day` parts.
+
+        Built once per dataset load and shared between widgets, from the
+        date parts alone rather than the calling widget's projection; the
+        result is indexed like the unfiltered dataset, so it can be assigned
+        onto filtered copies.
+        """
+        options = (min_year, two_digit_years, fill_missing)
+        return dataset_store.memoize(
+            self.s3_bucket,
+            self.s3_master_key_map[dataset],
+            ("date", prefix) + options,
+            lambda _: create_date_series(
+                self._load_columns(dataset, [prefix]),
+                prefix,
+                min_year=min_year,
+                two_digit_years=two_digit_years,
+                fill_missing=fill_missing,
+            ),
+        )
+
+    def get_rollup(self, dataset, keys, value="payment_amount", **date_options):
+        """
+        Per-group totals of `value`, built once per data refresh.
+
+        `keys` are columns or date prefixes, the latter grouped by day with
+        dates assembled as in get_date_column. Rows with missing keys form
+        their own groups. Each row holds `total` and `count` (non-null values)
+        of `value`, `row_count` and `file_count` (distinct file numbers).
+        Built from those columns alone, whatever the calling widget loads.
+        """
+        keys = list(keys)
+        options = ",".join(f"{k}={v}" for k, v in sorted(date_options.items()))
+        digest = hashlib.sha1(
+            f"{','.join(keys)}|{value}|{options}".encode("utf-8")
+        ).hexdigest()
+
+        def build(_):
+            dataframe = self._load_columns(dataset, keys + [value, "file_number"])
+            rollup = pd.DataFrame(index=dataframe.index)
+            for key in keys:
+                if key in dataframe.columns:
+                    rollup[key] = dataframe[key]
+                else:
+                    rollup[key] = create_date_series(dataframe, key, **date_options)
+            rollup["_value"] = dataframe[value].astype(float)
+            rollup["_file"] = dataframe["file_number"]
+            return (
+                rollup.groupby(keys, dropna=False)
+                .agg(
+                    total=("_value", "sum"),
+                    count=("_value", "count"),
+                    row_count=("_value", "size"),
+                    file_count=("_file", "nunique"),
+                )
+                .reset_index()
             )
-        self._apply_datatype_formatting()
+
+        return dataset_store.memoize(
+            self.s3_bucket,
+            self.s3_master_key_map[dataset],
+            f"widget_rollup_v1-{digest[:12]}",
+            build,
+            persist=True,
+        )
 
     def _process_accounts(self, dataframe):
         column_map = {
@@ -227,40 +484,39 @@ class WidgetFramework(ABC):
                 )
         return dataframe
 
-    def _apply_datatype_formatting(self):
-        for dataset in self.required_datasets:
-            if dataset == "accounts":
-                self.data_store[dataset] = self._process_accounts(
-                    self.data_store[dataset]
-                )
-            elif dataset == "transactions":
-                self.data_store[dataset] = self._process_transactions(
-                    self.data_store[dataset]
-                )
-            elif dataset == "contacts":
-                self.data_store[dataset] = self._process_contacts(
-                    self.data_store[dataset]
-                )
+    def _apply_datatype_formatting(self, dataset, dataframe):
+        if dataset == "accounts":
+            return self._process_accounts(dataframe)
+        elif dataset == "transactions":
+            return self._process_transactions(dataframe)
+        elif dataset == "contacts":
+            return self._process_contacts(dataframe)
+        return dataframe
+
+    def _get_dataset(self, dataset):
+        # Loaded on first use, so widgets served from cache never read them
+        if dataset not in self.required_datasets:
+            return pd.DataFrame()
+        if dataset not in self.data_store:
+            self.data_store[dataset] = self._load_dataset(dataset)
+        return self.data_store[dataset]
+
+    def load_render_data(self):
+        """Load the datasets render() reads, so a worker thread can do it first"""
+        for dataset in self.RENDER_DATASETS:
+            self._get_dataset(dataset)
 
     def get_accounts(self):
-        if "accounts" not in self.data_store:
-            self._pull_required_data()
-        return self.data_store.get("accounts", pd.DataFrame())
+        return self._get_dataset("accounts")
 
     def get_transactions(self):
-        if "transactions" not in self.data_store:
-            self._pull_required_data()
-        return self.data_store.get("transactions", pd.DataFrame())
+        return self._get_dataset("transactions")
 
     def get_contacts(self):
-        if "contacts" not in self.data_store:
-            self._pull_required_data()
-        return self.data_store.get("contacts", pd.DataFrame())
+        return self._get_dataset("contacts")
 
     def get_outbound(self):
-        if "outbound" not in self.data_store:
-            self._pull_required_data()
-        return self.data_store.get("outbound", pd.DataFrame())
+        return self._get_dataset("outbound")
 
     def _process_value(self, type_name: str, value):
         """Process a value based on its type name."""
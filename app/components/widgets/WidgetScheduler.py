@@ -0,0 +1,101 @@
+import threading
+from datetime import datetime
+from config import config
+from middleware.s3 import dataset_store
+from .WidgetFramework import S3_BUCKET, S3_MASTER_KEY_MAP, prefetch_metric_cache
+from .CollectionInsights import create_collection_insights_widget
+from .CollectionEffectiveness import create_collection_effectiveness_widget
+from .ClientMetricsWidget import create_client_metrics_widget
+from .PlacementMetricsWidget import create_placement_metrics_widget
+from .CallAnalysisWidget import create_call_analysis_widget
+from .TransactionAnalysisWidget import create_transaction_analysis_widget
+
+# Dashboard widgets by name, in display order
+WIDGET_FACTORIES = {
+    "collection_insights": create_collection_insights_widget,
+    "collection_effectiveness": create_collection_effectiveness_widget,
+    "client_metrics": create_client_metrics_widget,
+    "placement_metrics": create_placement_metrics_widget,
+    "call_analysis": create_call_analysis_widget,
+    "transaction_analysis": create_transaction_analysis_widget,
+}
+
+
+def compute_widget_metrics(name, force_refresh=False):
+    """Build a registered widget and return its metrics, run in a worker process"""
+    widget = WIDGET_FACTORIES[name](force_refresh=force_refresh)
+    return widget.cached_metrics
+
+
+class WidgetScheduler:
+    """
+    Keeps the metric cache of registered widgets warm in the background.
+
+    Every `interval_seconds` the versions of the master datasets are checked
+    with a HEAD request. When any of them changed since the last pass, or the
+    day rolled over, every widget is built once; each recomputes its metrics
+    only if its cache key no longer matches. Page loads then read warm results.
+    """
+
+    def __init__(self, factories=None, interval_seconds=300, company_id="ALL"):
+        self.factories = factories if factories is not None else WIDGET_FACTORIES
+        self.interval_seconds = interval_seconds
+        self.company_id = company_id
+        self._versions = None
+        self._run_date = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def _dataset_versions(self):
+        return {
+            dataset: dataset_store.get_version(S3_BUCKET, key)
+            for dataset, key in S3_MASTER_KEY_MAP.items()
+        }
+
+    def run_once(self):
+        """Refresh widget metrics if the data or the day changed, return True if it ran"""
+        versions = self._dataset_versions()
+        today = datetime.now().date()
+        if versions == self._versions and today == self._run_date:
+            return False
+
+        with prefetch_metric_cache(self.company_id):
+            for name, factory in self.factories.items():
+                try:
+                    factory()
+                except Exception as e:
+                    print(f"Error precomputing {name} metrics: {e}")
+
+        self._versions = versions
+        self._run_date = today
+        return True
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Error in widget scheduler: {e}")
+            self._stop_event.wait(self.interval_seconds)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="widget-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+def create_widget_scheduler(interval_seconds: int = None):
+    """Factory function to create a new WidgetScheduler instance."""
+    if interval_seconds is None:
+        interval_seconds = config.app_widget_refresh_seconds
+    return WidgetScheduler(interval_seconds=interval_seconds)
+
+
+widget_scheduler = create_widget_scheduler()
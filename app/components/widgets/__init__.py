@@ -1,20 +1,31 @@
 from .CollectionEffectiveness import create_collection_effectiveness_widget
 from .CollectionInsights import create_collection_insights_widget
-from .WidgetFramework import WidgetFramework
+from .WidgetFramework import WidgetFramework, prefetch_metric_cache
 from .MTDMetricsWidget import create_mtd_metrics_widget
 from .ClientMetricsWidget import create_client_metrics_widget
 from .PlacementMetricsWidget import create_placement_metrics_widget
 from .CallAnalysisWidget import create_call_analysis_widget
 from .TransactionAnalysisWidget import create_transaction_analysis_widget
+from .WidgetScheduler import (
+    WIDGET_FACTORIES,
+    WidgetScheduler,
+    compute_widget_metrics,
+    widget_scheduler,
+)
 
 
 __all__ = [
     "create_collection_effectiveness_widget",
     "create_collection_insights_widget",
     "WidgetFramework",
+    "prefetch_metric_cache",
     "create_mtd_metrics_widget",
     "create_client_metrics_widget",
     "create_placement_metrics_widget",
     "create_call_analysis_widget",
     "create_transaction_analysis_widget",
+    "WIDGET_FACTORIES",
+    "WidgetScheduler",
+    "compute_widget_metrics",
+    "widget_scheduler",
 ]
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from pathlib import Path
+from typing import Optional
 
 
 class Config(BaseSettings):
@@ -7,6 +8,7 @@ class Config(BaseSettings):
     aws_access_key_id: str
     aws_secret_access_key: str
     aws_region: str
+    aws_max_pool_connections: int = 50
 
     # AWS COGNITO
     aws_cognito_user_pool_id: str
@@ -20,6 +22,14 @@ class Config(BaseSettings):
     aws_settings_table_name: str
     aws_companies_table_name: str
     aws_requests_table_name: str
+    # Optional user_id GSIs and tag fan-out tables, see TaggedItemStore
+    aws_tasks_user_index_name: Optional[str] = None
+    aws_tickets_user_index_name: Optional[str] = None
+    aws_task_tags_table_name: Optional[str] = None
+    aws_ticket_tags_table_name: Optional[str] = None
+    # Projection type of the user_id GSIs, ALL or else KEYS_ONLY / INCLUDE
+    aws_tasks_user_index_projection: str = "ALL"
+    aws_tickets_user_index_projection: str = "ALL"
 
     # AWS S3 STORAGE
     aws_nda_storage_bucket: str
@@ -54,6 +64,16 @@ class Config(BaseSettings):
     app_reload: bool
     app_port: int
     app_name: str
+    app_dataset_cache_dir: str = ".cache/datasets"
+    app_dataset_chunksize: int = 100000
+    app_widget_scheduler_enabled: bool = True
+    app_widget_refresh_seconds: int = 300
+    # Seconds a dashboard widget may take in a worker process before the
+    # page computes it on a thread instead
+    app_widget_compute_timeout: float = 300.0
+    app_page_response_timeout: float = 60.0
+    app_session_cache_seconds: int = 60
+    app_session_flush_seconds: int = 30
 
     class Config:
         case_sensitive = False
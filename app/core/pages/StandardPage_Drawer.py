@@ -6,6 +6,14 @@ from components import create_nav_button
 
 
 class StandardPage(ABC):
+    """
+    Standard page with a right drawer.
+
+    Unlike core.pages.StandardPage, the constructor builds UI elements (the
+    drawer), so it must run on the event loop inside the page's client
+    context. Do not construct it through middleware.aio.io_bound.
+    """
+
     def __init__(self, session_manager, page_config):
         self.session_manager = session_manager
         self.list_manager = ListManager()
@@ -31,6 +39,7 @@ class StandardPage(ABC):
 
         self.app_list = self.list_manager.get_list("app_list")
 
+        # Creates UI elements, the event loop only
         with ui.right_drawer(fixed=False).style(
             "background-color: transparent"
         ) as right_drawer:
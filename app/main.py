@@ -2,6 +2,9 @@ from nicegui import ui, app
 from config import config
 from utils import permission_required
 from modules.session_manager import SessionManager
+from components.widgets import widget_scheduler
+from middleware.aio import shutdown_process_pool
+from middleware.cognito import session_cache
 
 from pages import *
 
@@ -46,10 +49,21 @@ atexit.register(cleanup_resources)
 signal.signal(signal.SIGTERM, lambda *args: cleanup_resources())
 signal.signal(signal.SIGINT, lambda *args: cleanup_resources())
 
+# Precompute dashboard widget metrics in the background
+if config.app_widget_scheduler_enabled:
+    app.on_startup(widget_scheduler.start)
+    app.on_shutdown(widget_scheduler.stop)
 
-@ui.page("/")
+# Stop the dashboard's widget worker processes
+app.on_shutdown(shutdown_process_pool)
+
+# Write pending session last_accessed updates before exiting
+app.on_shutdown(session_cache.stop)
+
+
+@ui.page("/", response_timeout=config.app_page_response_timeout)
 @permission_required("dashboard_view")
-def root():
+async def root():
     ui.navigate.to("/signin")
 
 
@@ -58,68 +72,68 @@ def root_signing():
     signin_page()
 
 
-@ui.page("/dashboard")
+@ui.page("/dashboard", response_timeout=config.app_page_response_timeout)
 @permission_required("dashboard_view")
-def root_dashboard():
+async def root_dashboard():
     """Dashboard page route handler"""
     session_manager = SessionManager()
-    return dashboard_page(session_manager)
+    return await dashboard_page(session_manager)
 
 
-@ui.page("/reports")
+@ui.page("/reports", response_timeout=config.app_page_response_timeout)
 @permission_required("dashboard_view")
-def root_reports():
+async def root_reports():
     session_manager = SessionManager()
-    return reports_page(session_manager)
+    return await reports_page(session_manager)
 
 
-@ui.page("/campaigns")
+@ui.page("/campaigns", response_timeout=config.app_page_response_timeout)
 @permission_required("dashboard_view")
-def root_campaigns():
+async def root_campaigns():
     session_manager = SessionManager()
-    return campaigns_page(session_manager)
+    return await campaigns_page(session_manager)
 
 
-@ui.page("/intelidoc")
+@ui.page("/intelidoc", response_timeout=config.app_page_response_timeout)
 @permission_required("dashboard_view")
-def root_intelidoc():
+async def root_intelidoc():
     session_manager = SessionManager()
-    return intelidoc_page(session_manager)
+    return await intelidoc_page(session_manager)
 
 
-@ui.page("/resolutions")
+@ui.page("/resolutions", response_timeout=config.app_page_response_timeout)
 @permission_required("dashboard_view")
-def root_resolutions():
+async def root_resolutions():
     session_manager = SessionManager()
-    return resolutions_page(session_manager)
+    return await resolutions_page(session_manager)
 
 
-@ui.page("/tasks")
+@ui.page("/tasks", response_timeout=config.app_page_response_timeout)
 @permission_required("dashboard_view")
-def root_tasks():
+async def root_tasks():
     session_manager = SessionManager()
-    return tasks_page(session_manager)
+    return await tasks_page(session_manager)
 
 
-@ui.page("/goals")
+@ui.page("/goals", response_timeout=config.app_page_response_timeout)
 @permission_required("dashboard_view")
-def root_goals():
+async def root_goals():
     session_manager = SessionManager()
-    return goals_page(session_manager)
+    return await goals_page(session_manager)
 
 
-@ui.page("/tickets")
+@ui.page("/tickets", response_timeout=config.app_page_response_timeout)
 @permission_required("dashboard_view")
-def root_tickets():
+async def root_tickets():
     session_manager = SessionManager()
-    return tickets_page(session_manager)
+    return await tickets_page(session_manager)
 
 
-@ui.page("/settings")
+@ui.page("/settings", response_timeout=config.app_page_response_timeout)
 @permission_required("dashboard_view")
-def root_settings():
+async def root_settings():
     session_manager = SessionManager()
-    return settings_page(session_manager)
+    return await settings_page(session_manager)
 
 
 @ui.page("/unauthorized")
@@ -3,5 +3,15 @@ from .dynamo import *
 from .s3 import *
 from .groq import *
 from .api import *
+from .aio import *
+from .aws import *
 
-__all__ = cognito.__all__ + dynamo.__all__ + s3.__all__ + groq.__all__ + api.__all__
+__all__ = (
+    cognito.__all__
+    + dynamo.__all__
+    + s3.__all__
+    + groq.__all__
+    + api.__all__
+    + aio.__all__
+    + aws.__all__
+)
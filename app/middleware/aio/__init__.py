@@ -0,0 +1,4 @@
+from .cpu_bound import cpu_bound, shutdown_process_pool
+from .io_bound import io_bound
+
+__all__ = ["cpu_bound", "io_bound", "shutdown_process_pool"]
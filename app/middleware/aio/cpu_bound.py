@@ -0,0 +1,31 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from nicegui import run
+
+# NiceGUI's run.cpu_bound pool forks its workers. A fork taken while a
+# background thread holds a lock (a DatasetStore entry during a download,
+# the AWS client factory) leaves that lock held forever in the child, so
+# workers are spawned instead and start from a clean interpreter.
+process_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+
+
+async def cpu_bound(func, *args, timeout=None):
+    """
+    Run a CPU-heavy call in a spawned worker process and await its result.
+
+    `func` and its arguments must be picklable, and the worker loads any
+    data it needs itself. Raises asyncio.TimeoutError when the result takes
+    longer than `timeout` seconds, so the caller can fall back instead of
+    waiting on a stuck worker.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(process_pool, partial(run.safe_callback, func, *args))
+    return await asyncio.wait_for(future, timeout)
+
+
+def shutdown_process_pool():
+    """Stop the worker processes, dropping calls that have not started"""
+    process_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,15 @@
+import contextvars
+
+from nicegui import run
+
+
+async def io_bound(func, *args, **kwargs):
+    """
+    Run a blocking call (boto3, HTTP) on a worker thread and await its result.
+
+    The caller's context variables are copied to the thread, so the call
+    still sees the current request and can use app.storage.user. UI
+    elements cannot be created from the thread.
+    """
+    context = contextvars.copy_context()
+    return await run.io_bound(context.run, func, *args, **kwargs)
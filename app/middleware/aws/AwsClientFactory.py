@@ -0,0 +1,84 @@
+import os
+import threading
+import weakref
+from functools import partial
+
+import boto3
+from botocore.config import Config
+
+from config import config
+
+
+class AwsClientFactory:
+    """
+    Process-wide boto3 clients.
+
+    Clients are thread-safe, so one is created per service and region and
+    shared by every middleware instance, reusing its warm connection pool.
+    Resources are not thread-safe and are cached per thread instead. After
+    a fork the caches are dropped so processes never share connections.
+    """
+
+    def __init__(self, max_pool_connections=50, tcp_keepalive=True):
+        self.client_config = Config(
+            max_pool_connections=max_pool_connections, tcp_keepalive=tcp_keepalive
+        )
+        self._reset()
+        os.register_at_fork(
+            after_in_child=partial(_reset_after_fork, weakref.ref(self))
+        )
+
+    def _reset(self):
+        # A forked child gets a new lock: the inherited one may be held by a
+        # parent thread that was creating a client and does not exist there
+        self._lock = threading.Lock()
+        self._session = boto3.session.Session()
+        self._clients = {}
+        self._local = threading.local()
+
+    def client(self, service_name, region_name=None):
+        """Return the shared client for a service"""
+        key = (service_name, region_name)
+        client = self._clients.get(key)
+        if client is None:
+            # Sessions are not thread-safe, creation is serialized
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._session.client(
+                        service_name,
+                        region_name=region_name,
+                        config=self.client_config,
+                    )
+                    self._clients[key] = client
+        return client
+
+    def resource(self, service_name, region_name=None):
+        """Return this thread's resource for a service"""
+        resources = getattr(self._local, "resources", None)
+        if resources is None:
+            resources = self._local.resources = {}
+        key = (service_name, region_name)
+        if key not in resources:
+            with self._lock:
+                resources[key] = self._session.resource(
+                    service_name, region_name=region_name, config=self.client_config
+                )
+        return resources[key]
+
+
+def _reset_after_fork(factory_ref):
+    """Drop a factory's clients in a forked child, if the factory still exists"""
+    factory = factory_ref()
+    if factory is not None:
+        factory._reset()
+
+
+def create_aws_client_factory(max_pool_connections: int = None):
+    """Factory function to create a new AwsClientFactory instance."""
+    if max_pool_connections is None:
+        max_pool_connections = config.aws_max_pool_connections
+    return AwsClientFactory(max_pool_connections=max_pool_connections)
+
+
+aws_clients = create_aws_client_factory()
@@ -0,0 +1,3 @@
+from .AwsClientFactory import AwsClientFactory, aws_clients, create_aws_client_factory
+
+__all__ = ["AwsClientFactory", "aws_clients", "create_aws_client_factory"]
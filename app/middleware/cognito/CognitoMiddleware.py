@@ -1,10 +1,12 @@
-import boto3
 import uuid
 from nicegui import app, ui
 from botocore.exceptions import ClientError
 from datetime import datetime, timezone, timedelta
 
 from modules import PermissionManager, TokenManager, TokenType
+from middleware.aio import io_bound
+from middleware.aws import aws_clients
+from .SessionCache import session_cache
 from config import config
 
 
@@ -13,18 +15,20 @@ class CognitoMiddleware:
         self.user_pool_id = config.aws_cognito_user_pool_id
         self.client_id = config.aws_cognito_client_id
         self.region = config.aws_region
-        self.client = boto3.client("cognito-idp", region_name=config.aws_region)
-        self.dynamodb_client = None
-        self.dynamodb_table = None
+        self.client = aws_clients.client("cognito-idp", region_name=config.aws_region)
         self.user_permissions = []
         self.isAuthenticated = False
         self.user_uuid = None
         self.permission_manager = PermissionManager()
-        self._onload()
 
-    def _onload(self):
-        self.dynamodb_client = boto3.resource("dynamodb", region_name=self.region)
-        self.dynamodb_table = self.dynamodb_client.Table(config.aws_sessions_table_name)
+    @property
+    def dynamodb_client(self):
+        # Resources are not thread-safe, use the calling thread's own
+        return aws_clients.resource("dynamodb", region_name=self.region)
+
+    @property
+    def dynamodb_table(self):
+        return self.dynamodb_client.Table(config.aws_sessions_table_name)
 
     def initialize_user(self):
         """Initialize user context within a page builder function."""
@@ -45,6 +49,29 @@ class CognitoMiddleware:
         else:
             print("User already authenticated.")
 
+    async def initialize_user_async(self):
+        """initialize_user for async page builders, session I/O runs off the event loop"""
+        if self.is_authenticated():
+            print("User already authenticated.")
+            return
+        username = app.storage.user.get("username")
+        session_id = app.storage.user.get("session_id")
+        if not (username and session_id):
+            print("No user or session found in storage.")
+            return
+        if session_cache.is_verified(session_id, self.get_user_id()):
+            # Served from the session cache without touching DynamoDB
+            verified = self.verify_session(username, session_id)
+        else:
+            verified = await io_bound(self.verify_session, username, session_id)
+        if verified:
+            self.isAuthenticated = True
+            self.user_id = self.get_user_id()
+            self.get_user_groups(app.storage.user.get("access_token"))
+        else:
+            await self.signout_async()
+            print("Invalid or expired session.")
+
     def is_authenticated(self):
         """Check if the user is authenticated."""
         return (
@@ -114,6 +141,15 @@ class CognitoMiddleware:
 
     def signout(self):
         """Sign out the user and clear the session."""
+        self._end_session()
+        ui.navigate.to("/signin")
+
+    async def signout_async(self):
+        """signout for async handlers, the Cognito and DynamoDB calls run off the event loop"""
+        await io_bound(self._end_session)
+        ui.navigate.to("/signin")
+
+    def _end_session(self):
         print("Signing out user...")
         try:
             self.client.global_sign_out(
@@ -126,7 +162,6 @@ class CognitoMiddleware:
         )
         self.isAuthenticated = False
         app.storage.user.clear()
-        ui.navigate.to("/signin")
 
     def handle_mfa(self, mfa_code):
         try:
@@ -239,25 +274,8 @@ class CognitoMiddleware:
         Returns:
             bool: True if the user has any of the required permissions, False otherwise.
         """
-        if isinstance(required_permissions, str):
-            required_permissions = [required_permissions]
-
         user_groups = app.storage.user.get("user_groups", [])
-
-        # Check if any user group starts with '_role_'
-        role_groups = [group for group in user_groups if group.startswith("_role_")]
-
-        for role_group in role_groups:
-            role = role_group
-            if role in self.permission_manager.get_all_roles():
-                role_permissions = self.permission_manager.get_permissions(
-                    role=role, cleaned_list=False
-                )
-                if any(perm in role_permissions for perm in required_permissions):
-                    return True
-
-        # If not found in roles, check individual permissions
-        return any(perm in user_groups for perm in required_permissions)
+        return self.permission_manager.has_any(user_groups, required_permissions)
 
     def get_user_groups(self, provided_token=None):
         if provided_token is None:
@@ -340,6 +358,10 @@ class CognitoMiddleware:
             print("User ID not found. Cannot verify session.")
             return False
 
+        if session_cache.is_verified(session_id, user_id):
+            session_cache.touch(session_id, user_id)
+            return True
+
         try:
             response = self.dynamodb_table.get_item(
                 Key={"session_id": session_id, "user_id": user_id}
@@ -353,19 +375,15 @@ class CognitoMiddleware:
             if current_timestamp > item.get("expiration_time", 0):
                 print("Session has expired.")
                 self.invalidate_session(username, session_id)
-                self.signout()
+                self._end_session()
                 return False
 
             if not item.get("is_active", False):
                 print("Session is inactive.")
                 return False
 
-            # Update last_accessed timestamp
-            self.dynamodb_table.update_item(
-                Key={"session_id": session_id, "user_id": user_id},
-                UpdateExpression="SET last_accessed = :la",
-                ExpressionAttributeValues={":la": current_timestamp},
-            )
+            session_cache.mark_verified(session_id, user_id, item["expiration_time"])
+            session_cache.touch(session_id, user_id, current_timestamp)
             return True
         except ClientError as e:
             print(f"Error verifying session in DynamoDB: {e}")
@@ -380,6 +398,7 @@ class CognitoMiddleware:
             print("User ID not found. Cannot invalidate session.")
             return
 
+        session_cache.invalidate(session_id, user_id)
         try:
             # Option 1: Mark session as inactive
             self.dynamodb_table.update_item(
@@ -440,23 +459,19 @@ class CognitoMiddleware:
     def update_last_accessed(self, username, session_id):
         """
         Update the last_accessed timestamp for the session.
+
+        The write is coalesced and made in the background by the session cache.
         """
         user_id = self.get_user_id()
         if not user_id:
             print("User ID not found. Cannot update session.")
             return
 
-        try:
-            current_timestamp = int(datetime.now(timezone.utc).timestamp())
+        session_cache.touch(session_id, user_id)
 
-            self.dynamodb_table.update_item(
-                Key={"session_id": session_id, "user_id": user_id},
-                UpdateExpression="SET last_accessed = :la",
-                ExpressionAttributeValues={":la": current_timestamp},
-            )
-            print(f"Session {session_id} last_accessed updated for user {username}.")
-        except ClientError as e:
-            print(f"Error updating last_accessed in DynamoDB: {e}")
+    async def update_last_accessed_async(self, username, session_id):
+        # Only records the access in memory, no I/O to move off the loop
+        self.update_last_accessed(username, session_id)
 
     def forgot_password(self, username):
         try:
@@ -0,0 +1,115 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+from botocore.exceptions import ClientError
+
+from config import config
+from middleware.aws import aws_clients
+
+
+class SessionCache:
+    """
+    In-process cache of verified sessions with write-behind last_accessed updates.
+
+    A session verified against DynamoDB is trusted for `ttl_seconds` (never
+    past its own expiration_time), so navigation does not re-read it.
+    last_accessed timestamps are recorded in memory and the latest one per
+    session is written every `flush_seconds` by a background thread.
+    Sessions invalidated in this process are dropped immediately; changes
+    made elsewhere are picked up once the cached verification expires.
+    """
+
+    def __init__(self, ttl_seconds=60, flush_seconds=30):
+        self.ttl_seconds = ttl_seconds
+        self.flush_seconds = flush_seconds
+        self._verified = {}
+        self._last_accessed = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def is_verified(self, session_id, user_id):
+        """Whether the session was verified recently and has not expired"""
+        with self._lock:
+            entry = self._verified.get((session_id, user_id))
+            if entry is None:
+                return False
+            cached_until, expiration_time = entry
+            now = int(datetime.now(timezone.utc).timestamp())
+            if time.monotonic() > cached_until or now > expiration_time:
+                del self._verified[(session_id, user_id)]
+                return False
+            return True
+
+    def mark_verified(self, session_id, user_id, expiration_time):
+        with self._lock:
+            self._verified[(session_id, user_id)] = (
+                time.monotonic() + self.ttl_seconds,
+                int(expiration_time),
+            )
+
+    def invalidate(self, session_id, user_id):
+        with self._lock:
+            self._verified.pop((session_id, user_id), None)
+            self._last_accessed.pop((session_id, user_id), None)
+
+    def touch(self, session_id, user_id, timestamp=None):
+        """Record an access, written to DynamoDB on the next flush"""
+        if timestamp is None:
+            timestamp = int(datetime.now(timezone.utc).timestamp())
+        with self._lock:
+            key = (session_id, user_id)
+            self._last_accessed[key] = max(timestamp, self._last_accessed.get(key, 0))
+        self._start()
+
+    def flush(self):
+        """Write pending last_accessed timestamps"""
+        with self._lock:
+            pending, self._last_accessed = self._last_accessed, {}
+        if not pending:
+            return
+        table = aws_clients.resource("dynamodb", region_name=config.aws_region).Table(
+            config.aws_sessions_table_name
+        )
+        for (session_id, user_id), timestamp in pending.items():
+            try:
+                table.update_item(
+                    Key={"session_id": session_id, "user_id": user_id},
+                    UpdateExpression="SET last_accessed = :la",
+                    ConditionExpression="attribute_exists(session_id)",
+                    ExpressionAttributeValues={":la": timestamp},
+                )
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    print(f"Error updating last_accessed in DynamoDB: {e}")
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_seconds):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error flushing session cache: {e}")
+
+    def _start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="session-cache-flush", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the flush thread and write what is pending"""
+        self._stop_event.set()
+        self.flush()
+
+
+session_cache = SessionCache(
+    ttl_seconds=config.app_session_cache_seconds,
+    flush_seconds=config.app_session_flush_seconds,
+)
@@ -1,3 +1,9 @@
 from .CognitoMiddleware import CognitoMiddleware, create_cognito_middleware
+from .SessionCache import SessionCache, session_cache
 
-__all__ = ["CognitoMiddleware", "create_cognito_middleware"]
+__all__ = [
+    "CognitoMiddleware",
+    "create_cognito_middleware",
+    "SessionCache",
+    "session_cache",
+]
@@ -1,4 +1,12 @@
-import boto3
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from middleware.aws import aws_clients
+
+from .DynamoSerializer import dynamo_serializer
 
 """
 Example key format for DynamoDB operations:
@@ -26,33 +34,154 @@ Example expression attribute values:
 }
 """
 
+# Marks the end of one segment of a parallel scan
+_SEGMENT_DONE = object()
+
+# DynamoDB limits on the number of entries per batch request
+BATCH_GET_LIMIT = 100
+BATCH_WRITE_LIMIT = 25
+# Attempts at a batch chunk before its unprocessed entries are given up on
+BATCH_MAX_ATTEMPTS = 8
+
 
 class DynamoMiddleware:
     def __init__(self, table_name):
-        self.dynamo_client = boto3.client("dynamodb")
+        self.dynamo_client = aws_clients.client("dynamodb")
         self.table_name = table_name
 
-    def get_item(self, key):
-        response = self.dynamo_client.get_item(TableName=self.table_name, Key=key)
+    def get_item(
+        self, key, projection_expression=None, expression_attribute_names=None
+    ):
+        params = {"TableName": self.table_name, "Key": key}
+        if projection_expression:
+            params["ProjectionExpression"] = projection_expression
+        if expression_attribute_names:
+            params["ExpressionAttributeNames"] = expression_attribute_names
+
+        response = self.dynamo_client.get_item(**params)
         if "Item" not in response:
             return None
 
         return response["Item"]
 
-    def get_all_items(self):
-        response = self.dynamo_client.scan(TableName=self.table_name)
-        return response["Items"]
+    def get_all_items(self, projection_expression=None, total_segments=1):
+        items = []
+        for page in self.scan_pages(
+            projection_expression=projection_expression,
+            total_segments=total_segments,
+        ):
+            items.extend(page)
+        return items
 
     def put_item(self, item):
         response = self.dynamo_client.put_item(TableName=self.table_name, Item=item)
         return response
 
+    def batch_get(
+        self,
+        keys,
+        projection_expression=None,
+        expression_attribute_names=None,
+        deserialize=False,
+        max_workers=4,
+    ):
+        """
+        Return the items for `keys` using BatchGetItem.
+
+        Keys are sent in chunks of 100, up to `max_workers` chunks at a
+        time, and unprocessed keys are retried with backoff. Keys without
+        an item are left out and the order of the result is not fixed.
+        """
+        unique_keys = []
+        seen = set()
+        for key in keys:
+            marker = repr(sorted(key.items()))
+            if marker not in seen:
+                seen.add(marker)
+                unique_keys.append(key)
+
+        request = {}
+        if projection_expression:
+            request["ProjectionExpression"] = projection_expression
+        if expression_attribute_names:
+            request["ExpressionAttributeNames"] = expression_attribute_names
+
+        def get_chunk(chunk):
+            items = []
+            pending = {self.table_name: {**request, "Keys": chunk}}
+            for attempt in range(BATCH_MAX_ATTEMPTS):
+                response = self.dynamo_client.batch_get_item(RequestItems=pending)
+                items.extend(response.get("Responses", {}).get(self.table_name, []))
+                pending = response.get("UnprocessedKeys") or {}
+                if not pending:
+                    return items
+                self._backoff(attempt)
+            raise RuntimeError(
+                f"{len(pending[self.table_name]['Keys'])} keys of {self.table_name} "
+                f"were still unprocessed after {BATCH_MAX_ATTEMPTS} attempts"
+            )
+
+        items = []
+        for chunk_items in self._run_chunks(
+            get_chunk, unique_keys, BATCH_GET_LIMIT, max_workers
+        ):
+            items.extend(chunk_items)
+        if deserialize:
+            items = [dynamo_serializer.deserialize_item(item) for item in items]
+        return items
+
+    def batch_write(self, put_items=None, delete_keys=None, max_workers=4):
+        """
+        Put and delete items using BatchWriteItem.
+
+        Requests are sent in chunks of 25, up to `max_workers` chunks at a
+        time, and unprocessed requests are retried with backoff. A key may
+        only appear once across `put_items` and `delete_keys`.
+        """
+        requests = [{"PutRequest": {"Item": item}} for item in put_items or []]
+        requests.extend({"DeleteRequest": {"Key": key}} for key in delete_keys or [])
+
+        def write_chunk(chunk):
+            pending = {self.table_name: chunk}
+            for attempt in range(BATCH_MAX_ATTEMPTS):
+                response = self.dynamo_client.batch_write_item(RequestItems=pending)
+                pending = response.get("UnprocessedItems") or {}
+                if not pending:
+                    return len(chunk)
+                self._backoff(attempt)
+            raise RuntimeError(
+                f"{len(pending[self.table_name])} writes to {self.table_name} "
+                f"were still unprocessed after {BATCH_MAX_ATTEMPTS} attempts"
+            )
+
+        return sum(
+            self._run_chunks(write_chunk, requests, BATCH_WRITE_LIMIT, max_workers)
+        )
+
+    @staticmethod
+    def _run_chunks(func, entries, chunk_size, max_workers):
+        """Apply `func` to each chunk of `entries`, concurrently when there are several"""
+        chunks = [
+            entries[start : start + chunk_size]
+            for start in range(0, len(entries), chunk_size)
+        ]
+        if len(chunks) <= 1 or max_workers <= 1:
+            return [func(chunk) for chunk in chunks]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            return list(executor.map(func, chunks))
+
+    @staticmethod
+    def _backoff(attempt):
+        """Sleep before retrying unprocessed batch entries, with full jitter"""
+        time.sleep(random.uniform(0, min(0.05 * 2**attempt, 2.0)))
+
     def update_item(
         self,
         key,
         update_expression,
         expression_attribute_values,
         expression_attribute_names=None,
+        condition_expression=None,
     ):
         params = {
             "TableName": self.table_name,
@@ -62,6 +191,8 @@ class DynamoMiddleware:
         }
         if expression_attribute_names:
             params["ExpressionAttributeNames"] = expression_attribute_names
+        if condition_expression:
+            params["ConditionExpression"] = condition_expression
 
         response = self.dynamo_client.update_item(**params)
         return response
@@ -70,24 +201,217 @@ class DynamoMiddleware:
         response = self.dynamo_client.delete_item(TableName=self.table_name, Key=key)
         return response
 
-    def query(self, query_expression, expression_attribute_values):
-        response = self.dynamo_client.query(
-            TableName=self.table_name,
-            QueryExpression=query_expression,
-            ExpressionAttributeValues=expression_attribute_values,
-        )
-        return response
+    def query(
+        self,
+        key_condition_expression,
+        expression_attribute_values,
+        index_name=None,
+        filter_expression=None,
+        projection_expression=None,
+        expression_attribute_names=None,
+        limit=None,
+        descending=False,
+        exclusive_start_key=None,
+        deserialize=False,
+    ):
+        """
+        Query the table or one of its indexes, following LastEvaluatedKey across pages.
 
-    def scan(self, filter_expression=None, expression_attribute_values=None):
-        params = {"TableName": self.table_name}
+        `limit` caps the number of items returned; when it cuts the query
+        short the result carries the `LastEvaluatedKey` to pass back as
+        `exclusive_start_key` for the next page. `descending` reverses the
+        sort key order and `deserialize` returns items as native Python
+        values instead of DynamoDB typed values.
+        """
+        items = []
+        last_evaluated_key = None
+        for response in self._query_responses(
+            key_condition_expression,
+            expression_attribute_values,
+            index_name,
+            filter_expression,
+            projection_expression,
+            expression_attribute_names,
+            limit,
+            descending,
+            exclusive_start_key,
+        ):
+            items.extend(response.get("Items", []))
+            last_evaluated_key = response.get("LastEvaluatedKey")
+
+        if deserialize:
+            items = [dynamo_serializer.deserialize_item(item) for item in items]
+        result = {"Items": items, "Count": len(items)}
+        if last_evaluated_key:
+            result["LastEvaluatedKey"] = last_evaluated_key
+        return result
+
+    def query_pages(
+        self,
+        key_condition_expression,
+        expression_attribute_values,
+        index_name=None,
+        filter_expression=None,
+        projection_expression=None,
+        expression_attribute_names=None,
+        limit=None,
+        descending=False,
+        exclusive_start_key=None,
+        deserialize=False,
+    ):
+        """Yield the items of a query page by page, see `query`"""
+        for response in self._query_responses(
+            key_condition_expression,
+            expression_attribute_values,
+            index_name,
+            filter_expression,
+            projection_expression,
+            expression_attribute_names,
+            limit,
+            descending,
+            exclusive_start_key,
+        ):
+            items = response.get("Items", [])
+            if deserialize:
+                items = [dynamo_serializer.deserialize_item(item) for item in items]
+            yield items
 
+    def _query_responses(
+        self,
+        key_condition_expression,
+        expression_attribute_values,
+        index_name,
+        filter_expression,
+        projection_expression,
+        expression_attribute_names,
+        limit,
+        descending,
+        exclusive_start_key,
+    ):
+        params = {
+            "TableName": self.table_name,
+            "KeyConditionExpression": key_condition_expression,
+            "ExpressionAttributeValues": expression_attribute_values,
+        }
+        if index_name:
+            params["IndexName"] = index_name
+        if filter_expression:
+            params["FilterExpression"] = filter_expression
+        if projection_expression:
+            params["ProjectionExpression"] = projection_expression
+        if expression_attribute_names:
+            params["ExpressionAttributeNames"] = expression_attribute_names
+        if descending:
+            params["ScanIndexForward"] = False
+        if exclusive_start_key:
+            params["ExclusiveStartKey"] = exclusive_start_key
+
+        returned = 0
+        while True:
+            if limit is not None:
+                # A page never holds more than Limit items, so none are dropped
+                params["Limit"] = limit - returned
+            response = self.dynamo_client.query(**params)
+            yield response
+            returned += response.get("Count", len(response.get("Items", [])))
+            last_evaluated_key = response.get("LastEvaluatedKey")
+            if not last_evaluated_key or (limit is not None and returned >= limit):
+                return
+            params = {**params, "ExclusiveStartKey": last_evaluated_key}
+
+    def scan(
+        self,
+        filter_expression=None,
+        expression_attribute_values=None,
+        projection_expression=None,
+        expression_attribute_names=None,
+        total_segments=1,
+    ):
+        """Scan the whole table, following LastEvaluatedKey across pages"""
+        items = []
+        for page in self.scan_pages(
+            filter_expression,
+            expression_attribute_values,
+            projection_expression,
+            expression_attribute_names,
+            total_segments,
+        ):
+            items.extend(page)
+        return {"Items": items, "Count": len(items)}
+
+    def scan_pages(
+        self,
+        filter_expression=None,
+        expression_attribute_values=None,
+        projection_expression=None,
+        expression_attribute_names=None,
+        total_segments=1,
+    ):
+        """
+        Yield the items of a scan page by page until the table is exhausted.
+
+        With `total_segments` above 1 the table is read as a DynamoDB
+        parallel scan with one worker thread per segment. Pages are yielded
+        as they arrive, so their order across segments is not fixed.
+        """
+        params = {"TableName": self.table_name}
         if filter_expression:
             params["FilterExpression"] = filter_expression
         if expression_attribute_values:
             params["ExpressionAttributeValues"] = expression_attribute_values
+        if projection_expression:
+            params["ProjectionExpression"] = projection_expression
+        if expression_attribute_names:
+            params["ExpressionAttributeNames"] = expression_attribute_names
 
-        response = self.dynamo_client.scan(**params)
-        return response
+        if total_segments <= 1:
+            yield from self._scan_segment(params)
+            return
+
+        pages = queue.Queue()
+        stop = threading.Event()
+
+        def read_segment(segment):
+            try:
+                segment_params = {
+                    **params,
+                    "Segment": segment,
+                    "TotalSegments": total_segments,
+                }
+                for page in self._scan_segment(segment_params):
+                    if stop.is_set():
+                        break
+                    pages.put(page)
+            except Exception as e:
+                pages.put(e)
+            finally:
+                pages.put(_SEGMENT_DONE)
+
+        with ThreadPoolExecutor(max_workers=total_segments) as executor:
+            for segment in range(total_segments):
+                executor.submit(read_segment, segment)
+            try:
+                remaining = total_segments
+                while remaining:
+                    page = pages.get()
+                    if page is _SEGMENT_DONE:
+                        remaining -= 1
+                    elif isinstance(page, Exception):
+                        raise page
+                    else:
+                        yield page
+            finally:
+                # Let the other segments finish early if the caller stops reading
+                stop.set()
+
+    def _scan_segment(self, params):
+        while True:
+            response = self.dynamo_client.scan(**params)
+            yield response.get("Items", [])
+            last_evaluated_key = response.get("LastEvaluatedKey")
+            if not last_evaluated_key:
+                return
+            params = {**params, "ExclusiveStartKey": last_evaluated_key}
 
 
 def create_dynamo_middleware(table_name):
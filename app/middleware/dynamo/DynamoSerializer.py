@@ -0,0 +1,212 @@
+from math import isfinite
+from collections.abc import Mapping
+from decimal import Decimal
+from numbers import Integral, Real
+
+_CONTAINER_TYPES = frozenset(("M", "L"))
+
+
+class DynamoSerializer:
+    """
+    Converts between DynamoDB typed values (`{"S": "abc"}`, `{"M": {...}}`,
+    ...) and native Python values.
+
+    Each typed value is a dict with a single type key, so it is unpacked
+    once and dispatched on that key; native values are dispatched on their
+    exact type. Maps and lists are walked with an explicit stack instead of
+    recursion, so deep payloads such as `metric_cache` cost no Python frames
+    per level.
+
+    Numbers are read back as int or float, or as Decimal with
+    `use_decimal`. Sets become Python sets and NULL becomes None. When
+    serializing, bool is kept apart from int, Decimal and numpy scalars
+    become numbers, NaN and infinities (which DynamoDB rejects) become NULL,
+    and other unknown values are stored as strings.
+    """
+
+    def __init__(self, use_decimal=False):
+        number = Decimal if use_decimal else self._number
+        self._number_decoder = number
+        self._decoders = {
+            "N": number,
+            "NULL": lambda value: None,
+            "B": bytes,
+            "SS": set,
+            "NS": lambda value: {number(item) for item in value},
+            "BS": lambda value: {bytes(item) for item in value},
+        }
+        self._encoders = {
+            str: self._string,
+            bool: self._bool,
+            int: self._int,
+            float: self._float,
+            Decimal: self._decimal,
+            type(None): self._null,
+            bytes: self._binary,
+            bytearray: self._binary,
+            set: self._set,
+            frozenset: self._set,
+        }
+
+    @staticmethod
+    def _number(value):
+        # Checking the text is much cheaper than letting int() raise
+        if "." in value or "e" in value or "E" in value:
+            return float(value)
+        return int(value)
+
+    @staticmethod
+    def _string(value):
+        return {"S": value}
+
+    @staticmethod
+    def _bool(value):
+        return {"BOOL": value}
+
+    @staticmethod
+    def _int(value):
+        return {"N": str(value)}
+
+    @staticmethod
+    def _float(value):
+        if not isfinite(value):
+            return {"NULL": True}
+        return {"N": str(value)}
+
+    @staticmethod
+    def _decimal(value):
+        if not value.is_finite():
+            return {"NULL": True}
+        return {"N": str(value)}
+
+    @staticmethod
+    def _null(value):
+        return {"NULL": True}
+
+    @staticmethod
+    def _binary(value):
+        return {"B": bytes(value)}
+
+    def _set(self, value):
+        if not value:
+            raise ValueError("DynamoDB cannot store an empty set")
+        if all(isinstance(item, str) for item in value):
+            return {"SS": sorted(value)}
+        if all(isinstance(item, (bytes, bytearray)) for item in value):
+            return {"BS": sorted(bytes(item) for item in value)}
+        if all(
+            isinstance(item, (Real, Decimal)) and not isinstance(item, bool)
+            for item in value
+        ):
+            return {"NS": [str(item) for item in value]}
+        raise ValueError("DynamoDB sets must hold only strings, numbers or bytes")
+
+    def _encode_scalar(self, value):
+        """Encode a value that is not a map or list"""
+        encoder = self._encoders.get(type(value))
+        if encoder is not None:
+            return encoder(value)
+        if isinstance(value, str):
+            return {"S": str(value)}
+        if isinstance(value, memoryview):
+            return {"B": value.tobytes()}
+        # numpy and pandas values convert themselves to native ones
+        tolist = getattr(value, "tolist", None)
+        if callable(tolist):
+            return self.serialize(tolist())
+        if isinstance(value, Integral):
+            return {"N": str(int(value))}
+        if isinstance(value, Real):
+            return self._float(float(value))
+        if isinstance(value, (set, frozenset)):
+            return self._set(value)
+        return {"S": str(value)}
+
+    def deserialize(self, value):
+        """Return the native value of one typed value"""
+        ((type_key, raw),) = value.items()
+        if type_key == "S" or type_key == "BOOL":
+            return raw
+        if type_key not in _CONTAINER_TYPES:
+            return self._decoders[type_key](raw)
+
+        decoders = self._decoders
+        number = self._number_decoder
+        root = [None]
+        stack = [(root, 0, type_key, raw)]
+        while stack:
+            parent, slot, type_key, raw = stack.pop()
+            if type_key == "M":
+                result = {}
+                entries = raw.items()
+            else:
+                result = [None] * len(raw)
+                entries = enumerate(raw)
+            parent[slot] = result
+            for key, item in entries:
+                ((item_type, item_raw),) = item.items()
+                if item_type == "S" or item_type == "BOOL":
+                    result[key] = item_raw
+                elif item_type == "N":
+                    result[key] = number(item_raw)
+                elif item_type in _CONTAINER_TYPES:
+                    # Reserve the slot so map keys keep their order
+                    result[key] = None
+                    stack.append((result, key, item_type, item_raw))
+                else:
+                    result[key] = decoders[item_type](item_raw)
+        return root[0]
+
+    def deserialize_item(self, item):
+        """Return a native dict for a whole item, e.g. an entry of `Items`"""
+        return self.deserialize({"M": item})
+
+    def serialize(self, value):
+        """Return the typed value of one native value"""
+        if not isinstance(value, (Mapping, list, tuple)):
+            return self._encode_scalar(value)
+
+        encoders = self._encoders
+        root = [None]
+        stack = [(root, 0, value)]
+        while stack:
+            parent, slot, value = stack.pop()
+            if isinstance(value, Mapping):
+                result = {}
+                parent[slot] = {"M": result}
+                entries = value.items()
+            else:
+                result = [None] * len(value)
+                parent[slot] = {"L": result}
+                entries = enumerate(value)
+            for key, item in entries:
+                item_type = type(item)
+                if item_type is str:
+                    result[key] = {"S": item}
+                    continue
+                if item_type is int:
+                    result[key] = {"N": str(item)}
+                    continue
+                if item_type is float and isfinite(item):
+                    result[key] = {"N": str(item)}
+                    continue
+                if item_type is dict or item_type is list or item_type is tuple:
+                    result[key] = None
+                    stack.append((result, key, item))
+                    continue
+                encoder = encoders.get(item_type)
+                if encoder is not None:
+                    result[key] = encoder(item)
+                elif isinstance(item, (Mapping, list, tuple)):
+                    result[key] = None
+                    stack.append((result, key, item))
+                else:
+                    result[key] = self._encode_scalar(item)
+        return root[0]
+
+    def serialize_item(self, item):
+        """Return a typed item from a native dict, e.g. for `put_item`"""
+        return self.serialize(item)["M"]
+
+
+dynamo_serializer = DynamoSerializer()
@@ -0,0 +1,275 @@
+from config import config
+
+from .DynamoMiddleware import DynamoMiddleware
+
+
+class TaggedItemStore:
+    """
+    Per-user reads of items that have an owner and a list of tagged users,
+    such as tasks and tickets.
+
+    Items a user owns are read with a Query on a GSI keyed on the owner
+    attribute. Items a user is tagged on are read through a fan-out table
+    holding one row per (tagged user, item), which the write methods here
+    keep in step with the item table, followed by a BatchGetItem. Neither
+    read touches items that are unrelated to the user.
+
+    The fan-out table has the string hash key `tag` (the tagged user) and
+    the string range key `item_id`, and also stores `owner_id` so the item
+    key can be rebuilt. Without `owner_index_name` or `tag_table_name` the
+    corresponding read falls back to a filtered Scan of the item table.
+
+    With the default `owner_index_projection` of "ALL" the owner GSI must
+    project all attributes, since owned items are returned straight from
+    it. For a KEYS_ONLY or INCLUDE index pass its projection type instead:
+    the GSI then only supplies the item keys and the items are read from
+    the item table with BatchGetItem.
+    """
+
+    def __init__(
+        self,
+        table_name,
+        id_attribute,
+        tags_attribute,
+        owner_index_name=None,
+        tag_table_name=None,
+        owner_attribute="user_id",
+        owner_index_projection="ALL",
+    ):
+        self.items = DynamoMiddleware(table_name)
+        self.tag_index = DynamoMiddleware(tag_table_name) if tag_table_name else None
+        self.id_attribute = id_attribute
+        self.tags_attribute = tags_attribute
+        self.owner_attribute = owner_attribute
+        self.owner_index_name = owner_index_name
+        self.owner_index_projection = owner_index_projection
+
+    @staticmethod
+    def _where(where, prefix):
+        """Build an equality filter from a dict of attribute names to typed values"""
+        if not where:
+            return None, {}, {}
+        conditions = []
+        names = {}
+        values = {}
+        for position, (attribute, value) in enumerate(where.items()):
+            names[f"#{prefix}{position}"] = attribute
+            values[f":{prefix}{position}"] = value
+            conditions.append(f"#{prefix}{position} = :{prefix}{position}")
+        return " AND ".join(conditions), names, values
+
+    @staticmethod
+    def _matches(item, where):
+        return all(item.get(attribute) == value for attribute, value in where.items())
+
+    def _tags(self, item):
+        tags = (item or {}).get(self.tags_attribute)
+        if not isinstance(tags, dict):
+            return set()
+        if "SS" in tags:
+            return set(tags["SS"])
+        return {tag["S"] for tag in tags.get("L", []) if "S" in tag}
+
+    def _key(self, item):
+        return {
+            self.id_attribute: item[self.id_attribute],
+            self.owner_attribute: item[self.owner_attribute],
+        }
+
+    def get_owned(self, user_id, where=None):
+        """Return the items owned by `user_id`, optionally filtered by `where`"""
+        filter_expression, names, values = self._where(where, "w")
+        if not self.owner_index_name:
+            names["#owner"] = self.owner_attribute
+            condition = "#owner = :owner"
+            if filter_expression:
+                condition = f"{condition} AND {filter_expression}"
+            return self.items.scan(
+                filter_expression=condition,
+                expression_attribute_values={":owner": {"S": user_id}, **values},
+                expression_attribute_names=names,
+            )
+
+        names["#owner"] = self.owner_attribute
+        if self.owner_index_projection == "ALL":
+            return self.items.query(
+                "#owner = :owner",
+                {":owner": {"S": user_id}, **values},
+                index_name=self.owner_index_name,
+                filter_expression=filter_expression,
+                expression_attribute_names=names,
+            )
+
+        # The index may not hold the filtered attributes, so the filter is
+        # applied to the items read from the table
+        rows = self.items.query(
+            "#owner = :owner",
+            {":owner": {"S": user_id}},
+            index_name=self.owner_index_name,
+            projection_expression="#id, #owner",
+            expression_attribute_names={
+                "#id": self.id_attribute,
+                "#owner": self.owner_attribute,
+            },
+        )["Items"]
+        items = [
+            item
+            for item in self.items.batch_get([self._key(row) for row in rows])
+            if self._matches(item, where or {})
+        ]
+        return {"Items": items, "Count": len(items)}
+
+    def get_tagged(self, user_id, where=None):
+        """Return the items `user_id` is tagged on, optionally filtered by `where`"""
+        if self.tag_index is None:
+            filter_expression, names, values = self._where(where, "w")
+            names["#tags"] = self.tags_attribute
+            condition = "contains(#tags, :tag)"
+            if filter_expression:
+                condition = f"{condition} AND {filter_expression}"
+            return self.items.scan(
+                filter_expression=condition,
+                expression_attribute_values={":tag": {"S": user_id}, **values},
+                expression_attribute_names=names,
+            )
+
+        rows = self.tag_index.query(
+            "#tag = :tag",
+            {":tag": {"S": user_id}},
+            expression_attribute_names={"#tag": "tag"},
+        )["Items"]
+        keys = [
+            {
+                self.id_attribute: row["item_id"],
+                self.owner_attribute: row["owner_id"],
+            }
+            for row in rows
+        ]
+        # Rows of deleted items simply find nothing here
+        items = [
+            item
+            for item in self.items.batch_get(keys)
+            if user_id in self._tags(item) and self._matches(item, where or {})
+        ]
+        return {"Items": items, "Count": len(items)}
+
+    def get_for_user(self, user_id, where=None):
+        """Return the items owned by or tagged with `user_id`, without duplicates"""
+        items = []
+        seen_ids = set()
+        for response in (
+            self.get_owned(user_id, where),
+            self.get_tagged(user_id, where),
+        ):
+            for item in response["Items"]:
+                item_id = item[self.id_attribute]["S"]
+                if item_id not in seen_ids:
+                    items.append(item)
+                    seen_ids.add(item_id)
+        return {"Items": items, "Count": len(items)}
+
+    def put_item(self, item):
+        """Write an item and update the fan-out rows of its tags"""
+        previous_tags = set()
+        if self.tag_index is not None:
+            previous = self.items.get_item(
+                self._key(item),
+                projection_expression="#tags",
+                expression_attribute_names={"#tags": self.tags_attribute},
+            )
+            previous_tags = self._tags(previous)
+
+        response = self.items.put_item(item)
+        if self.tag_index is not None:
+            self._index_tags(item, previous_tags, self._tags(item))
+        return response
+
+    def delete_item(self, key):
+        """Delete an item together with the fan-out rows of its tags"""
+        previous = None
+        if self.tag_index is not None:
+            previous = self.items.get_item(key)
+
+        response = self.items.delete_item(key)
+        if previous is not None:
+            self._index_tags(previous, self._tags(previous), set())
+        return response
+
+    def rebuild_tag_index(self):
+        """Write the fan-out rows of every existing item, e.g. after creating the table"""
+        if self.tag_index is None:
+            return 0
+        items = self.items.scan(
+            projection_expression="#id, #owner, #tags",
+            expression_attribute_names={
+                "#id": self.id_attribute,
+                "#owner": self.owner_attribute,
+                "#tags": self.tags_attribute,
+            },
+        )["Items"]
+        rows = []
+        for item in items:
+            if self.owner_attribute in item:
+                rows.extend(self._tag_rows(item, self._tags(item)))
+        return self.tag_index.batch_write(put_items=rows)
+
+    def _tag_rows(self, item, tags):
+        return [
+            {
+                "tag": {"S": tag},
+                "item_id": item[self.id_attribute],
+                "owner_id": item[self.owner_attribute],
+            }
+            for tag in tags
+        ]
+
+    def _index_tags(self, item, previous_tags, tags):
+        self.tag_index.batch_write(
+            put_items=self._tag_rows(item, tags - previous_tags),
+            delete_keys=[
+                {"tag": {"S": tag}, "item_id": item[self.id_attribute]}
+                for tag in previous_tags - tags
+            ],
+        )
+
+
+def create_tagged_item_store(
+    table_name,
+    id_attribute,
+    tags_attribute,
+    owner_index_name=None,
+    tag_table_name=None,
+    owner_attribute="user_id",
+    owner_index_projection="ALL",
+):
+    return TaggedItemStore(
+        table_name,
+        id_attribute,
+        tags_attribute,
+        owner_index_name,
+        tag_table_name,
+        owner_attribute,
+        owner_index_projection,
+    )
+
+
+def create_task_store():
+    return create_tagged_item_store(
+        config.aws_tasks_table_name,
+        "task_id",
+        "task_tags",
+        config.aws_tasks_user_index_name,
+        config.aws_task_tags_table_name,
+        owner_index_projection=config.aws_tasks_user_index_projection,
+    )
+
+
+def create_ticket_store():
+    return create_tagged_item_store(
+        config.aws_tickets_table_name,
+        "ticket_id",
+        "ticket_tags",
+        config.aws_tickets_user_index_name,
+        config.aws_ticket_tags_table_name,
+        owner_index_projection=config.aws_tickets_user_index_projection,
+    )
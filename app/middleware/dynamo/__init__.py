@@ -1,3 +1,19 @@
 from .DynamoMiddleware import DynamoMiddleware, create_dynamo_middleware
+from .DynamoSerializer import DynamoSerializer, dynamo_serializer
+from .TaggedItemStore import (
+    TaggedItemStore,
+    create_tagged_item_store,
+    create_task_store,
+    create_ticket_store,
+)
 
-__all__ = ["DynamoMiddleware", "create_dynamo_middleware"]
+__all__ = [
+    "DynamoMiddleware",
+    "create_dynamo_middleware",
+    "DynamoSerializer",
+    "dynamo_serializer",
+    "TaggedItemStore",
+    "create_tagged_item_store",
+    "create_task_store",
+    "create_ticket_store",
+]
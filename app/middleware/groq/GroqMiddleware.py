@@ -7,6 +7,9 @@ from langchain_core.output_parsers import StrOutputParser
 
 
 class GroqMiddleware:
+    # Returned instead of a response when the API call fails
+    ERROR_RESPONSE = "Error generating insights. Please try again later."
+
     def __init__(self, model, temperature, max_tokens):
         self.model = model
         self.temperature = temperature
@@ -54,4 +57,4 @@ class GroqMiddleware:
             return response
         except Exception as e:
             print(f"Error generating response: {str(e)}")
-            return "Error generating insights. Please try again later."
+            return self.ERROR_RESPONSE
@@ -1,12 +1,15 @@
-import boto3
+import numpy as np
 import pandas as pd
-from io import StringIO
 from datetime import datetime
+from io import StringIO
+
+from utils.func.create_date import create_date_series
+
+from .DatasetStore import dataset_store
 
 
 class DataProcessor:
     def __init__(self, bucket_name, region_name="us-east-1"):
-        self.s3_client = boto3.client("s3", region_name=region_name)
         self.bucket = bucket_name
         self.data_store = {}
         self.file_mapping = {
@@ -16,6 +19,16 @@ class DataProcessor:
             "outbound": "protected/datasets/by_portfolio/platform/outbound/od_master.csv",
         }
 
+        # Columns holding numeric identifiers that are rendered as "S<number>"
+        self.numeric_string_columns = ["client_number", "file_number"]
+        # Datasets whose remaining string columns are normalised to str ("" if missing)
+        self.normalized_string_datasets = ["outbound"]
+        self.date_columns = {
+            "accounts": ["listed_date"],
+            "contacts": ["created_date", "due_date"],
+            "transactions": ["payment_date", "posted_date"],
+        }
+
         self.dtypes = {
             "accounts": {
                 "account_status": str,
@@ -105,210 +118,104 @@ class DataProcessor:
         s3_key = self.file_mapping[short_name]
 
         try:
-            response = self.s3_client.get_object(Bucket=self.bucket, Key=s3_key)
-            csv_content = response["Body"].read().decode("utf-8")
-
-            # Create dtype dictionary - handle all numeric columns as float initially
-            dtype_dict = {}
-            for col, dtype in self.dtypes[short_name].items():
-                if dtype == int or dtype == float:
-                    dtype_dict[col] = (
-                        str  # Change to string to prevent pandas auto-conversion
-                    )
-                elif dtype == str:
-                    dtype_dict[col] = str
-                else:
-                    dtype_dict[col] = object
-
-            print(f"Loading {short_name} with dtypes:", dtype_dict)
-            df = pd.read_csv(StringIO(csv_content), low_memory=False)
-
-            return self._format_dataframe(short_name, df)
+            # Formatted frames are built chunk by chunk as the object streams
+            # in and shared process-wide
+            df = dataset_store.memoize(
+                self.bucket,
+                s3_key,
+                "data_processor_v3",
+                lambda dataframe: self._format_dataframe(short_name, dataframe),
+                persist=True,
+                stream=True,
+                dtype=self._string_dtypes(short_name),
+                finalize=lambda dataframe: self._format_text_columns(
+                    short_name, dataframe
+                ),
+            )
+            if df is None:
+                raise ValueError(f"{s3_key} could not be read from {self.bucket}")
+            return df
         except Exception as e:
             raise Exception(f"Error loading {short_name}: {str(e)}")
 
-    def _format_dataframe(self, short_name, df):
-        if short_name == "accounts":
-            string_columns = ["client_number", "file_number"]
-            float_columns = ["amount_paid", "current_upb", "original_upb_loaded"]
-            int_columns = [
-                "listed_date_day",
-                "listed_date_month",
-                "listed_date_year",
-                "tu_score",
-            ]
-            # Process in order: floats, integers, strings
-            for col in float_columns:
-                df[col] = df[col].apply(self._sanitize_float_numbers)
-            for col in int_columns:
-                df[col] = df[col].apply(self._sanitize_integers)
-            df = self._sanitize_string_columns(df, string_columns)
-            # Create date after sanitizing components
-            df["listed_date"] = pd.to_datetime(
-                {
-                    "year": df["listed_date_year"],
-                    "month": df["listed_date_month"],
-                    "day": df["listed_date_day"],
-                },
-                errors="coerce",
-            )
-
-        elif short_name == "contacts":
-            string_columns = ["client_number", "file_number"]
-            float_columns = ["account_balance", "payment_amount"]
-            int_columns = [
-                "completed",
-                "created_date_day",
-                "created_date_month",
-                "created_date_year",
-                "due_date_day",
-                "due_date_month",
-                "due_date_year",
-            ]
-            # Process in order: floats, integers, strings
-            for col in float_columns:
-                df[col] = df[col].apply(self._sanitize_float_numbers)
-            for col in int_columns:
-                df[col] = df[col].apply(self._sanitize_integers)
-            df = self._sanitize_string_columns(df, string_columns)
-            # Create dates after sanitizing components
-            df["created_date"] = pd.to_datetime(
-                {
-                    "year": df["created_date_year"],
-                    "month": df["created_date_month"],
-                    "day": df["created_date_day"],
-                },
-                errors="coerce",
-            )
-            df["due_date"] = pd.to_datetime(
-                {
-                    "year": df["due_date_year"],
-                    "month": df["due_date_month"],
-                    "day": df["due_date_day"],
-                },
-                errors="coerce",
-            )
-
-        elif short_name == "transactions":
-            string_columns = ["client_number", "file_number"]
-            float_columns = ["contingency_amount", "payment_amount"]
-            int_columns = [
-                "payment_date_day",
-                "payment_date_month",
-                "payment_date_year",
-                "posted_date_day",
-                "posted_date_month",
-                "posted_date_year",
-            ]
-            # Process in order: floats, integers, strings
-            for col in float_columns:
-                df[col] = df[col].apply(self._sanitize_float_numbers)
-            for col in int_columns:
-                df[col] = df[col].apply(self._sanitize_integers)
-            df = self._sanitize_string_columns(df, string_columns)
-            # Create dates after sanitizing components
-            df["payment_date"] = pd.to_datetime(
-                {
-                    "year": df["payment_date_year"],
-                    "month": df["payment_date_month"],
-                    "day": df["payment_date_day"],
-                },
-                errors="coerce",
-            )
-            df["posted_date"] = pd.to_datetime(
-                {
-                    "year": df["posted_date_year"],
-                    "month": df["posted_date_month"],
-                    "day": df["posted_date_day"],
-                },
-                errors="coerce",
-            )
-
-        elif short_name == "outbound":
-            string_columns = [
-                "client_number",
-                "file_number",
-                "broadcast_id",
-                "agent_id",
-                "caller_id",
-                "call_id",
-                "short_code",
-                "call_type",
-                "status",
-                "zip_code",
-                "phone_cell",
-                "phone_home",
-                "phone_work",
-                "phone_other",
-                "tcn_dialed",
-                "interaction",
-                "result",
-            ]
-            float_columns = ["delivery_cost", "balance"]
-            int_columns = [
-                "delivery_length",
-                "score",
-                "call_completed_date_day",
-                "call_completed_date_month",
-                "call_completed_date_year",
-                "call_completed_date_hour",
-                "call_completed_date_minute",
-                "charge_date_month",
-                "charge_date_day",
-                "charge_date_year",
-            ]
-
-            # Process in order: floats, integers, strings
-            for col in float_columns:
-                if col in df.columns:
-                    # Convert NONE to 0 before sanitization
-                    df[col] = df[col].apply(
-                        lambda x: 0 if str(x).strip().upper() == "NONE" else x
-                    )
-                    df[col] = df[col].apply(self._sanitize_float_numbers)
-            for col in int_columns:
-                if col in df.columns:
-                    df[col] = df[col].apply(self._sanitize_integers)
-            df = self._sanitize_string_columns(
-                df, [col for col in string_columns if col in df.columns]
-            )
-
-        return df
-
-    def _safe_date_convert(self, row, date_column_prefix):
-        """Convert separate date columns into a datetime object"""
-        try:
-            year = row.get(f"{date_column_prefix}_date_year", None)
-            month = row.get(f"{date_column_prefix}_date_month", None)
-            day = row.get(f"{date_column_prefix}_date_day", None)
-
-            # Handle NaN, None, and zero values
-            if pd.isna(year) or pd.isna(month) or pd.isna(day):
-                return pd.NaT
-
-            # Convert to integer safely
+    def _text_columns(self, short_name):
+        # Numeric identifiers are rewritten to "S<number>" whatever type they load as
+        return [
+            col
+            for col, dtype in self.dtypes[short_name].items()
+            if dtype == str and col not in self.numeric_string_columns
+        ]
+
+    def _string_dtypes(self, short_name):
+        """Read string columns as raw text; their types are inferred once the chunks are joined"""
+        return {col: str for col in self._text_columns(short_name)}
+
+    def _infer_text_column(self, series):
+        """Give a column read as text the type a whole-file read would have inferred"""
+        if series.dtype != object:
+            return series
+        present = series.dropna()
+        if len(present):
+            first = present.iloc[0]
             try:
-                year = int(float(year))
-                month = int(float(month))
-                day = int(float(day))
-            except:
-                return pd.NaT
+                float(first)
+            except ValueError:
+                if first not in ("True", "False", "TRUE", "FALSE", "true", "false"):
+                    # One value that is not a number or bool keeps the column as text
+                    return series
+
+        # Re-parse the column on its own so numbers come out exactly as the
+        # CSV reader parses them; blank lines are the missing values
+        lines = [
+            "" if pd.isna(value) else '"' + value.replace('"', '""') + '"'
+            for value in series.tolist()
+        ]
+        text = "".join(line + "\n" for line in ["value", *lines])
+        values = pd.read_csv(StringIO(text), skip_blank_lines=False)["value"]
+        values.index = series.index
+        return values
+
+    def _format_text_columns(self, short_name, df):
+        """Restore inferred types of the text columns and normalise them where required"""
+        columns = [col for col in self._text_columns(short_name) if col in df.columns]
+        for col in columns:
+            df[col] = self._infer_text_column(df[col])
+        if short_name in self.normalized_string_datasets:
+            df = self._sanitize_string_columns(df, columns)
+        return df
 
-            # Handle zero dates or invalid dates
-            if year == 0 or month == 0 or day == 0 or month > 12 or day > 31:
-                return pd.NaT
+    def _format_dataframe(self, short_name, df):
+        schema = self.dtypes[short_name]
+        float_columns = [col for col, dtype in schema.items() if dtype == float]
+        int_columns = [col for col, dtype in schema.items() if dtype == int]
+        string_columns = [
+            col
+            for col, dtype in schema.items()
+            if dtype == str and col in self.numeric_string_columns
+        ]
+
+        # Process in order: floats, integers, strings
+        for col in float_columns:
+            if col in df.columns:
+                df[col] = self._sanitize_float_column(df[col])
+        for col in int_columns:
+            if col in df.columns:
+                df[col] = self._sanitize_integer_column(df[col])
+        df = self._sanitize_string_columns(
+            df, [col for col in string_columns if col in df.columns]
+        )
 
-            # Handle 2-digit years
-            if year < 100:
-                year = 2000 + year
+        # Create dates after sanitizing components
+        for date_column in self.date_columns.get(short_name, []):
+            df[date_column] = create_date_series(df, date_column)
 
-            try:
-                return pd.Timestamp(year=year, month=month, day=day)
-            except:
-                return pd.NaT
+        return df
 
-        except Exception as e:
-            return pd.NaT
+    def _safe_date_convert(self, df, date_column_prefix):
+        """Convert separate date columns into a datetime column, reading 2-digit years as 20xx"""
+        return create_date_series(
+            df, f"{date_column_prefix}_date", two_digit_years=True
+        )
 
     def _sanitize_float_numbers(self, amount):
         """Clean and convert float numbers to float with 2 decimal places"""
@@ -359,24 +266,135 @@ class DataProcessor:
         except Exception as e:
             return 0
 
+    def _sanitize_float_column(self, series):
+        """Vectorized equivalent of _sanitize_float_numbers for a whole column"""
+        result = np.zeros(len(series))
+        present = series.notna().to_numpy()
+        fallback = np.zeros(len(series), dtype=bool)
+
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(
+            series
+        ):
+            values = series.to_numpy(dtype=float, na_value=np.nan)
+            if not pd.api.types.is_integer_dtype(series):
+                # str() of very large/small floats uses exponent notation, which
+                # the character filter in _sanitize_float_numbers mangles
+                magnitude = np.abs(values)
+                fallback = present & ~(
+                    np.isfinite(values)
+                    & (magnitude < 1e16)
+                    & ((magnitude >= 1e-4) | (values == 0))
+                )
+            plain = present & ~fallback
+            result[plain] = self._round_values(values[plain])
+        else:
+            text = series.astype(str)
+            # Values that are already plain decimals ("-12.50") need no cleaning
+            clean = present & text.str.fullmatch(
+                r"-?(?:[0-9]+\.?[0-9]*|\.[0-9]+)"
+            ).to_numpy(dtype=bool, na_value=False)
+            result[clean] = self._round_values(
+                text[clean].to_numpy(dtype=object).astype(float)
+            )
+
+            # Non-ASCII input goes through the scalar path to keep str.isdigit semantics
+            dirty = present & ~clean
+            fallback[dirty] = text[dirty].str.contains(r"[^\x00-\x7f]").to_numpy()
+            plain = dirty & ~fallback
+
+            cleaned = text[plain].str.replace(r"[^0-9.\-]", "", regex=True)
+            is_negative = cleaned.str.startswith("-").to_numpy()
+            # Only the integer part and the first fractional part are kept
+            number = cleaned.str.replace("-", "", regex=False).str.extract(
+                r"^([^.]*(?:\.[^.]*)?)", expand=False
+            )
+            # A lone "." fails float() and falls back to an unsigned 0.0
+            unparsable = (number == ".").to_numpy()
+            number = number.mask((number == "") | unparsable, "0")
+            values = number.to_numpy(dtype=object).astype(float)
+            values = np.where(is_negative, -values, values)
+            result[plain] = np.where(unparsable, 0.0, self._round_values(values))
+
+        if fallback.any():
+            result[fallback] = series[fallback].apply(self._sanitize_float_numbers)
+        return pd.Series(result, index=series.index)
+
+    def _round_values(self, values):
+        """Round an array to 2 places with the same results as the builtin round()"""
+        rounded = np.round(values, 2)
+        # np.round scales by 100 first, which can land on the other side of a
+        # .5 tie or lose precision at large magnitudes; use round() there
+        with np.errstate(invalid="ignore"):
+            scaled = values * 100
+            inexact = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+            inexact |= np.abs(values) >= 2**43
+        if inexact.any():
+            rounded[inexact] = [round(value, 2) for value in values[inexact].tolist()]
+        return rounded
+
+    def _sanitize_integer_column(self, series):
+        """Vectorized equivalent of _sanitize_integers for a whole column"""
+        if pd.api.types.is_integer_dtype(series) or pd.api.types.is_bool_dtype(series):
+            return series.astype("int64")
+
+        values = series
+        if not pd.api.types.is_numeric_dtype(series):
+            # Only real numbers convert; strings and other objects become 0
+            is_string = series.str.len().notna()
+            values = pd.to_numeric(series.mask(is_string), errors="coerce")
+
+        values = values.astype(float)
+        if (np.isfinite(values) & (values.abs() >= 2**63)).any():
+            # Python ints beyond int64 cannot be held in an integer column
+            return series.apply(self._sanitize_integers)
+
+        values = np.trunc(values.where(np.isfinite(values)))
+        return values.astype("Int64").fillna(0).astype("int64")
+
+    def _sanitize_numeric_string_column(self, series):
+        """Vectorized equivalent of the S-prefixed client/file number conversion"""
+
+        def to_numeric_string(x):
+            return (
+                f"S{str(int(float(x)))}" if pd.notna(x) and str(x).strip() != "" else ""
+            )
+
+        result = np.full(len(series), "", dtype=object)
+        present = series.notna().to_numpy()
+        values = np.full(len(series), np.nan)
+
+        if pd.api.types.is_numeric_dtype(series):
+            values[present] = series[present].to_numpy(dtype=float)
+            fallback = np.zeros(len(series), dtype=bool)
+        else:
+            text = series.astype(str).str.strip()
+            present &= (text != "").to_numpy()
+            # Plain decimal literals parse exactly like float(); anything else
+            # (underscores, "nan", "inf", junk) takes the scalar path
+            literal = present & text.str.fullmatch(
+                r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?"
+            ).to_numpy(dtype=bool, na_value=False)
+            values[literal] = text[literal].to_numpy(dtype=object).astype(float)
+            fallback = present & ~literal
+
+        convertible = present & ~fallback
+        with np.errstate(invalid="ignore"):
+            fallback |= convertible & ~(np.isfinite(values) & (np.abs(values) < 2**63))
+        convertible &= ~fallback
+
+        numbers = np.trunc(values[convertible]).astype("int64").astype(str)
+        result[convertible] = np.char.add("S", numbers).astype(object)
+        if fallback.any():
+            result[fallback] = series[fallback].apply(to_numeric_string)
+        return pd.Series(result, index=series.index)
+
     def _sanitize_string_columns(self, df, columns):
         """Convert only numeric-intended string columns with 'S' prefix, leave regular strings as is"""
-        numeric_string_columns = [
-            "client_number",
-            "file_number",
-        ]  # Columns that should be treated as numeric strings
-
         for col in columns:
-            if col in numeric_string_columns:
-                df[col] = df[col].apply(
-                    lambda x: (
-                        f"S{str(int(float(x)))}"
-                        if pd.notna(x) and str(x).strip() != ""
-                        else ""
-                    )
-                )
+            if col in self.numeric_string_columns:
+                df[col] = self._sanitize_numeric_string_column(df[col])
             else:
-                df[col] = df[col].apply(lambda x: str(x) if pd.notna(x) else "")
+                df[col] = df[col].astype(str).where(df[col].notna(), "")
         return df
 
     def get_accounts(self, force=False):
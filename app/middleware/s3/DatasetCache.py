@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import shutil
+import uuid
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# Schema metadata key listing object columns whose nulls were NaN rather than None
+NAN_COLUMNS_KEY = b"nan_null_columns"
+
+
+class DatasetCache:
+    """
+    Local columnar copies of S3 datasets.
+
+    Frames are written as uncompressed Feather (Arrow IPC) files and read
+    back memory-mapped, which skips CSV parsing and formatting on a
+    restart. Converting the Arrow table to pandas still copies every
+    column, so each process that loads a frame holds its own copy; the
+    cache saves time, not memory. Files are keyed by the S3 object's
+    version token, so a changed object simply misses the cache; older
+    versions of an object are removed when a new one is saved.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def _digest(value):
+        return hashlib.sha1(value.encode("utf-8")).hexdigest()[:16]
+
+    def _object_dir(self, bucket_name, file_key):
+        return os.path.join(self.cache_dir, self._digest(f"{bucket_name}/{file_key}"))
+
+    def _path(self, bucket_name, file_key, version, name):
+        return os.path.join(
+            self._object_dir(bucket_name, file_key),
+            f"{self._digest(version)}-{name}.feather",
+        )
+
+    def load(self, bucket_name, file_key, version, name="raw"):
+        """Return the cached frame for this object version, or None on a miss"""
+        path = self._path(bucket_name, file_key, version, name)
+        if not os.path.exists(path):
+            return None
+        try:
+            table = feather.read_table(path, memory_map=True)
+            dataframe = table.to_pandas()
+            # Arrow reads every null back as None; restore NaN where it was used
+            metadata = table.schema.metadata or {}
+            for column in json.loads(metadata.get(NAN_COLUMNS_KEY, b"[]")):
+                dataframe[column] = dataframe[column].fillna(np.nan)
+            return dataframe
+        except Exception as e:
+            print(f"Error reading dataset cache {path}: {e}")
+            return None
+
+    def save(self, bucket_name, file_key, version, dataframe, name="raw"):
+        """Persist a frame for this object version, dropping older versions"""
+        object_dir = self._object_dir(bucket_name, file_key)
+        path = self._path(bucket_name, file_key, version, name)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(object_dir, exist_ok=True)
+            nan_columns = [
+                column
+                for column in dataframe.columns
+                if dataframe[column].dtype == object
+                and dataframe[column].isna().any()
+                and not dataframe[column].map(lambda x: x is None).any()
+            ]
+            table = pa.Table.from_pandas(dataframe)
+            table = table.replace_schema_metadata(
+                {
+                    **(table.schema.metadata or {}),
+                    NAN_COLUMNS_KEY: json.dumps(nan_columns).encode("utf-8"),
+                }
+            )
+            feather.write_feather(table, temp_path, compression="uncompressed")
+            os.replace(temp_path, path)
+        except Exception as e:
+            # Frames with mixed-type object columns cannot be stored as Arrow
+            print(f"Error writing dataset cache {path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+
+        current_prefix = f"{self._digest(version)}-"
+        for file_name in os.listdir(object_dir):
+            if not file_name.startswith(current_prefix) and not file_name.endswith(
+                ".tmp"
+            ):
+                os.remove(os.path.join(object_dir, file_name))
+        return True
+
+    def clear(self):
+        """Remove every cached file"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
@@ -0,0 +1,225 @@
+import threading
+import time
+
+import pandas as pd
+
+from config import config
+
+from .DatasetCache import DatasetCache
+from .S3Middleware import S3Middleware
+
+
+class DatasetStore:
+    """
+    Process-wide registry of CSV datasets read from S3.
+
+    Each object is downloaded once and shared between every caller in the
+    process. An object is re-downloaded only when its ETag/LastModified
+    changes, which is checked with a HEAD request at most once every
+    `revalidate_seconds`. With a DatasetCache attached, parsed frames are
+    also kept on local disk so a restart does not re-parse the CSVs.
+    Derived frames can instead be streamed from S3 `chunksize` rows at a
+    time, so the raw frame is never held in full.
+
+    Callers receive shallow copies: adding or replacing columns on the
+    returned frame is local to the caller, the underlying data is shared
+    and must be treated as read-only.
+    """
+
+    def __init__(self, revalidate_seconds=60, cache=None, chunksize=100000):
+        self.revalidate_seconds = revalidate_seconds
+        self.cache = cache
+        self.chunksize = chunksize
+        self.s3_client = None
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _get_s3_client(self):
+        if self.s3_client is None:
+            self.s3_client = S3Middleware()
+        return self.s3_client
+
+    def _get_entry(self, bucket_name, file_key):
+        with self._lock:
+            entry = self._entries.get((bucket_name, file_key))
+            if entry is None:
+                entry = {
+                    "lock": threading.RLock(),
+                    "dataframe": None,
+                    "version": None,
+                    "checked_at": 0.0,
+                    "derived": {},
+                }
+                self._entries[(bucket_name, file_key)] = entry
+            return entry
+
+    @staticmethod
+    def _version(metadata):
+        """Build a version token from S3 object metadata"""
+        if not metadata:
+            return None
+        etag = (metadata.get("ETag") or "").strip('"')
+        last_modified = metadata.get("LastModified")
+        if last_modified is not None:
+            last_modified = last_modified.isoformat()
+        return f"{etag}:{last_modified}"
+
+    @staticmethod
+    def _share(value):
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            return value.copy(deep=False)
+        return value
+
+    def _set_version(self, entry, version):
+        if version != entry["version"]:
+            entry["version"] = version
+            entry["dataframe"] = None
+            entry["derived"] = {}
+
+    def _refresh(self, entry, bucket_name, file_key):
+        """Drop the entry's data if its S3 object has changed"""
+        now = time.monotonic()
+        if (
+            entry["version"] is not None
+            and now - entry["checked_at"] < self.revalidate_seconds
+        ):
+            return
+
+        metadata = self._get_s3_client().head_object(bucket_name, file_key)
+        entry["checked_at"] = now
+        version = self._version(metadata)
+        if version is not None:
+            # If S3 is unreachable keep serving what we have
+            self._set_version(entry, version)
+
+    def _get_raw(self, entry, bucket_name, file_key):
+        """Return the parsed object, from memory, the local cache or S3"""
+        if entry["dataframe"] is not None:
+            return entry["dataframe"]
+
+        dataframe = None
+        if self.cache is not None and entry["version"] is not None:
+            dataframe = self.cache.load(bucket_name, file_key, entry["version"])
+
+        if dataframe is None:
+            dataframe, metadata = self._get_s3_client().read_csv_with_metadata(
+                bucket_name, file_key
+            )
+            if dataframe is None:
+                return None
+            # The object may have changed between the HEAD and the GET
+            self._set_version(entry, self._version(metadata))
+            if self.cache is not None:
+                self.cache.save(bucket_name, file_key, entry["version"], dataframe)
+
+        entry["dataframe"] = dataframe
+        return dataframe
+
+    def get_dataframe(self, bucket_name, file_key):
+        """Return the shared DataFrame for an S3 CSV object, or None if unavailable"""
+        entry = self._get_entry(bucket_name, file_key)
+        with entry["lock"]:
+            self._refresh(entry, bucket_name, file_key)
+            return self._share(self._get_raw(entry, bucket_name, file_key))
+
+    def get_version(self, bucket_name, file_key):
+        """Return the version token of the object, loading it if needed"""
+        entry = self._get_entry(bucket_name, file_key)
+        with entry["lock"]:
+            self._refresh(entry, bucket_name, file_key)
+            if entry["version"] is None:
+                self._get_raw(entry, bucket_name, file_key)
+            return entry["version"]
+
+    def _stream(self, entry, bucket_name, file_key, builder, usecols, dtype, finalize):
+        """Build a frame chunk by chunk straight from the S3 object"""
+        dataframe, metadata = self._get_s3_client().read_csv_with_metadata(
+            bucket_name,
+            file_key,
+            usecols=usecols,
+            dtype=dtype,
+            chunksize=self.chunksize,
+            process_chunk=builder,
+        )
+        if dataframe is None:
+            return None
+        self._set_version(entry, self._version(metadata))
+        return dataframe if finalize is None else finalize(dataframe)
+
+    def memoize(
+        self,
+        bucket_name,
+        file_key,
+        name,
+        builder,
+        persist=False,
+        stream=False,
+        usecols=None,
+        dtype=None,
+        finalize=None,
+    ):
+        """
+        Return `builder(dataframe)` computed once per loaded version of the object.
+
+        Use this for anything derived from a dataset (formatted copies,
+        computed columns, aggregates) so it is shared the same way the
+        raw data is and discarded when the object changes. With `persist`,
+        DataFrame results are also written to the local cache; `name` must
+        then be a string and should change whenever `builder` does.
+
+        With `stream`, the object is read from S3 in chunks and `builder` is
+        applied to each chunk as it arrives, so it must work row by row.
+        Work that needs whole columns goes in `finalize`, which is applied
+        once to the joined frame. `usecols` and `dtype` are passed to the CSV
+        reader and, like `builder` and `finalize`, should be reflected in
+        `name`.
+        """
+        entry = self._get_entry(bucket_name, file_key)
+        with entry["lock"]:
+            self._refresh(entry, bucket_name, file_key)
+            if name in entry["derived"]:
+                return self._share(entry["derived"][name])
+
+            persist = persist and self.cache is not None
+            value = None
+            if persist and entry["version"] is not None:
+                value = self.cache.load(bucket_name, file_key, entry["version"], name)
+
+            if value is None:
+                if stream:
+                    value = self._stream(
+                        entry, bucket_name, file_key, builder, usecols, dtype, finalize
+                    )
+                else:
+                    dataframe = self._get_raw(entry, bucket_name, file_key)
+                    if dataframe is not None:
+                        value = builder(dataframe.copy(deep=False))
+                        if finalize is not None:
+                            value = finalize(value)
+                if value is None:
+                    return None
+                if persist and isinstance(value, pd.DataFrame):
+                    self.cache.save(
+                        bucket_name, file_key, entry["version"], value, name
+                    )
+
+            entry["derived"][name] = value
+            return self._share(value)
+
+    def invalidate(self, bucket_name=None, file_key=None):
+        """Drop cached objects; with no arguments everything is dropped"""
+        with self._lock:
+            keys = [
+                key
+                for key in self._entries
+                if (bucket_name is None or key[0] == bucket_name)
+                and (file_key is None or key[1] == file_key)
+            ]
+            for key in keys:
+                del self._entries[key]
+
+
+dataset_store = DatasetStore(
+    cache=DatasetCache(config.app_dataset_cache_dir),
+    chunksize=config.app_dataset_chunksize,
+)
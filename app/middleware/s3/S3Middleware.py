@@ -1,13 +1,14 @@
-import boto3
 from botocore.exceptions import NoCredentialsError, ClientError
 import pandas as pd
 from io import StringIO
 import base64
 
+from middleware.aws import aws_clients
+
 
 class S3Middleware:
     def __init__(self, company_id=None, user_uuid=None):
-        self.s3_client = boto3.client("s3")
+        self.s3_client = aws_clients.client("s3")
         self.company_id = company_id
         self.user_uuid = user_uuid
 
@@ -121,18 +122,79 @@ class S3Middleware:
             print(f"Error uploading file: {e}")
             return False
 
-    def read_csv_to_dataframe(self, bucket_name, file_key):
+    def head_object(self, bucket_name, file_key):
+        """
+        Get the raw metadata (ETag, LastModified, ContentLength) of an object
+        """
         try:
-            response = self.s3_client.get_object(Bucket=bucket_name, Key=file_key)
+            return self.s3_client.head_object(Bucket=bucket_name, Key=file_key)
+        except ClientError as e:
+            print(f"Error fetching metadata for {file_key}: {e}")
+            return None
 
-            # Read the CSV content into a pandas DataFrame
-            csv_content = response["Body"].read().decode("utf-8")
-            dataframe = pd.read_csv(StringIO(csv_content), low_memory=False)
-            return dataframe
+    def read_csv_to_dataframe(self, bucket_name, file_key, **kwargs):
+        dataframe, _ = self.read_csv_with_metadata(bucket_name, file_key, **kwargs)
+        return dataframe
+
+    def read_csv_with_metadata(
+        self,
+        bucket_name,
+        file_key,
+        usecols=None,
+        dtype=None,
+        chunksize=None,
+        process_chunk=None,
+    ):
+        """
+        Read a CSV object into a DataFrame, returning it with the object's ETag and LastModified
+
+        The response body is parsed as it streams in rather than being
+        buffered whole. With `chunksize`, rows are parsed that many at a time
+        and each chunk is passed through `process_chunk` before the chunks are
+        joined. `usecols` limits the columns read; names missing from the
+        object are ignored.
+        """
+        try:
+            response = self.s3_client.get_object(Bucket=bucket_name, Key=file_key)
+            body = response["Body"]
+
+            if usecols is not None:
+                wanted = set(usecols)
+
+                def usecols(column):
+                    return column in wanted
+
+            try:
+                reader = pd.read_csv(
+                    body,
+                    usecols=usecols,
+                    dtype=dtype,
+                    chunksize=chunksize,
+                    low_memory=False,
+                )
+                if chunksize is None:
+                    dataframe = (
+                        reader if process_chunk is None else process_chunk(reader)
+                    )
+                else:
+                    with reader:
+                        chunks = [
+                            chunk if process_chunk is None else process_chunk(chunk)
+                            for chunk in reader
+                        ]
+                    dataframe = pd.concat(chunks, ignore_index=True)
+            finally:
+                body.close()
+
+            metadata = {
+                "ETag": response.get("ETag"),
+                "LastModified": response.get("LastModified"),
+            }
+            return dataframe, metadata
         except ClientError as e:
             # Logging the error
             print(f"Error reading CSV file: {e}")
-            return None
+            return None, {}
 
     def get_recent_uploads(self, bucket_name, limit=20):
         """
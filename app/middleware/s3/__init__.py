@@ -1,4 +1,13 @@
 from .S3Middleware import S3Middleware, create_s3_middleware
+from .DatasetCache import DatasetCache
+from .DatasetStore import DatasetStore, dataset_store
 from .DataProcessor import DataProcessor
 
-__all__ = ["S3Middleware", "create_s3_middleware", "DataProcessor"]
+__all__ = [
+    "S3Middleware",
+    "create_s3_middleware",
+    "DatasetCache",
+    "DatasetStore",
+    "dataset_store",
+    "DataProcessor",
+]
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import List
 from datetime import datetime
+from middleware.dynamo import dynamo_serializer
 from .CompanyContactModel import CompanyContactModel
 from .RoleModel import RoleModel
 
@@ -22,53 +23,42 @@ class CompanyModel(BaseModel):
     @classmethod
     def from_dynamo_item(cls, item: dict):
         """Convert DynamoDB item to CompanyModel"""
+        company = dynamo_serializer.deserialize_item(item)
         return cls(
-            company_id=item["company_id"]["S"],
-            company_users=[u["S"] for u in item["company_users"]["L"]],
-            company_name=item["company_name"]["S"],
+            company_id=company["company_id"],
+            company_users=company["company_users"],
+            company_name=company["company_name"],
             company_contacts=[
                 CompanyContactModel(
-                    contact_name=contact["M"]["contact_name"]["S"],
-                    contact_role=contact["M"]["contact_role"]["S"],
-                    contact_email=contact["M"]["contact_email"]["S"],
-                    contact_phone=contact["M"]["contact_phone"]["S"],
-                    primary_contact=contact["M"]["primary_contact"]["BOOL"],
+                    contact_name=contact["contact_name"],
+                    contact_role=contact["contact_role"],
+                    contact_email=contact["contact_email"],
+                    contact_phone=contact["contact_phone"],
+                    primary_contact=contact["primary_contact"],
                 )
-                for contact in item["company_contacts"]["L"]
+                for contact in company["company_contacts"]
             ],
             company_roles=[
                 RoleModel(
-                    role_id=role["M"]["role_id"]["S"],
-                    role_name=role["M"]["role_name"]["S"],
-                    role_description=role["M"]["role_description"]["S"],
-                    role_reports_to=[
-                        r["S"] for r in role["M"].get("role_reports_to", {"L": []})["L"]
-                    ],
-                    role_reporting_team=[
-                        r["S"]
-                        for r in role["M"].get("role_reporting_team", {"L": []})["L"]
-                    ],
-                    role_responsibilities=[
-                        r["S"]
-                        for r in role["M"].get("role_responsibilities", {"L": []})["L"]
-                    ],
-                    role_displayed_in_org=role["M"].get(
-                        "role_displayed_in_org", {"BOOL": False}
-                    )["BOOL"],
-                    assigned_to=[
-                        a["S"] for a in role["M"].get("assigned_to", {"L": []})["L"]
-                    ],
-                    created_on=role["M"].get("created_on", {"S": ""})["S"],
-                    created_by=role["M"].get("created_by", {"S": ""})["S"],
-                    updated_on=role["M"].get("updated_on", {"S": ""})["S"],
-                    updated_by=role["M"].get("updated_by", {"S": ""})["S"],
+                    role_id=role["role_id"],
+                    role_name=role["role_name"],
+                    role_description=role["role_description"],
+                    role_reports_to=role.get("role_reports_to", []),
+                    role_reporting_team=role.get("role_reporting_team", []),
+                    role_responsibilities=role.get("role_responsibilities", []),
+                    role_displayed_in_org=role.get("role_displayed_in_org", False),
+                    assigned_to=role.get("assigned_to", []),
+                    created_on=role.get("created_on", ""),
+                    created_by=role.get("created_by", ""),
+                    updated_on=role.get("updated_on", ""),
+                    updated_by=role.get("updated_by", ""),
                 )
-                for role in item["company_roles"]["L"]
+                for role in company["company_roles"]
             ],
-            created_on=item.get("created_on", {"S": ""})["S"],
-            created_by=item.get("created_by", {"S": ""})["S"],
-            updated_on=item.get("updated_on", {"S": ""})["S"],
-            updated_by=item.get("updated_by", {"S": ""})["S"],
+            created_on=company.get("created_on", ""),
+            created_by=company.get("created_by", ""),
+            updated_on=company.get("updated_on", ""),
+            updated_by=company.get("updated_by", ""),
         )
 
     def to_dynamo_item(self) -> dict:
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import List
 from datetime import datetime
+from middleware.dynamo import dynamo_serializer
 
 
 class RoleModel(BaseModel):
@@ -27,20 +28,7 @@ class RoleModel(BaseModel):
     @classmethod
     def from_dynamo_item(cls, item: dict):
         """Convert DynamoDB item to RoleModel"""
-        return cls(
-            role_id=item["role_id"]["S"],
-            role_name=item["role_name"]["S"],
-            role_description=item["role_description"]["S"],
-            role_reports_to=[r["S"] for r in item["role_reports_to"]["L"]],
-            role_reporting_team=[r["S"] for r in item["role_reporting_team"]["L"]],
-            role_responsibilities=[r["S"] for r in item["role_responsibilities"]["L"]],
-            role_displayed_in_org=item["role_displayed_in_org"]["BOOL"],
-            assigned_to=[a["S"] for a in item["assigned_to"]["L"]],
-            created_on=item["created_on"]["S"],
-            created_by=item["created_by"]["S"],
-            updated_on=item["updated_on"]["S"],
-            updated_by=item["updated_by"]["S"],
-        )
+        return cls(**dynamo_serializer.deserialize_item(item))
 
     def to_dynamo_item(self) -> dict:
         """Convert RoleModel to DynamoDB item format"""
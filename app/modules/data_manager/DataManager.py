@@ -1,11 +1,9 @@
+import hashlib
 import pandas as pd
-from io import StringIO
-from botocore.exceptions import ClientError
-from datetime import datetime
 from decimal import Decimal
 
 from config import config
-from middleware.s3 import S3Middleware
+from middleware.s3 import S3Middleware, dataset_store
 
 
 class DataManager:
@@ -22,18 +20,19 @@ class DataManager:
         self.state = {}
         self.required_keys = []
 
-    def _read_csv(self, bucket_name, file_key):
-        try:
-            response = self.s3_client.get_object(Bucket=bucket_name, Key=file_key)
-
-            # Read the CSV content into a pandas DataFrame
-            csv_content = response["Body"].read().decode("utf-8")
-            dataframe = pd.read_csv(StringIO(csv_content))
-            return dataframe
-        except ClientError as e:
-            # Logging the error
-            print(f"Error reading CSV file: {e}")
-            return None
+    def _read_csv(self, bucket_name, file_key, usecols=None):
+        # Master datasets are loaded once per process and shared read-only
+        if usecols is None:
+            return dataset_store.get_dataframe(bucket_name, file_key)
+        # A column subset is streamed on its own so the full frame is never built
+        return dataset_store.memoize(
+            bucket_name,
+            file_key,
+            "columns:" + ",".join(sorted(usecols)),
+            lambda dataframe: dataframe,
+            stream=True,
+            usecols=usecols,
+        )
 
     def _load_or_calculate_data(self, force_refresh=False):
         try:
@@ -56,7 +55,7 @@ class DataManager:
     def _save_cached_data(self, data):
         """Save calculated data to S3"""
         try:
-            df = pd.DataFrame([data])
+            df = pd.DataFrame([{**data, "cache_key": self._source_key()}])
             directory_path = "protected/datasets/by_portfolio/platform"
             file_name = "preprocessed_key_values.csv"
 
@@ -85,12 +84,24 @@ class DataManager:
             print(f"Error loading cached data: {str(e)}")
             return None
 
+    def _source_key(self):
+        """Hash of the versions of the master datasets the cache is built from"""
+        parts = []
+        for dataset, file_key in sorted(self.file_map.items()):
+            if dataset == "preprocess":
+                continue
+            version = dataset_store.get_version(self.s3_bucket, file_key)
+            if version is None:
+                return None
+            parts.append(f"{dataset}={version}")
+        return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
     def _validate_cache(self, df):
-        if df.empty:
+        if df.empty or "cache_key" not in df.columns:
             return False
-        today = datetime.now().strftime("%Y-%m-%d")
         has_required_keys = all(key in df.columns for key in self.required_keys)
-        is_current = df["last_modified"].iloc[0] == today
+        source_key = self._source_key()
+        is_current = source_key is not None and df["cache_key"].iloc[0] == source_key
         return has_required_keys and is_current
 
     def _process_value(self, type, value):
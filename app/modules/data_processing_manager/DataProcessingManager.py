@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-from middleware.s3 import create_s3_middleware
+from middleware.s3 import create_s3_middleware, dataset_store
 
 
 class DataProcessingManager:
@@ -74,9 +74,7 @@ class DataProcessingManager:
     def _get_dataframe(self, file_key):
         """Retrieve a DataFrame from the store or load it from S3"""
         if file_key not in self.data_store:
-            data = self.s3.read_csv_to_dataframe(
-                bucket_name=self.s3_bucket, file_key=file_key
-            )
+            data = dataset_store.get_dataframe(self.s3_bucket, file_key)
 
             self.data_store[file_key] = data
 
@@ -1,3 +1,5 @@
+from types import MappingProxyType
+
 from modules import ListManager
 
 
@@ -119,3 +121,47 @@ class PermissionManager:
             )
 
         return cls.get_all_permissions()
+
+    @classmethod
+    def build_role_permission_sets(cls):
+        """
+        Build the frozen role -> permission set lookup from ROLE_PERMISSIONS.
+
+        Returns:
+            MappingProxyType: Read-only dict of role name to a frozenset of
+                              uncleaned permission strings.
+        """
+        role_permission_sets = {}
+        for role_data in cls.ROLE_PERMISSIONS:
+            role = role_data["role"]
+            if role not in role_permission_sets:
+                role_permission_sets[role] = frozenset(
+                    cls.get_permissions(role=role, cleaned_list=False)
+                )
+        return MappingProxyType(role_permission_sets)
+
+    @classmethod
+    def has_any(cls, groups, permissions):
+        """
+        Check if any of a user's groups grants any of the permissions.
+
+        Args:
+            groups (list): The user's Cognito groups, role groups start with '_role_'.
+            permissions (str or list): A single permission or a list of permissions.
+
+        Returns:
+            bool: True if a role group grants one of the permissions or one of
+                  the permissions is itself a group, False otherwise.
+        """
+        if isinstance(permissions, str):
+            permissions = (permissions,)
+        for group in groups:
+            if group.startswith("_role_"):
+                granted = cls.ROLE_PERMISSION_SETS.get(group)
+                if granted and not granted.isdisjoint(permissions):
+                    return True
+        return any(permission in groups for permission in permissions)
+
+
+# Built once at import, roles are read from the list table when the module loads
+PermissionManager.ROLE_PERMISSION_SETS = PermissionManager.build_role_permission_sets()
@@ -8,9 +8,9 @@ class UnauthorizedPage:
         self.cognito_adapter = CognitoMiddleware()
         self.theme_manager = ThemeManager()
 
-    def signout(self):
+    async def signout(self):
         """Handle signout action"""
-        self.cognito_adapter.signout()
+        await self.cognito_adapter.signout_async()
 
     def render_unauthorized_page(self):
         with ui.column().classes("flex justify-center items-center h-screen w-full"):
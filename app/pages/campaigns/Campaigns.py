@@ -1,4 +1,5 @@
 from nicegui import ui
+from middleware.aio import io_bound
 from core import StandardPage
 from .components import *
 
@@ -30,6 +31,7 @@ class CampaignsPage(StandardPage):
                 self.navbar.render()
 
 
-def campaigns_page(session_manager):
-    page = CampaignsPage(session_manager)
+async def campaigns_page(session_manager):
+    # Page data is loaded on a worker thread, only rendering runs on the event loop
+    page = await io_bound(CampaignsPage, session_manager)
     page.render()
@@ -1,4 +1,5 @@
 from nicegui import ui
+from middleware.aio import io_bound
 from modules import DataProcessingManager
 from core import StandardPage
 
@@ -44,6 +45,7 @@ class DashboardPage(StandardPage):
                     self.tasks_component.render()
 
 
-def dashboard_page(session_manager):
-    page = DashboardPage(session_manager)
+async def dashboard_page(session_manager):
+    # Page data is loaded on a worker thread, only rendering runs on the event loop
+    page = await io_bound(DashboardPage, session_manager)
     page.render()
@@ -1,7 +1,17 @@
-from nicegui import ui
+import asyncio
+from nicegui import background_tasks, run, ui
+from config import config
+from middleware.aio import cpu_bound, io_bound
 from modules import StyleManager, ThemeManager
 from components.widgets import *
 
+# Widgets shown on each tab, built the first time the tab is opened
+VIEW_WIDGETS = {
+    "strategy": ["transaction_analysis", "collection_effectiveness"],
+    "performance": ["call_analysis", "placement_metrics", "client_metrics"],
+    "insights": ["collection_insights"],
+}
+
 
 class ActivitiesComponent:
     def __init__(self):
@@ -9,9 +19,12 @@ class ActivitiesComponent:
         self.style_manager = StyleManager()
         self.force_refresh = False
         self.active_view = "strategy"
+        self.requested_view = self.active_view
+        self.switching = False  # A switch_view call is building widgets
         self.widgets = {}  # Store widget instances
+        self.pending_widgets = set()  # Widgets whose metrics are being computed
         self._config()
-        self._init_widgets()
+        self._init_widgets(self.active_view)
 
     def _config(self):
 
@@ -41,33 +54,84 @@ class ActivitiesComponent:
             }
         )
 
-    def _init_widgets(self):
-        # Initialize all widgets
-        self.widgets["collection_insights"] = create_collection_insights_widget(
-            force_refresh=self.force_refresh
-        )
-        self.widgets["collection_effectiveness"] = (
-            create_collection_effectiveness_widget(force_refresh=self.force_refresh)
-        )
-        self.widgets["client_metrics"] = create_client_metrics_widget(
-            force_refresh=self.force_refresh
-        )
-        self.widgets["placement_metrics"] = create_placement_metrics_widget(
-            force_refresh=self.force_refresh
-        )
-        self.widgets["call_analysis"] = create_call_analysis_widget(
-            force_refresh=self.force_refresh
-        )
-        self.widgets["transaction_analysis"] = create_transaction_analysis_widget(
-            force_refresh=self.force_refresh
-        )
+    def _init_widgets(self, view):
+        """Build the view's widgets that do not exist yet, return the stale ones"""
+        names = [name for name in VIEW_WIDGETS[view] if name not in self.widgets]
+        if not names:
+            return []
+        # One read of the company's metric cache, stale widgets are computed
+        # in worker processes once they are on the page
+        stale = []
+        with prefetch_metric_cache("ALL"):
+            for name in names:
+                widget = WIDGET_FACTORIES[name](
+                    force_refresh=self.force_refresh, defer_calculation=True
+                )
+                self.widgets[name] = widget
+                if widget.needs_calculation():
+                    stale.append(name)
+                else:
+                    widget.load_render_data()
+        self.pending_widgets.update(stale)
+        return stale
+
+    async def _compute_pending_widgets(self, names):
+        """Compute stale widgets concurrently, filling each in as it finishes"""
+
+        async def compute(name):
+            widget = self.widgets[name]
+            try:
+                metrics = await cpu_bound(
+                    compute_widget_metrics,
+                    name,
+                    self.force_refresh,
+                    timeout=config.app_widget_compute_timeout,
+                )
+                widget.receive_metrics(metrics)
+                await io_bound(widget.load_render_data)
+            except Exception as e:
+                print(f"Error computing {name} in a worker process: {e!r}")
+                try:
+                    await run.io_bound(widget._calculate_metrics)
+                except Exception as e:
+                    print(f"Error computing {name}: {str(e)}")
+            finally:
+                # Never leave the widget behind a spinner
+                self.pending_widgets.discard(name)
+                self.render_activity_feed.refresh()
+
+        await asyncio.gather(*(compute(name) for name in names))
+
+    def _render_widget(self, name):
+        if name not in self.pending_widgets:
+            self.widgets[name].render()
+            return
+        with ui.card().classes("w-full p-6 items-center"):
+            ui.spinner(size="lg")
+            ui.label("Calculating metrics...").classes("text-gray-500")
 
     def refresh_activities(self):
         self.force_refresh = True
         # Refresh the UI component
         self.render_activity_feed.refresh()
 
-    def switch_view(self, view):
+    async def switch_view(self, view):
+        self.requested_view = view
+        if self.switching:
+            # The switch in progress moves on to the latest requested view
+            return
+        self.switching = True
+        try:
+            while True:
+                view = self.requested_view
+                stale = await io_bound(self._init_widgets, view)
+                if stale:
+                    background_tasks.create(self._compute_pending_widgets(stale))
+                if self.requested_view == view:
+                    break
+        finally:
+            self.switching = False
+        # Switch only once the widgets exist, the feed may refresh during the await
         self.active_view = view
         self.render_action_bar.refresh()
         self.render_activity_feed.refresh()
@@ -102,23 +166,23 @@ class ActivitiesComponent:
                 with ui.element("div").classes("strategy-container").style(
                     "width: 100%"
                 ):
-                    self.widgets["transaction_analysis"].render()
-                    self.widgets["collection_effectiveness"].render()
+                    self._render_widget("transaction_analysis")
+                    self._render_widget("collection_effectiveness")
 
             elif self.active_view == "performance":
                 with ui.element("div").classes("performance-container").style(
                     "width: 100%"
                 ):
 
-                    self.widgets["call_analysis"].render()
-                    self.widgets["placement_metrics"].render()
-                    self.widgets["client_metrics"].render()
+                    self._render_widget("call_analysis")
+                    self._render_widget("placement_metrics")
+                    self._render_widget("client_metrics")
 
             elif self.active_view == "insights":
                 with ui.element("div").classes("insights-container").style(
                     "width: 100%"
                 ):
-                    self.widgets["collection_insights"].render()
+                    self._render_widget("collection_insights")
 
     def render(self):
         with ui.column().style(
@@ -133,3 +197,7 @@ class ActivitiesComponent:
             ):
                 with ui.scroll_area().style("width:100%;height:100%;"):
                     self.render_activity_feed()
+        if self.pending_widgets:
+            background_tasks.create(
+                self._compute_pending_widgets(list(self.pending_widgets))
+            )
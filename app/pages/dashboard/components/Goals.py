@@ -1,7 +1,7 @@
 from nicegui import ui
 from modules import StyleManager, TokenManager, TokenType
 from middleware.cognito import CognitoMiddleware
-from middleware.dynamo import DynamoMiddleware
+from middleware.dynamo import DynamoMiddleware, dynamo_serializer
 from datetime import datetime
 from config import config
 
@@ -10,15 +10,6 @@ def truncate_text(text: str, max_length: int = 50) -> str:
     return text[:max_length] + "..." if len(text) > max_length else text
 
 
-def dynamo_to_json(item):
-    result = {}
-    for key, value in item.items():
-        # Extract the actual value from the DynamoDB format
-        for val_type, val in value.items():
-            result[key] = val
-    return result
-
-
 def format_date(date_str: str) -> str:
     try:
         if not date_str or date_str == "0-0-0":
@@ -113,7 +104,7 @@ class GoalsComponent:
 
     def render(self):
         goals = self.user_goals
-        formatted_goals = [dynamo_to_json(goal["M"]) for goal in goals]
+        formatted_goals = [dynamo_serializer.deserialize(goal) for goal in goals]
         active_goals = []
         completed_goals = []
 
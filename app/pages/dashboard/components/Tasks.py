@@ -2,7 +2,7 @@ from nicegui import ui
 from modules import TokenManager, TokenType
 from icecream import ic
 from middleware.cognito import CognitoMiddleware
-from middleware.dynamo import DynamoMiddleware
+from middleware.dynamo import DynamoMiddleware, create_task_store
 from modules import StyleManager
 from models import TaskModel
 from datetime import datetime
@@ -17,9 +17,12 @@ class TasksComponent:
         self.session_manager = session_manager
         self.cognito_middleware = CognitoMiddleware()
         self.dynamo_middleware = DynamoMiddleware(config.aws_tasks_table_name)
+        self.task_store = create_task_store()
         self.attributes = self._load_user_data()
         self.style_manager = StyleManager()
         self._component_config()
+        # Read here so the first render's scan runs off the event loop
+        self.preloaded_tasks = self._preload_tasks()
 
     def _component_config(self):
         self.style_manager.set_styles(
@@ -80,42 +83,14 @@ class TasksComponent:
 
     def _get_tasks(self):
         user_id = self.cognito_middleware.get_user_id()
+        return self.task_store.get_for_user(user_id)["Items"]
 
-        # Get user's own tasks
-        own_tasks_expression = {":uid": {"S": user_id}}
-        own_tasks_response = self.dynamo_middleware.scan(
-            filter_expression="user_id = :uid",
-            expression_attribute_values=own_tasks_expression,
-        )
-
-        # Get tasks where user is tagged
-        tagged_tasks_expression = {":uid": {"S": user_id}}
-        tagged_tasks_response = self.dynamo_middleware.scan(
-            filter_expression="contains(task_tags, :uid)",
-            expression_attribute_values=tagged_tasks_expression,
-        )
-
-        # Combine and deduplicate tasks
-        all_tasks = []
-        seen_task_ids = set()
-
-        # Add own tasks
-        if "Items" in own_tasks_response:
-            for task in own_tasks_response["Items"]:
-                task_id = task["task_id"]["S"]
-                if task_id not in seen_task_ids:
-                    all_tasks.append(task)
-                    seen_task_ids.add(task_id)
-
-        # Add tagged tasks
-        if "Items" in tagged_tasks_response:
-            for task in tagged_tasks_response["Items"]:
-                task_id = task["task_id"]["S"]
-                if task_id not in seen_task_ids:
-                    all_tasks.append(task)
-                    seen_task_ids.add(task_id)
-
-        return all_tasks
+    def _preload_tasks(self):
+        try:
+            return self._get_tasks()
+        except Exception as e:
+            print(f"Error loading tasks: {str(e)}")
+            return None
 
     @ui.refreshable
     def render_tasks_list(self, tasks_data, is_today=True):
@@ -136,7 +111,10 @@ class TasksComponent:
 
     def render(self):
         try:
-            tasks = self._get_tasks()
+            tasks = self.preloaded_tasks
+            self.preloaded_tasks = None
+            if tasks is None:
+                tasks = self._get_tasks()
             formatted_tasks = [dynamo_to_json(task) for task in tasks]
             today = datetime.now().date()
 
@@ -431,7 +409,7 @@ class TasksComponent:
                 "task_tags": {"L": [{"S": str(user_id)} for user_id in assigned_users]},
             }
 
-            self.dynamo_middleware.put_item(item)
+            self.task_store.put_item(item)
             dialog.close()
             ui.notify("Task added successfully", type="positive")
             # Get updated tasks and refresh the view
@@ -1,7 +1,7 @@
 from nicegui import ui
 from modules import StyleManager
 from models import TicketModel
-from middleware.dynamo import DynamoMiddleware
+from middleware.dynamo import DynamoMiddleware, create_ticket_store
 from middleware.cognito import CognitoMiddleware
 import uuid
 from config import config
@@ -36,9 +36,12 @@ class TicketsComponent:
         self.style_manager = StyleManager()
         self.cognito_middleware = CognitoMiddleware()
         self.dynamo_middleware = DynamoMiddleware(config.aws_tickets_table_name)
+        self.ticket_store = create_ticket_store()
         self.new_ticket_input = NewTicketInput()
         self.dialog = None
         self._config()
+        # Read here so the first render's scan runs off the event loop
+        self.preloaded_tickets = self._preload_tickets()
 
     def _config(self):
         self.style_manager.set_styles(
@@ -156,7 +159,7 @@ class TicketsComponent:
                 },
             }
 
-            self.dynamo_middleware.put_item(item)
+            self.ticket_store.put_item(item)
             dialog.close()
             ui.notify("Ticket added successfully", type="positive")
             self.render_tickets_list.refresh()
@@ -242,45 +245,16 @@ class TicketsComponent:
 
     def _get_tickets(self):
         user_id = self.cognito_middleware.get_user_id()
+        return self.ticket_store.get_for_user(
+            user_id, where={"ticket_status": {"S": "pending"}}
+        )["Items"]
 
-        # Get user's own tickets
-        own_tickets_expression = {":uid": {"S": user_id}, ":status": {"S": "pending"}}
-        own_tickets_response = self.dynamo_middleware.scan(
-            filter_expression="user_id = :uid AND ticket_status = :status",
-            expression_attribute_values=own_tickets_expression,
-        )
-
-        # Get tickets where user is tagged
-        tagged_tickets_expression = {
-            ":uid": {"S": user_id},
-            ":status": {"S": "pending"},
-        }
-        tagged_tickets_response = self.dynamo_middleware.scan(
-            filter_expression="contains(ticket_tags, :uid) AND ticket_status = :status",
-            expression_attribute_values=tagged_tickets_expression,
-        )
-
-        # Combine and deduplicate tickets
-        all_tickets = []
-        seen_ticket_ids = set()
-
-        # Add own tickets
-        if "Items" in own_tickets_response:
-            for ticket in own_tickets_response["Items"]:
-                ticket_id = ticket["ticket_id"]["S"]
-                if ticket_id not in seen_ticket_ids:
-                    all_tickets.append(ticket)
-                    seen_ticket_ids.add(ticket_id)
-
-        # Add tagged tickets
-        if "Items" in tagged_tickets_response:
-            for ticket in tagged_tickets_response["Items"]:
-                ticket_id = ticket["ticket_id"]["S"]
-                if ticket_id not in seen_ticket_ids:
-                    all_tickets.append(ticket)
-                    seen_ticket_ids.add(ticket_id)
-
-        return all_tickets
+    def _preload_tickets(self):
+        try:
+            return self._get_tickets()
+        except Exception as e:
+            print(f"Error loading tickets: {str(e)}")
+            return None
 
     def parse_date(self, date_str):
         try:
@@ -404,7 +378,10 @@ class TicketsComponent:
     @ui.refreshable
     def render_tickets_list(self):
         try:
-            tickets = self._get_tickets()
+            tickets = self.preloaded_tickets
+            self.preloaded_tickets = None
+            if tickets is None:
+                tickets = self._get_tickets()
             formatted_tickets = [dynamo_to_json(ticket) for ticket in tickets]
 
             # Sort tickets by due date
@@ -1,4 +1,5 @@
 from nicegui import ui
+from middleware.aio import io_bound
 from core import StandardPage
 from .components import *
 
@@ -19,6 +20,10 @@ class GoalsPage(StandardPage):
         self.state = {
             "selected_goal": None,
         }
+        # Built here so the first render's user lookup runs off the event loop
+        self.goal_table = GoalTableComponent(
+            self.session_manager, self.state, self.on_click_select_goal
+        )
 
     def on_click_select_goal(self, goal):
         self.state["selected_goal"] = goal
@@ -38,9 +43,10 @@ class GoalsPage(StandardPage):
 
     @ui.refreshable
     def _render_goal_table(self):
-        goal_table_component = GoalTableComponent(
+        goal_table_component = self.goal_table or GoalTableComponent(
             self.session_manager, self.state, self.on_click_select_goal
         )
+        self.goal_table = None
         goal_table_component.render()
 
     def page_content(self):
@@ -55,6 +61,7 @@ class GoalsPage(StandardPage):
                 self._render_goal_sidebar()
 
 
-def goals_page(session_manager):
-    page = GoalsPage(session_manager)
+async def goals_page(session_manager):
+    # Page data is loaded on a worker thread, only rendering runs on the event loop
+    page = await io_bound(GoalsPage, session_manager)
     page.render()
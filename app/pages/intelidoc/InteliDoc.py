@@ -1,4 +1,5 @@
 from nicegui import ui
+from middleware.aio import io_bound
 from core import StandardPage
 
 import base64
@@ -340,7 +341,8 @@ class ChatViewer:
         if self.shared_state.in_debtor_folder:
             self.shared_state.load_file_preview(file_path)
 
-    def load_files(self):
+    def list_files(self):
+        """Read the items under the current path, without touching the UI"""
         self.items = []
         response = self.s3.list_objects(self.bucket, self.current_path)
 
@@ -364,6 +366,8 @@ class ChatViewer:
                     metadata = self.s3.get_file_metadata(self.bucket, file_path)
                     self.items.append((name, False, metadata, file_path))
 
+    def load_files(self):
+        self.list_files()
         self.update_file_list()
 
     def handle_click(self, item):
@@ -439,7 +443,7 @@ class ChatViewer:
                     self.file_list = (
                         ui.list().props("bordered separator").classes("w-full")
                     )
-                    ui.timer(0.1, lambda: self.load_files(), once=True)
+                    self.update_file_list()
 
     def download_file(self, file_path):
         """Download the file using a presigned URL"""
@@ -453,6 +457,7 @@ class BucketDetails:
     def __init__(self, s3, bucket):
         self.s3 = s3
         self.bucket = bucket
+        self.recent_uploads = self.s3.get_recent_uploads(self.bucket)
 
     def render(self):
         with ui.scroll_area().classes("w-full h-full"):
@@ -461,7 +466,7 @@ class BucketDetails:
                     "text-bold text-lg"
                 )
                 ui.separator()
-                recent_uploads = self.s3.get_recent_uploads(self.bucket)
+                recent_uploads = self.recent_uploads
                 print(f"Recent uploads found: {len(recent_uploads)}")
                 if not recent_uploads:
                     ui.label("No recent uploads found").classes("text-gray-500 p-4")
@@ -935,6 +940,7 @@ class InteliDocPage(StandardPage):
     def _on_page_load(self):
         self.doc_viewer = DocViewer(self.dynamo_middleware, self.shared_state)
         self.chat_viewer = ChatViewer(self.shared_state)
+        self.chat_viewer.list_files()
 
     def page_content(self):
         with ui.grid(columns=5).classes("w-full h-[89vh] gap-0"):
@@ -947,6 +953,7 @@ class InteliDocPage(StandardPage):
                 self.doc_viewer.render()
 
 
-def intelidoc_page(session_manager):
-    page = InteliDocPage(session_manager)
+async def intelidoc_page(session_manager):
+    # Page data is loaded on a worker thread, only rendering runs on the event loop
+    page = await io_bound(InteliDocPage, session_manager)
     page.render()
@@ -10,7 +10,7 @@ from chromadb import HttpClient
 from config import config
 import nomic
 import logging.handlers
-import boto3
+from middleware.aws import aws_clients
 from langchain_core.messages import HumanMessage, BaseMessage
 from langgraph.graph import Graph, StateGraph
 from langchain_ollama import ChatOllama, OllamaEmbeddings
@@ -95,8 +95,8 @@ class RagAgent:
         # Initialize thread pool with limited workers
         self.thread_pool = ThreadPoolExecutor(max_workers=2)
 
-        # Create S3 client with config
-        self.s3 = boto3.client("s3")
+        # Shared S3 client
+        self.s3 = aws_clients.client("s3")
 
         # Initialize language models and embeddings
         self.setup_language_models()
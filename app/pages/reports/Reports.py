@@ -1,4 +1,5 @@
 from nicegui import ui
+from middleware.aio import io_bound
 from core import StandardPage
 
 
@@ -20,6 +21,7 @@ class ReportsPage(StandardPage):
         pass
 
 
-def reports_page(session_manager):
-    page = ReportsPage(session_manager)
+async def reports_page(session_manager):
+    # Page data is loaded on a worker thread, only rendering runs on the event loop
+    page = await io_bound(ReportsPage, session_manager)
     page.render()
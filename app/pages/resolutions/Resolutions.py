@@ -1,4 +1,5 @@
 from nicegui import ui
+from middleware.aio import io_bound
 from core import StandardPage
 from .components import *
 
@@ -30,6 +31,7 @@ class ResolutionsPage(StandardPage):
                 self.navbar.render()
 
 
-def resolutions_page(session_manager):
-    page = ResolutionsPage(session_manager)
+async def resolutions_page(session_manager):
+    # Page data is loaded on a worker thread, only rendering runs on the event loop
+    page = await io_bound(ResolutionsPage, session_manager)
     page.render()
@@ -1,4 +1,5 @@
 from nicegui import ui
+from middleware.aio import io_bound
 from core import StandardPage
 from .components import *
 
@@ -49,6 +50,7 @@ class SettingsPage(StandardPage):
                 self._render_component()
 
 
-def settings_page(session_manager):
-    page = SettingsPage(session_manager)
+async def settings_page(session_manager):
+    # Page data is loaded on a worker thread, only rendering runs on the event loop
+    page = await io_bound(SettingsPage, session_manager)
     page.render()
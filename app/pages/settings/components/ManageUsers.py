@@ -48,14 +48,32 @@ class ManageUsersComponent:
             for user in cognito_users
         ]
 
-        # Get DynamoDB profiles for all users
-        for user in company_users:
-            try:
-                key = {
+        # Get DynamoDB profiles for all users in a few batch requests
+        user_records = None
+        try:
+            keys = [
+                {
                     "user_id": {"S": user.user_id},
                     "company_id": {"S": self.company_id},
                 }
-                user_record = self.users_dynamo_middleware.get_item(key)
+                for user in company_users
+            ]
+            user_records = {
+                record["user_id"]["S"]: record
+                for record in self.users_dynamo_middleware.batch_get(keys)
+            }
+        except Exception as e:
+            print(f"Error getting profiles for company {self.company_id}: {str(e)}")
+
+        new_profile_items = []
+        new_profiles = []
+        for user in company_users:
+            if user_records is None:
+                # Without the existing records, missing profiles cannot be told apart
+                user.profile = None
+                continue
+            try:
+                user_record = user_records.get(user.user_id)
 
                 if user_record:
                     # Convert DynamoDB record to UserProfileModel and attach to user object
@@ -108,14 +126,26 @@ class ManageUsersComponent:
                         "goals": {"L": []},
                     }
 
-                    self.users_dynamo_middleware.put_item(profile_item)
-                    user.profile = new_profile
+                    new_profile_items.append(profile_item)
+                    new_profiles.append((user, new_profile))
 
             except Exception as e:
                 print(
                     f"Error getting/creating profile for user {user.user_id}: {str(e)}"
                 )
                 user.profile = None
+
+        if new_profile_items:
+            try:
+                self.users_dynamo_middleware.batch_write(put_items=new_profile_items)
+            except Exception as e:
+                print(
+                    f"Error creating profiles for company {self.company_id}: {str(e)}"
+                )
+                new_profiles = [(user, None) for user, _ in new_profiles]
+            # New profiles are only attached once they are stored
+            for user, new_profile in new_profiles:
+                user.profile = new_profile
         self.company_users = company_users
 
     def get_user_profile(self):
@@ -1,13 +1,13 @@
 from nicegui import ui
+from middleware.aio import io_bound
 from core import StandardPage
 from .components import *
 from components import ActionBar
 from .components.ListView import ListViewComponent
 from .components.NewTaskForm import NewTaskFormComponent
 from .components.KanbanView import KanbanViewComponent
-from middleware.dynamo import DynamoMiddleware
+from middleware.dynamo import create_task_store
 from middleware.cognito import CognitoMiddleware
-from config import config
 
 
 class TasksPage(StandardPage):
@@ -23,7 +23,7 @@ class TasksPage(StandardPage):
                 "nav_position": "top",
             },
         )
-        self.dynamo_middleware = DynamoMiddleware(config.aws_tasks_table_name)
+        self.task_store = create_task_store()
         self.cognito_middleware = CognitoMiddleware()
         self.state = {
             "active_view": "list",
@@ -34,42 +34,7 @@ class TasksPage(StandardPage):
 
     def _get_tasks(self):
         user_id = self.cognito_middleware.get_user_id()
-
-        # Get user's own tasks
-        own_tasks_expression = {":uid": {"S": user_id}}
-        own_tasks_response = self.dynamo_middleware.scan(
-            filter_expression="user_id = :uid",
-            expression_attribute_values=own_tasks_expression,
-        )
-
-        # Get tasks where user is tagged
-        tagged_tasks_expression = {":uid": {"S": user_id}}
-        tagged_tasks_response = self.dynamo_middleware.scan(
-            filter_expression="contains(task_tags, :uid)",
-            expression_attribute_values=tagged_tasks_expression,
-        )
-
-        # Combine and deduplicate tasks
-        all_tasks = []
-        seen_task_ids = set()
-
-        # Add own tasks
-        if "Items" in own_tasks_response:
-            for task in own_tasks_response["Items"]:
-                task_id = task["task_id"]["S"]
-                if task_id not in seen_task_ids:
-                    all_tasks.append(task)
-                    seen_task_ids.add(task_id)
-
-        # Add tagged tasks
-        if "Items" in tagged_tasks_response:
-            for task in tagged_tasks_response["Items"]:
-                task_id = task["task_id"]["S"]
-                if task_id not in seen_task_ids:
-                    all_tasks.append(task)
-                    seen_task_ids.add(task_id)
-
-        return {"Items": all_tasks}
+        return self.task_store.get_for_user(user_id)
 
     def switch_view(self, view):
         self.state["active_view"] = view
@@ -119,6 +84,7 @@ class TasksPage(StandardPage):
             self.render_content()
 
 
-def tasks_page(session_manager):
-    page = TasksPage(session_manager)
+async def tasks_page(session_manager):
+    # Page data is loaded on a worker thread, only rendering runs on the event loop
+    page = await io_bound(TasksPage, session_manager)
     page.render()
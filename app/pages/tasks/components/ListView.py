@@ -1,8 +1,7 @@
 from nicegui import ui
 from modules import StyleManager
-from middleware.dynamo import DynamoMiddleware
+from middleware.dynamo import create_task_store
 from middleware.cognito import CognitoMiddleware
-from config import config
 from utils.func.util_functions import truncate_text, get_ordinal_suffix
 from datetime import datetime
 from .TaskView import TaskViewComponent
@@ -32,7 +31,7 @@ class ListViewComponent:
         self.state = state
         self.on_click_select_task = on_click_select_task
         self.style_manager = StyleManager()
-        self.dynamo_middleware = DynamoMiddleware(config.aws_tasks_table_name)
+        self.task_store = create_task_store()
         self._config()
 
     def _config(self):
@@ -94,7 +93,7 @@ class ListViewComponent:
 
     def _save_task(self, task_data, dialog):
         try:
-            self.dynamo_middleware.put_item(task_data)
+            self.task_store.put_item(task_data)
             ui.notify("Task updated successfully", type="positive")
             self.on_click_select_task(task_data)
             dialog.close()
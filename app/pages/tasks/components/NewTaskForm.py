@@ -1,15 +1,14 @@
 from nicegui import ui
 from datetime import datetime
-from middleware.dynamo import DynamoMiddleware
+from middleware.dynamo import create_task_store
 from middleware.cognito import CognitoMiddleware
-from config import config
 import uuid
 
 
 class NewTaskFormComponent:
     def __init__(self, on_task_created=None):
         self.on_task_created = on_task_created
-        self.dynamo_middleware = DynamoMiddleware(config.aws_tasks_table_name)
+        self.task_store = create_task_store()
         self.cognito_middleware = CognitoMiddleware()
         self._reset_form()
 
@@ -65,7 +64,7 @@ class NewTaskFormComponent:
                 "task_tags": {"L": [{"S": str(user)} for user in assigned_users]},
             }
 
-            self.dynamo_middleware.put_item(item)
+            self.task_store.put_item(item)
             ui.notify("Task created successfully", type="positive")
 
             if self.on_task_created:
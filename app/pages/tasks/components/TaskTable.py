@@ -1,10 +1,9 @@
 from nicegui import ui
 from modules import StyleManager
 from models import TaskModel
-from middleware.dynamo import DynamoMiddleware
+from middleware.dynamo import create_task_store
 from middleware.cognito import CognitoMiddleware
 import uuid
-from config import config
 from datetime import datetime
 from utils.helpers import *
 
@@ -25,7 +24,7 @@ class TaskTableComponent:
         self.on_click_select_task = on_click_select_task
         self.style_manager = StyleManager()
         self.cognito_middleware = CognitoMiddleware()
-        self.dynamo_middleware = DynamoMiddleware(config.aws_tasks_table_name)
+        self.task_store = create_task_store()
         self.new_task_input = NewTaskInput()
         self._config()
 
@@ -77,42 +76,7 @@ class TaskTableComponent:
 
     def _get_tasks(self):
         user_id = self.cognito_middleware.get_user_id()
-
-        # Get user's own tasks
-        own_tasks_expression = {":uid": {"S": user_id}}
-        own_tasks_response = self.dynamo_middleware.scan(
-            filter_expression="user_id = :uid",
-            expression_attribute_values=own_tasks_expression,
-        )
-
-        # Get tasks where user is tagged
-        tagged_tasks_expression = {":uid": {"S": user_id}}
-        tagged_tasks_response = self.dynamo_middleware.scan(
-            filter_expression="contains(task_tags, :uid)",
-            expression_attribute_values=tagged_tasks_expression,
-        )
-
-        # Combine and deduplicate tasks
-        all_tasks = []
-        seen_task_ids = set()
-
-        # Add own tasks
-        if "Items" in own_tasks_response:
-            for task in own_tasks_response["Items"]:
-                task_id = task["task_id"]["S"]
-                if task_id not in seen_task_ids:
-                    all_tasks.append(task)
-                    seen_task_ids.add(task_id)
-
-        # Add tagged tasks
-        if "Items" in tagged_tasks_response:
-            for task in tagged_tasks_response["Items"]:
-                task_id = task["task_id"]["S"]
-                if task_id not in seen_task_ids:
-                    all_tasks.append(task)
-                    seen_task_ids.add(task_id)
-
-        return all_tasks
+        return self.task_store.get_for_user(user_id)["Items"]
 
     def _open_add_task_modal(self):
         dialog = ui.dialog().props("medium")
@@ -224,7 +188,7 @@ class TaskTableComponent:
             "task_tags": {"L": [{"S": str(user_id)} for user_id in assigned_users]},
         }
 
-        self.dynamo_middleware.put_item(item)
+        self.task_store.put_item(item)
         self.new_task_input = NewTaskInput()
         dialog.close()
 
@@ -1,13 +1,13 @@
 from nicegui import ui
+from middleware.aio import io_bound
 from core import StandardPage
 from .components import *
 from components import ActionBar
 from .components.ListView import ListViewComponent
 from .components.NewTicketForm import NewTicketFormComponent
 from .components.KanbanView import KanbanViewComponent
-from middleware.dynamo import DynamoMiddleware
+from middleware.dynamo import create_ticket_store
 from middleware.cognito import CognitoMiddleware
-from config import config
 
 
 class TicketsPage(StandardPage):
@@ -23,7 +23,7 @@ class TicketsPage(StandardPage):
                 "nav_position": "top",
             },
         )
-        self.dynamo_middleware = DynamoMiddleware(config.aws_tickets_table_name)
+        self.ticket_store = create_ticket_store()
         self.cognito_middleware = CognitoMiddleware()
         self.state = {
             "active_view": "list",
@@ -36,13 +36,7 @@ class TicketsPage(StandardPage):
 
     def _get_tickets(self):
         user_id = self.cognito_middleware.get_user_id()
-        expression_values = {":uid": {"S": user_id}}
-
-        response = self.dynamo_middleware.scan(
-            filter_expression="contains(ticket_tags, :uid)",
-            expression_attribute_values=expression_values,
-        )
-        return response
+        return self.ticket_store.get_tagged(user_id)
 
     def switch_view(self, view):
         self.state["active_view"] = view
@@ -92,6 +86,7 @@ class TicketsPage(StandardPage):
             self.render_content()
 
 
-def tickets_page(session_manager):
-    page = TicketsPage(session_manager)
+async def tickets_page(session_manager):
+    # Page data is loaded on a worker thread, only rendering runs on the event loop
+    page = await io_bound(TicketsPage, session_manager)
     page.render()
@@ -1,8 +1,7 @@
 from nicegui import ui
 from modules import StyleManager
-from middleware.dynamo import DynamoMiddleware
+from middleware.dynamo import create_ticket_store
 from middleware.cognito import CognitoMiddleware
-from config import config
 from utils.func.util_functions import truncate_text, get_ordinal_suffix
 from datetime import datetime
 from .TicketView import TicketViewComponent
@@ -32,7 +31,7 @@ class ListViewComponent:
         self.state = state
         self.on_click_select_ticket = on_click_select_ticket
         self.style_manager = StyleManager()
-        self.dynamo_middleware = DynamoMiddleware(config.aws_tickets_table_name)
+        self.ticket_store = create_ticket_store()
         self._config()
 
     def _config(self):
@@ -98,7 +97,7 @@ class ListViewComponent:
 
     def _save_ticket(self, ticket_data, dialog):
         try:
-            self.dynamo_middleware.put_item(ticket_data)
+            self.ticket_store.put_item(ticket_data)
             ui.notify("Ticket updated successfully", type="positive")
             self.on_click_select_ticket(ticket_data)
             dialog.close()
@@ -1,15 +1,14 @@
 from nicegui import ui
 from datetime import datetime
-from middleware.dynamo import DynamoMiddleware
+from middleware.dynamo import create_ticket_store
 from middleware.cognito import CognitoMiddleware
-from config import config
 import uuid
 
 
 class NewTicketFormComponent:
     def __init__(self, on_ticket_created=None):
         self.on_ticket_created = on_ticket_created
-        self.dynamo_middleware = DynamoMiddleware(config.aws_tickets_table_name)
+        self.ticket_store = create_ticket_store()
         self.cognito_middleware = CognitoMiddleware()
         self._reset_form()
 
@@ -65,7 +64,7 @@ class NewTicketFormComponent:
                 "ticket_tags": {"L": [{"S": str(user)} for user in assigned_users]},
             }
 
-            self.dynamo_middleware.put_item(item)
+            self.ticket_store.put_item(item)
             ui.notify("Ticket created successfully", type="positive")
 
             if self.on_ticket_created:
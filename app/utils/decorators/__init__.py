@@ -1,3 +1,4 @@
+import inspect
 from config import config
 from functools import wraps
 from nicegui import ui, app
@@ -12,9 +13,9 @@ def permission_required(permission):
 
     def decorator(func):
         @wraps(func)
-        def wrapper(*args, **kwargs):
+        async def wrapper(*args, **kwargs):
             authenticator = CognitoMiddleware()
-            authenticator.initialize_user()
+            await authenticator.initialize_user_async()
             if not authenticator.is_authenticated():
                 ui.notify("Please log in to access this page.", type="error")
                 ui.navigate.to("/signin")
@@ -30,9 +31,12 @@ def permission_required(permission):
             # Update last_accessed timestamp
             username = app.storage.user.get("username")
             session_id = app.storage.user.get("session_id")
-            authenticator.update_last_accessed(username, session_id)
+            await authenticator.update_last_accessed_async(username, session_id)
 
-            return func(*args, **kwargs)
+            result = func(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
 
         return wrapper
 
@@ -1,5 +1,8 @@
 from datetime import datetime
-from typing import Union
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
 
 
 def create_date(
@@ -47,3 +50,70 @@ def create_date(
         raise ValueError(
             f"Error creating date: {str(e)}. Values - Month: {month}, Day: {day}, Year: {year}"
         )
+
+
+# Earliest and latest whole days representable as datetime64[ns]
+_FIRST_DAY = np.datetime64(pd.Timestamp.min.ceil("D").date(), "D")
+_LAST_DAY = np.datetime64(pd.Timestamp.max.floor("D").date(), "D")
+
+
+def create_date_series(
+    df: pd.DataFrame,
+    prefix: str,
+    min_year: Optional[int] = None,
+    two_digit_years: bool = False,
+    fill_missing: bool = False,
+) -> pd.Series:
+    """
+    Vectorized date assembly from `<prefix>_year`, `<prefix>_month` and `<prefix>_day` columns.
+
+    Components are truncated to integers the same way int(float(x)) does.
+    Rows that do not form a real calendar date (missing or zero parts,
+    month > 12, day > 31, Feb 30, outside the datetime64[ns] range) become NaT.
+
+    Args:
+        df: DataFrame holding the component columns
+        prefix: Column prefix, e.g. "posted_date"
+        min_year: Years below this are treated as invalid
+        two_digit_years: Read years 1-99 as 2001-2099; a zero year stays invalid
+        fill_missing: Default missing parts to 1900-01-01 and clip month/day
+            into range instead of rejecting them
+
+    Returns:
+        datetime64[ns] Series aligned with df.index
+    """
+    year, month, day = (
+        pd.to_numeric(df[f"{prefix}_{part}"], errors="coerce").to_numpy(dtype=float)
+        for part in ("year", "month", "day")
+    )
+
+    if fill_missing:
+        year = np.trunc(np.where(np.isfinite(year), year, 1900))
+        month = np.clip(np.trunc(np.where(np.isfinite(month), month, 1)), 1, 12)
+        day = np.clip(np.trunc(np.where(np.isfinite(day), day, 1)), 1, 31)
+        valid = np.ones(len(df), dtype=bool)
+    else:
+        valid = np.isfinite(year) & np.isfinite(month) & np.isfinite(day)
+        year, month, day = np.trunc(year), np.trunc(month), np.trunc(day)
+        if two_digit_years:
+            valid &= year != 0
+            year = np.where(year < 100, year + 2000, year)
+        valid &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+
+    if min_year is not None:
+        valid &= year >= min_year
+    valid &= (year >= 1000) & (year <= 9999)
+
+    months = (
+        (year[valid].astype("int64") - 1970) * 12 + month[valid].astype("int64") - 1
+    ).astype("datetime64[M]")
+    days = months.astype("datetime64[D]") + (day[valid].astype("int64") - 1)
+
+    # Days past the end of the month roll over; those are not real dates
+    real = (days.astype("datetime64[M]") == months) & (days >= _FIRST_DAY)
+    real &= days <= _LAST_DAY
+
+    result = np.full(len(df), np.datetime64("NaT"), dtype="datetime64[ns]")
+    positions = np.flatnonzero(valid)[real]
+    result[positions] = days[real]
+    return pd.Series(result, index=df.index)
@@ -0,0 +1,210 @@
+"""
+ClientMetricsWidget client aggregation against the per-client loop it replaced.
+
+Builds synthetic accounts and transactions masters (string file numbers as
+DataProcessor formats them, missing clients, files, listing dates and
+balances, zero balances), runs the loop that _calculate_client_metrics used
+before it was rewritten and the current grouped version on the same frames,
+checks that every client record matches and times both.
+
+    python benchmarks/bench_client_metrics.py [--accounts 100000]
+        [--transactions 2000000] [--clients 60] [--placements 12]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tests"))
+import app_env  # noqa: E402,F401
+
+from components.widgets.ClientMetricsWidget import ClientMetricsWidget  # noqa: E402
+
+
+def masters(accounts, transactions, clients, placements, seed=0):
+    """Accounts and transactions frames shaped like the formatted masters"""
+    rng = np.random.default_rng(seed)
+
+    def missing(values, share):
+        values = pd.Series(values, dtype=object)
+        values[rng.random(len(values)) < share] = None
+        return values
+
+    # Each client places accounts in batches, one listing date per batch
+    client = rng.integers(1, clients + 1, accounts)
+    batch = rng.integers(0, placements, accounts)
+    start = pd.Timestamp("2022-01-01") + pd.to_timedelta(
+        rng.integers(0, 28, clients + 1), unit="D"
+    )
+    listed = start[client] + pd.to_timedelta(batch * 30, unit="D")
+    loaded = rng.uniform(0, 5000, accounts).round(2)
+    loaded[rng.random(accounts) < 0.01] = 0
+    accounts_df = pd.DataFrame(
+        {
+            "client_number": missing([f"S{c}" for c in client], 0.02),
+            "file_number": missing([f"S{f}" for f in range(accounts)], 0.02),
+            "original_upb_loaded": pd.Series(loaded).mask(rng.random(accounts) < 0.02),
+            "listed_date": pd.Series(listed).mask(rng.random(accounts) < 0.02),
+        }
+    )
+
+    paid = pd.Timestamp("2022-01-01") + pd.to_timedelta(
+        rng.integers(0, 1000, transactions), unit="D"
+    )
+    transactions_df = pd.DataFrame(
+        {
+            "file_number": [
+                f"S{f}" for f in rng.integers(0, int(accounts * 1.1), transactions)
+            ],
+            "payment_amount": pd.Series(
+                rng.uniform(0, 300, transactions).round(2)
+            ).mask(rng.random(transactions) < 0.02),
+            "payment_date": paid,
+        }
+    )
+    return accounts_df, transactions_df
+
+
+def client_metrics_loop(accounts_df, transactions_df):
+    """_calculate_client_metrics as it was before the grouped rewrite"""
+    clients = []
+    for client_number in accounts_df["client_number"].unique():
+        client_accounts = accounts_df[accounts_df["client_number"] == client_number]
+        client_payments = transactions_df[
+            transactions_df["file_number"].isin(client_accounts["file_number"])
+        ]
+
+        total_placements = len(client_accounts["listed_date"].unique())
+        total_loaded = client_accounts["original_upb_loaded"].sum()
+        total_accounts = len(client_accounts)
+        total_collected = client_payments["payment_amount"].sum()
+        paying_accounts = client_payments["file_number"].nunique()
+
+        avg_liquidation = (
+            (total_collected / total_loaded * 100) if total_loaded > 0 else 0
+        )
+        avg_activation = (
+            (paying_accounts / total_accounts * 100) if total_accounts > 0 else 0
+        )
+
+        monthly_rates = []
+        for placement_date in client_accounts["listed_date"].unique():
+            if pd.isna(placement_date):
+                continue
+
+            placement = client_accounts[
+                client_accounts["listed_date"] == placement_date
+            ]
+            placement_loaded = placement["original_upb_loaded"].sum()
+
+            if placement_loaded > 0:
+                placement_collected = transactions_df[
+                    transactions_df["file_number"].isin(placement["file_number"])
+                ]["payment_amount"].sum()
+                monthly_rates.append((placement_collected / placement_loaded) * 100)
+
+        liquidation_std = np.std(monthly_rates) if monthly_rates else 0
+
+        performance_trend = 0
+        if len(monthly_rates) >= 2:
+            recent_half = monthly_rates[len(monthly_rates) // 2 :]
+            older_half = monthly_rates[: len(monthly_rates) // 2]
+            performance_trend = (
+                np.mean(recent_half) - np.mean(older_half)
+                if recent_half and older_half
+                else 0
+            )
+
+        clients.append(
+            {
+                "client_number": client_number,
+                "total_placements": total_placements,
+                "total_loaded": round(total_loaded, 2),
+                "total_collected": round(total_collected, 2),
+                "total_accounts": total_accounts,
+                "paying_accounts": paying_accounts,
+                "avg_liquidation": round(avg_liquidation, 2),
+                "avg_activation": round(avg_activation, 2),
+                "liquidation_std": round(liquidation_std, 2),
+                "performance_trend": round(performance_trend, 2),
+            }
+        )
+
+    return clients
+
+
+def widget_for(accounts_df, transactions_df):
+    """A ClientMetricsWidget that reads the given frames instead of S3"""
+    widget = ClientMetricsWidget.__new__(ClientMetricsWidget)
+    widget.get_accounts = lambda: accounts_df.copy()
+    widget.get_transactions = lambda: transactions_df.copy()
+    widget.get_date_column = lambda dataset, prefix, **options: {
+        "accounts": accounts_df,
+        "transactions": transactions_df,
+    }[dataset][prefix]
+    return widget
+
+
+def mismatches(old, new):
+    """Client record fields that differ by more than rounding"""
+    assert [r["client_number"] for r in old] == [r["client_number"] for r in new]
+    differing = []
+    for old_record, new_record in zip(old, new):
+        for key, old_value in old_record.items():
+            new_value = new_record[key]
+            if type(old_value) is not type(new_value) and not (
+                isinstance(old_value, (int, float, np.number))
+                and isinstance(new_value, (int, float, np.number))
+            ):
+                differing.append((old_record["client_number"], key))
+            elif isinstance(old_value, (float, np.floating)):
+                if not abs(old_value - new_value) <= 0.011:
+                    differing.append((old_record["client_number"], key))
+            elif old_value != new_value:
+                differing.append((old_record["client_number"], key))
+    return differing
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=100_000)
+    parser.add_argument("--transactions", type=int, default=2_000_000)
+    parser.add_argument("--clients", type=int, default=60)
+    parser.add_argument("--placements", type=int, default=12)
+    args = parser.parse_args()
+
+    accounts_df, transactions_df = masters(
+        args.accounts, args.transactions, args.clients, args.placements
+    )
+    placements = accounts_df.groupby("client_number")["listed_date"].nunique().sum()
+    print(
+        f"{args.accounts:,} accounts, {args.transactions:,} transactions, "
+        f"{accounts_df['client_number'].nunique()} clients, {placements} placements"
+    )
+
+    old, old_seconds = timed(
+        client_metrics_loop, accounts_df.copy(), transactions_df.copy()
+    )
+    widget = widget_for(accounts_df, transactions_df)
+    new, new_seconds = timed(widget._calculate_client_metrics)
+    differing = mismatches(old, new)
+    print(
+        f"client metrics: per-client loop {old_seconds:.2f}s | "
+        f"grouped {new_seconds:.2f}s | {old_seconds / new_seconds:.0f}x, "
+        f"{len(differing)} mismatched fields in {len(new)} records"
+    )
+    assert not differing, differing[:10]
+
+
+if __name__ == "__main__":
+    main()
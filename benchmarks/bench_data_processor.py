@@ -0,0 +1,148 @@
+"""
+DataProcessor sanitization and the local dataset cache on a synthetic
+transactions master.
+
+Formats the same parsed frame with the row-wise `apply` path that
+_format_dataframe used before it was vectorized and with the current
+_format_dataframe, checks that both give the same frame and times them.
+Then compares a cold load (parse the CSV and format it) with reading the
+formatted frame back from DatasetCache, as DatasetStore does after a
+restart.
+
+    python benchmarks/bench_data_processor.py [--rows 1000000]
+"""
+
+import argparse
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tests"))
+import app_env  # noqa: E402,F401
+
+from middleware.s3 import DatasetCache, DataProcessor  # noqa: E402
+
+DIRTY_AMOUNTS = ["NONE", "NULL", "", "$1,234.50", "-12.5", "1e3", "'7'", " 3.25 "]
+
+
+def transactions_csv(rows, seed=0):
+    """CSV text shaped like the transactions master, with dirty cells"""
+    rng = np.random.default_rng(seed)
+
+    def with_dirt(values, share=0.1):
+        values = values.astype(object)
+        dirty = rng.random(rows) < share
+        values[dirty] = rng.choice(DIRTY_AMOUNTS, dirty.sum())
+        return values
+
+    def with_blanks(values, share=0.02):
+        values = values.astype(object)
+        values[rng.random(rows) < share] = ""
+        return values
+
+    posted = pd.Timestamp("2020-01-01") + pd.to_timedelta(
+        rng.integers(0, 1800, rows), unit="D"
+    )
+    paid = posted - pd.to_timedelta(rng.integers(0, 10, rows), unit="D")
+    frame = pd.DataFrame(
+        {
+            "client_number": with_blanks(rng.integers(100, 400, rows)),
+            "description": rng.choice(["Payment", "Adjustment", "Reversal"], rows),
+            "file_number": with_blanks(rng.integers(10**5, 10**7, rows)),
+            "operator": rng.choice(["OP1", "OP2", "OP3", "SYSTEM"], rows),
+            "posted_by": rng.choice(["alice", "bob", "carol"], rows),
+            "transaction_type": rng.choice(["PMT", "ADJ", "REV", "NSF"], rows),
+            "payment_date_day": with_blanks(paid.day.to_numpy()),
+            "payment_date_month": paid.month,
+            "payment_date_year": paid.year,
+            "posted_date_day": posted.day,
+            "posted_date_month": posted.month,
+            "posted_date_year": with_blanks(posted.year.to_numpy()),
+            "contingency_amount": with_dirt(rng.uniform(0, 100, rows).round(2)),
+            "payment_amount": with_dirt(rng.uniform(-50, 900, rows).round(2)),
+        }
+    )
+    return frame.to_csv(index=False)
+
+
+def format_row_wise(processor, df):
+    """_format_dataframe("transactions", df) as it was before vectorization"""
+
+    def to_numeric_string(x):
+        return f"S{str(int(float(x)))}" if pd.notna(x) and str(x).strip() != "" else ""
+
+    for col in ["contingency_amount", "payment_amount"]:
+        df[col] = df[col].apply(processor._sanitize_float_numbers)
+    for col in [
+        "payment_date_day",
+        "payment_date_month",
+        "payment_date_year",
+        "posted_date_day",
+        "posted_date_month",
+        "posted_date_year",
+    ]:
+        df[col] = df[col].apply(processor._sanitize_integers)
+    for col in ["client_number", "file_number"]:
+        df[col] = df[col].apply(to_numeric_string)
+    for prefix in ["payment_date", "posted_date"]:
+        df[prefix] = pd.to_datetime(
+            {
+                "year": df[f"{prefix}_year"],
+                "month": df[f"{prefix}_month"],
+                "day": df[f"{prefix}_day"],
+            },
+            errors="coerce",
+        )
+    return df
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    processor = DataProcessor("bucket")
+    csv_text, generate_seconds = timed(transactions_csv, args.rows)
+    raw, parse_seconds = timed(
+        lambda: pd.read_csv(StringIO(csv_text), low_memory=False)
+    )
+    print(
+        f"{args.rows:,} rows, {len(csv_text) / 1e6:.0f}MB of CSV "
+        f"(generated in {generate_seconds:.1f}s, parsed in {parse_seconds:.1f}s)"
+    )
+
+    old, old_seconds = timed(format_row_wise, processor, raw.copy())
+    new, new_seconds = timed(processor._format_dataframe, "transactions", raw.copy())
+    pd.testing.assert_frame_equal(new, old)
+    print(
+        f"sanitization: row-wise apply {old_seconds:.2f}s | "
+        f"vectorized {new_seconds:.2f}s | {old_seconds / new_seconds:.0f}x, "
+        "identical output"
+    )
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = DatasetCache(cache_dir)
+        cache.save("bucket", "tr_master.csv", "v1", new, "formatted")
+        cached, load_seconds = timed(
+            cache.load, "bucket", "tr_master.csv", "v1", "formatted"
+        )
+    pd.testing.assert_frame_equal(cached, new)
+    print(
+        f"warm start: parse and format {parse_seconds + new_seconds:.2f}s | "
+        f"DatasetCache load {load_seconds:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+DynamoSerializer against the converters it replaced and boto3's.
+
+Checks that DynamoSerializer(use_decimal=True) reads random typed items
+exactly as boto3's TypeDeserializer does and writes them back unchanged,
+then times both directions on a metric_cache-shaped payload (12 widgets
+of nested maps and 30-row tables).
+
+    python benchmarks/bench_dynamo_serializer.py
+"""
+
+import decimal
+import random
+import sys
+import time
+from pathlib import Path
+
+from boto3.dynamodb.types import Binary, TypeDeserializer, TypeSerializer
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tests"))
+import app_env  # noqa: E402,F401
+
+from middleware.dynamo import DynamoSerializer, dynamo_serializer  # noqa: E402
+
+
+def parse_dynamo_type(value):
+    """WidgetFramework's reader before DynamoSerializer"""
+    if isinstance(value, dict):
+        if "M" in value:
+            return {k: parse_dynamo_type(v) for k, v in value["M"].items()}
+        if "L" in value:
+            return [parse_dynamo_type(v) for v in value["L"]]
+        for type_key in ["S", "N", "BOOL"]:
+            if type_key in value:
+                if type_key == "N":
+                    try:
+                        return int(value[type_key])
+                    except ValueError:
+                        return float(value[type_key])
+                return value[type_key]
+    return value
+
+
+def to_dynamo_type(value):
+    """WidgetFramework's writer before DynamoSerializer"""
+    if isinstance(value, dict):
+        return {"M": {k: to_dynamo_type(v) for k, v in value.items()}}
+    if isinstance(value, list):
+        return {"L": [to_dynamo_type(v) for v in value]}
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, (int, float)):
+        return {"N": str(value)}
+    return {"S": str(value)}
+
+
+def random_value(rng, depth=0):
+    kinds = ["s", "n", "f", "b", "null", "bin", "ss", "ns", "bs"]
+    if depth < 6:
+        kinds += ["m", "l", "m", "l"]
+    kind = rng.choice(kinds)
+    if kind == "s":
+        return f"x{rng.randint(0, 9)}"
+    if kind == "n":
+        return rng.randint(-(10**12), 10**12)
+    if kind == "f":
+        return decimal.Decimal(str(round(rng.uniform(-1e4, 1e4), 3)))
+    if kind == "b":
+        return rng.random() < 0.5
+    if kind == "null":
+        return None
+    if kind == "bin":
+        return bytes([rng.randint(0, 255)])
+    if kind == "ss":
+        return {"a", "b"}
+    if kind == "ns":
+        return {1, decimal.Decimal("2.5")}
+    if kind == "bs":
+        return {b"\x01", b"\x02"}
+    if kind == "m":
+        return {f"k{i}": random_value(rng, depth + 1) for i in range(rng.randint(0, 4))}
+    return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+
+
+def unwrap_binary(value):
+    if isinstance(value, Binary):
+        return bytes(value.value)
+    if isinstance(value, dict):
+        return {k: unwrap_binary(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [unwrap_binary(v) for v in value]
+    if isinstance(value, set):
+        return {unwrap_binary(v) for v in value}
+    return value
+
+
+def canonical(typed):
+    """Typed value with set members sorted, since set order is not kept"""
+    if isinstance(typed, dict):
+        return {
+            k: sorted(map(str, v)) if k in ("SS", "NS", "BS") else canonical(v)
+            for k, v in typed.items()
+        }
+    if isinstance(typed, list):
+        return [canonical(v) for v in typed]
+    return typed
+
+
+def check_against_boto3(count=5000):
+    rng = random.Random(0)
+    serializer, deserializer = TypeSerializer(), TypeDeserializer()
+    decimal_serializer = DynamoSerializer(use_decimal=True)
+    read_mismatches = write_mismatches = 0
+    for _ in range(count):
+        item = {f"a{i}": random_value(rng) for i in range(6)}
+        typed = {k: serializer.serialize(v) for k, v in item.items()}
+        native = decimal_serializer.deserialize_item(typed)
+        expected = unwrap_binary(
+            {k: deserializer.deserialize(v) for k, v in typed.items()}
+        )
+        read_mismatches += native != expected
+        written = dynamo_serializer.serialize_item(native)
+        write_mismatches += canonical(written) != canonical(typed)
+    print(
+        f"{count} random items: {read_mismatches} read and "
+        f"{write_mismatches} write mismatches against boto3"
+    )
+
+
+def metric_cache_payload():
+    def widget(i):
+        return {
+            "cache_key": "a" * 40,
+            "last_updated": "2026-10-17",
+            "metrics": {
+                "totals": {"accounts": 1234 + i, "balance": 55321.75, "active": True},
+                "by_month": [
+                    {
+                        "month": f"2026-{m:02d}",
+                        "count": m * 7,
+                        "rate": m / 13,
+                        "flags": {"ok": True, "note": "none"},
+                    }
+                    for m in range(1, 13)
+                ],
+                "table": [
+                    {
+                        "client": f"c{r}",
+                        "placed": r * 3,
+                        "collected": r * 1.5,
+                        "pct": [r / 7, r / 9, r / 11],
+                    }
+                    for r in range(30)
+                ],
+            },
+        }
+
+    return {f"widget_{i}": widget(i) for i in range(12)}
+
+
+def bench(functions, rounds=40, number=10):
+    """Best time per call in ms, with the candidates interleaved round by round"""
+    best = [float("inf")] * len(functions)
+    for _ in range(rounds):
+        for position, function in enumerate(functions):
+            start = time.perf_counter()
+            for _ in range(number):
+                function()
+            elapsed = (time.perf_counter() - start) / number * 1000
+            best[position] = min(best[position], elapsed)
+    return best
+
+
+def main():
+    check_against_boto3()
+
+    native = metric_cache_payload()
+    typed = to_dynamo_type(native)
+    assert dynamo_serializer.deserialize(typed) == parse_dynamo_type(typed)
+    assert dynamo_serializer.serialize(native) == typed
+
+    deserializer = TypeDeserializer()
+    new, old, boto = bench(
+        [
+            lambda: dynamo_serializer.deserialize(typed),
+            lambda: parse_dynamo_type(typed),
+            lambda: deserializer.deserialize(typed),
+        ]
+    )
+    print(
+        f"metric_cache read:  DynamoSerializer {new:.2f}ms | "
+        f"parse_dynamo_type {old:.2f}ms | boto3 {boto:.2f}ms"
+    )
+
+    new, old = bench(
+        [lambda: dynamo_serializer.serialize(native), lambda: to_dynamo_type(native)]
+    )
+    print(
+        f"metric_cache write: DynamoSerializer {new:.2f}ms | to_dynamo_type {old:.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+TaggedItemStore per-user reads against the filtered scans they replaced.
+
+Runs against an in-memory DynamoDB stand-in: tables and GSIs (with ALL or
+KEYS_ONLY projections) hold typed items, scans and queries return pages of
+at most 100 examined items, BatchGetItem leaves keys unprocessed beyond 60
+per call, and every request costs a fixed round trip plus a per-item read
+time. For a few users, with and without a status filter, checks that the
+store returns the same tasks as the two scans did and reports requests,
+items read and time per page load. Then checks that retagging and deletes
+keep the tag index in step and that the scan fallback agrees.
+
+    python benchmarks/bench_tagged_item_store.py [--tasks 20000] [--users 200]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tests"))
+import app_env  # noqa: E402,F401
+
+from middleware.aws import aws_clients  # noqa: E402
+from middleware.dynamo import DynamoMiddleware, TaggedItemStore  # noqa: E402
+
+PAGE_SIZE = 100
+BATCH_GET_SERVED = 60
+ROUND_TRIP = 0.002
+ITEM_READ = 0.00001
+
+
+class StandInTable:
+    def __init__(self, key_attributes, indexes=None):
+        self.key_attributes = key_attributes
+        # index name -> (hash attribute, projection type)
+        self.indexes = indexes or {}
+        self.rows = {}
+
+    def key(self, item):
+        return tuple(item[attribute]["S"] for attribute in self.key_attributes)
+
+
+def condition(expression, names, values):
+    """Predicate for the `a = :v` / `contains(a, :v)` terms the store builds"""
+    names = names or {}
+
+    def term(text):
+        contains = re.fullmatch(r"contains\((\S+), (\S+)\)", text.strip())
+        if contains:
+            attribute, value = names.get(contains[1], contains[1]), values[contains[2]]
+            return lambda item: value in item.get(attribute, {}).get("L", [])
+        attribute, value = (part.strip() for part in text.split("="))
+        attribute, value = names.get(attribute, attribute), values[value]
+        return lambda item: item.get(attribute) == value
+
+    terms = [term(text) for text in expression.split(" AND ")]
+    return lambda item: all(test(item) for test in terms)
+
+
+def project(item, expression, names):
+    if not expression:
+        return dict(item)
+    attributes = [
+        names.get(part.strip(), part.strip()) for part in expression.split(",")
+    ]
+    return {attribute: item[attribute] for attribute in attributes if attribute in item}
+
+
+class StandInDynamo:
+    """The DynamoDB client calls DynamoMiddleware makes, over StandInTables"""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.items_read = 0
+
+    def _cost(self, items):
+        self.requests += 1
+        self.items_read += items
+        time.sleep(ROUND_TRIP + ITEM_READ * items)
+
+    def _page(self, rows, params):
+        start = params.get("ExclusiveStartKey", {"position": {"N": "0"}})
+        start = int(start["position"]["N"])
+        page = rows[start : start + PAGE_SIZE]
+        self._cost(len(page))
+        names = params.get("ExpressionAttributeNames")
+        if "FilterExpression" in params:
+            test = condition(
+                params["FilterExpression"], names, params["ExpressionAttributeValues"]
+            )
+            page = [item for item in page if test(item)]
+        response = {
+            "Items": [
+                project(item, params.get("ProjectionExpression"), names)
+                for item in page
+            ]
+        }
+        response["Count"] = len(response["Items"])
+        if start + PAGE_SIZE < len(rows):
+            response["LastEvaluatedKey"] = {"position": {"N": str(start + PAGE_SIZE)}}
+        return response
+
+    def scan(self, TableName, **params):
+        return self._page(list(self.tables[TableName].rows.values()), params)
+
+    def query(self, TableName, **params):
+        table = self.tables[TableName]
+        matches = condition(
+            params["KeyConditionExpression"],
+            params.get("ExpressionAttributeNames"),
+            params["ExpressionAttributeValues"],
+        )
+        rows = [item for item in table.rows.values() if matches(item)]
+        if "IndexName" in params:
+            hash_attribute, projection = table.indexes[params["IndexName"]]
+            if projection == "KEYS_ONLY":
+                kept = set(table.key_attributes) | {hash_attribute}
+                rows = [{a: v for a, v in item.items() if a in kept} for item in rows]
+        return self._page(rows, params)
+
+    def get_item(self, TableName, Key, **params):
+        table = self.tables[TableName]
+        self._cost(1)
+        item = table.rows.get(table.key(Key))
+        if item is None:
+            return {}
+        names = params.get("ExpressionAttributeNames")
+        return {"Item": project(item, params.get("ProjectionExpression"), names)}
+
+    def put_item(self, TableName, Item):
+        self._cost(0)
+        table = self.tables[TableName]
+        table.rows[table.key(Item)] = dict(Item)
+        return {}
+
+    def delete_item(self, TableName, Key):
+        self._cost(0)
+        table = self.tables[TableName]
+        table.rows.pop(table.key(Key), None)
+        return {}
+
+    def batch_get_item(self, RequestItems):
+        responses, unprocessed = {}, {}
+        for name, request in RequestItems.items():
+            table, keys = self.tables[name], request["Keys"]
+            assert len(keys) <= 100
+            served, rest = keys[:BATCH_GET_SERVED], keys[BATCH_GET_SERVED:]
+            responses[name] = [
+                project(
+                    table.rows[table.key(key)],
+                    request.get("ProjectionExpression"),
+                    request.get("ExpressionAttributeNames"),
+                )
+                for key in served
+                if table.key(key) in table.rows
+            ]
+            if rest:
+                unprocessed[name] = {**request, "Keys": rest}
+            self._cost(len(served))
+        return {"Responses": responses, "UnprocessedKeys": unprocessed}
+
+    def batch_write_item(self, RequestItems):
+        self._cost(0)
+        for name, requests in RequestItems.items():
+            assert len(requests) <= 25
+            table = self.tables[name]
+            for request in requests:
+                if "PutRequest" in request:
+                    item = request["PutRequest"]["Item"]
+                    table.rows[table.key(item)] = item
+                else:
+                    table.rows.pop(table.key(request["DeleteRequest"]["Key"]), None)
+        return {"UnprocessedItems": {}}
+
+
+def scan_for_user(tasks, user_id, status=None):
+    """The task pages' reads before TaggedItemStore: two filtered scans"""
+    values = {":uid": {"S": user_id}}
+    extra = ""
+    if status:
+        values[":status"] = {"S": status}
+        extra = " AND task_status = :status"
+    owned = tasks.scan(
+        filter_expression="user_id = :uid" + extra,
+        expression_attribute_values=values,
+    )["Items"]
+    tagged = tasks.scan(
+        filter_expression="contains(task_tags, :uid)" + extra,
+        expression_attribute_values=values,
+    )["Items"]
+    items = {}
+    for item in owned + tagged:
+        items.setdefault(item["task_id"]["S"], item)
+    return items
+
+
+def by_id(response):
+    return {item["task_id"]["S"]: item for item in response["Items"]}
+
+
+def measure(client, read):
+    client.reset()
+    start = time.perf_counter()
+    result = read()
+    return result, time.perf_counter() - start, client.requests, client.items_read
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--users", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    users = [f"u{i}" for i in range(args.users)]
+    tasks = StandInTable(
+        ["task_id", "user_id"],
+        {"user_id-all": ("user_id", "ALL"), "user_id-keys": ("user_id", "KEYS_ONLY")},
+    )
+    for position in range(args.tasks):
+        item = {
+            "task_id": {"S": f"t{position}"},
+            "user_id": {"S": rng.choice(users)},
+            "task_tags": {
+                "L": [{"S": u} for u in rng.sample(users, rng.randint(1, 3))]
+            },
+            "task_status": {"S": rng.choice(["pending", "Completed"])},
+        }
+        tasks.rows[tasks.key(item)] = item
+    client = StandInDynamo(
+        {"tasks": tasks, "task_tags": StandInTable(["tag", "item_id"])}
+    )
+    aws_clients.client = lambda *args, **kwargs: client
+
+    table = DynamoMiddleware("tasks")
+    stores = {
+        "ALL": TaggedItemStore(
+            "tasks", "task_id", "task_tags", "user_id-all", "task_tags"
+        ),
+        "KEYS_ONLY": TaggedItemStore(
+            "tasks",
+            "task_id",
+            "task_tags",
+            "user_id-keys",
+            "task_tags",
+            owner_index_projection="KEYS_ONLY",
+        ),
+    }
+    rows = stores["ALL"].rebuild_tag_index()
+    print(f"{args.tasks:,} tasks, {args.users} users, {rows:,} tag index rows")
+
+    for user_id, status in [("u3", None), ("u77", "pending"), ("u150", None)]:
+        where = {"task_status": {"S": status}} if status else None
+        expected, seconds, requests, read = measure(
+            client, lambda: scan_for_user(table, user_id, status)
+        )
+        line = (
+            f"{user_id} status={status}, {len(expected)} tasks: "
+            f"scans {requests} requests / {read:,} items / {seconds * 1000:.0f}ms"
+        )
+        for projection, store in stores.items():
+            result, seconds, requests, read = measure(
+                client, lambda: by_id(store.get_for_user(user_id, where))
+            )
+            assert result == expected, (projection, user_id, status)
+            line += (
+                f" | {projection} GSI {requests} requests / {read:,} items"
+                f" / {seconds * 1000:.0f}ms"
+            )
+        print(line)
+
+    store = stores["KEYS_ONLY"]
+    task = dict(
+        next(item for item in tasks.rows.values() if item["task_id"]["S"] == "t5")
+    )
+    task["task_tags"] = {"L": [{"S": "zz"}]}
+    store.put_item(task)
+    assert set(by_id(store.get_tagged("zz"))) == {"t5"}
+    assert [key for key in client.tables["task_tags"].rows if key[1] == "t5"] == [
+        ("zz", "t5")
+    ]
+    store.delete_item({"task_id": task["task_id"], "user_id": task["user_id"]})
+    assert store.get_tagged("zz")["Count"] == 0
+    assert not [key for key in client.tables["task_tags"].rows if key[1] == "t5"]
+
+    fallback = TaggedItemStore("tasks", "task_id", "task_tags")
+    assert by_id(fallback.get_for_user("u9")) == by_id(store.get_for_user("u9"))
+    print("retag, delete and scan fallback agree with the tag index")
+
+
+if __name__ == "__main__":
+    main()
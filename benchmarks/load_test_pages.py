@@ -0,0 +1,371 @@
+"""
+Concurrent loads of the app's real page routes against slow AWS stand-ins.
+
+main.py is imported with ui.run disabled and every boto3 client and
+resource the middlewares create is replaced by a stand-in that sleeps for
+a fixed latency before answering with an empty (or minimal) response.
+S3 serves a few rows of each master dataset, so the dashboard's widgets
+are computed in their worker processes. Each load runs a route coroutine
+from main.py inside its own NiceGUI client, with a signed-in user in
+app.storage.user, the way a browser request would, and is timed until the
+work it left running in the background is done. A heartbeat task measures
+the worst event-loop stall, which is how long every other client's
+websocket would have gone unanswered, and every AWS call is recorded with
+the thread it ran on. The script exits non-zero if a route failed or made
+an AWS call on the event loop thread.
+
+Groq is not replaced; with the test settings' dummy key its calls fail and
+the widgets show their error text. The campaigns route calls webhooks
+rather than AWS and is not covered.
+
+    python benchmarks/load_test_pages.py [--loads 10] [--call-ms 200] [--route tickets]
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tests"))
+os.environ.setdefault("NICEGUI_STORAGE_PATH", tempfile.mkdtemp())
+import app_env  # noqa: E402,F401
+
+import jwt  # noqa: E402
+import pandas as pd  # noqa: E402
+from nicegui import Client, app, background_tasks, core, storage, ui  # noqa: E402
+from nicegui.page import page  # noqa: E402
+
+ui.run = lambda *args, **kwargs: None
+import main as app_main  # noqa: E402
+from components.widgets.WidgetFramework import S3_MASTER_KEY_MAP  # noqa: E402
+from middleware.aio import shutdown_process_pool  # noqa: E402
+from middleware.aws import aws_clients  # noqa: E402
+
+HEARTBEAT = 0.01
+
+CALL_MS_ENV = "LOAD_TEST_CALL_MS"
+
+ROUTES = {
+    "dashboard": app_main.root_dashboard,
+    "tickets": app_main.root_tickets,
+    "tasks": app_main.root_tasks,
+    "goals": app_main.root_goals,
+    "reports": app_main.root_reports,
+    "resolutions": app_main.root_resolutions,
+    "intelidoc": app_main.root_intelidoc,
+    "settings": app_main.root_settings,
+}
+
+GROUPS = ["dashboard_view"]
+
+
+def dates(prefix, day):
+    return {f"{prefix}_year": 2024, f"{prefix}_month": 3, f"{prefix}_day": day}
+
+
+def csv_body(rows):
+    return pd.DataFrame(rows).to_csv(index=False).encode("utf-8")
+
+
+# A few rows of each master dataset, with the columns the dashboard reads
+DATASETS = {
+    S3_MASTER_KEY_MAP["accounts"]: csv_body(
+        {
+            "client_number": client,
+            "file_number": f"S{number}",
+            "original_upb_loaded": 1000.0 * number,
+            "account_status": "Active",
+            **dates("listed_date", number),
+        }
+        for number, client in enumerate(["100", "100", "200"], 1)
+    ),
+    S3_MASTER_KEY_MAP["transactions"]: csv_body(
+        {
+            "file_number": f"S{number}",
+            "payment_amount": 25.0 * number,
+            "transaction_type": "Payment",
+            "operator": "system",
+            **dates("payment_date", number + 3),
+            **dates("posted_date", number + 4),
+        }
+        for number in range(1, 4)
+    ),
+    S3_MASTER_KEY_MAP["contacts"]: csv_body(
+        {
+            "client_number": client,
+            "file_number": f"S{number}",
+            "status": "Promise",
+            "account_status": "Active",
+            "last_modified": "2024-03-05",
+            "created_date": f"2024-03-0{number + 2}",
+        }
+        for number, client in enumerate(["100", "100", "200"], 1)
+    ),
+    S3_MASTER_KEY_MAP["outbound"]: csv_body(
+        {
+            "file_number": f"S{number}",
+            "total_calls": number,
+            "delivery_cost_sum": 0.5 * number,
+            "delivery_cost_average": 0.5,
+            "phone_cell_count": 1,
+            "phone_home_count": 0,
+            "phone_work_count": 0,
+            "phone_other_count": 0,
+            "monday": number,
+            "agent_id_1": 1,
+            "interaction_contact": 1,
+            "result_answered": 1,
+            "last_modified": "2024-03-05",
+        }
+        for number in range(1, 4)
+    ),
+}
+
+
+class Calls:
+    """AWS calls made by the stand-ins, with the thread each one ran on"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.made = []
+
+    def record(self, service, operation):
+        with self.lock:
+            self.made.append((service, operation, threading.current_thread()))
+
+    def on_loop(self, loop_thread):
+        with self.lock:
+            return sorted(
+                {
+                    f"{service}.{operation}"
+                    for service, operation, thread in self.made
+                    if thread is loop_thread
+                }
+            )
+
+    def clear(self):
+        with self.lock:
+            self.made.clear()
+
+
+calls = Calls()
+
+
+def user_record():
+    """A users table record in the low-level client's attribute-value format"""
+    now = str(int(time.time()))
+    return {
+        "user_id": {"S": "sub"},
+        "company_id": {"S": "company"},
+        "role": {"S": "Manager"},
+        "responsibilities": {"L": []},
+        "updated_on": {"N": now},
+        "updated_by": {"S": "user"},
+        "created_on": {"N": now},
+        "created_by": {"S": "user"},
+        "goals": {"L": []},
+    }
+
+
+def response(operation, params, table=False):
+    """A minimal successful answer to a boto3 call"""
+    now = datetime.now(timezone.utc)
+    if operation in ("scan", "query"):
+        return {"Items": [], "Count": 0}
+    if operation == "get_item" and table:
+        # Session records are read back and must not have expired
+        return {"Item": {"expiration_time": int(time.time()) + 3600, "is_active": True}}
+    if operation == "get_item":
+        return {"Item": user_record()}
+    if operation in ("list_users", "list_users_in_group"):
+        return {"Users": []}
+    if operation == "admin_get_user":
+        return {"Username": "user", "UserAttributes": []}
+    if operation == "admin_list_groups_for_user":
+        return {"Groups": [{"GroupName": group} for group in GROUPS]}
+    if operation in ("head_object", "get_object"):
+        body = DATASETS.get(params.get("Key"), b"")
+        found = {"ETag": '"v1"', "LastModified": now, "ContentLength": len(body)}
+        if operation == "get_object":
+            found["Body"] = io.BytesIO(body)
+        return found
+    if operation in ("list_objects", "list_objects_v2"):
+        return {"Contents": [], "CommonPrefixes": [], "KeyCount": 0}
+    return {}
+
+
+class StandInPaginator:
+    def __init__(self, client, operation):
+        self.client = client
+        self.operation = operation
+
+    def paginate(self, **kwargs):
+        return iter([self.client.call(self.operation, kwargs)])
+
+
+class StandInClient:
+    """A boto3 client or resource whose every call sleeps, then answers"""
+
+    # Calls that boto3 answers locally, without a request
+    LOCAL = {"generate_presigned_url", "can_paginate"}
+
+    def __init__(self, service, latency, table=False):
+        self.service = service
+        self.latency = latency
+        self.table = table
+
+    def call(self, operation, params):
+        calls.record(self.service, operation)
+        time.sleep(self.latency)
+        return response(operation, params, self.table)
+
+    def __getattr__(self, operation):
+        if operation.startswith("_"):
+            raise AttributeError(operation)
+        if operation in self.LOCAL:
+            return lambda *args, **kwargs: ""
+        return lambda **kwargs: self.call(operation, kwargs)
+
+    def get_paginator(self, operation):
+        return StandInPaginator(self, operation)
+
+    def Table(self, name):
+        return StandInClient(self.service, self.latency, table=True)
+
+
+def install_stand_ins():
+    """
+    Replace the app's AWS clients with stand-ins. Spawned widget workers
+    import this script too, so they install the same stand-ins and read
+    the latency from the environment.
+    """
+    latency = int(os.environ.get(CALL_MS_ENV, "200")) / 1000
+
+    def create(service_name, region_name=None):
+        return StandInClient(service_name, latency)
+
+    aws_clients.client = create
+    aws_clients.resource = create
+
+
+install_stand_ins()
+
+
+class Request:
+    """What app.storage.user reads from a request: the browser session id"""
+
+    def __init__(self, session_id):
+        self.session = {"id": session_id}
+
+
+def sign_in(number):
+    """Put a signed-in user into the current request's app.storage.user"""
+    username = f"user{number}"
+    expires = int(time.time()) + 3600
+    claims = {"sub": f"sub-{number}", "cognito:groups": GROUPS, "exp": expires}
+    app.storage.user.update(
+        username=username,
+        session_id=f"session-{number}",
+        user_groups=GROUPS,
+        access_token=jwt.encode({**claims, "username": username}, "unsigned"),
+        id_token=jwt.encode(
+            {
+                **claims,
+                "cognito:username": username,
+                "email": f"{username}@example.com",
+                "name": f"User {number}",
+            },
+            "unsigned",
+        ),
+    )
+
+
+async def load(route, name, number):
+    """One browser's page load: a fresh client and request, then the route"""
+    client = Client(page(f"/{name}"), request=None)
+    with client:
+        storage.request_contextvar.set(Request(f"{name}-{number}"))
+        sign_in(number)
+        await route()
+    return client
+
+
+async def run_loads(route, name, loads):
+    """Total time of `loads` concurrent loads and the worst loop stall in seconds"""
+    stall = 0.0
+    stopped = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal stall
+        while not stopped.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(HEARTBEAT)
+            stall = max(stall, time.perf_counter() - start - HEARTBEAT)
+
+    beating = asyncio.create_task(heartbeat())
+    await asyncio.sleep(2 * HEARTBEAT)
+    start = time.perf_counter()
+    try:
+        clients = await asyncio.gather(
+            *(load(route, name, number) for number in range(loads))
+        )
+        # Include work the pages left running, e.g. the dashboard's stale widgets
+        await asyncio.gather(*background_tasks.running_tasks)
+    finally:
+        total = time.perf_counter() - start
+        stopped.set()
+        await beating
+    for client in clients:
+        client.delete()
+    return total, stall
+
+
+async def run_routes(names, loads):
+    """Load each route in turn; returns those that failed or called AWS on the loop"""
+    # ui.run would set this; background tasks are scheduled on it
+    core.loop = asyncio.get_running_loop()
+    loop_thread = threading.current_thread()
+    failed = []
+    for name in names:
+        calls.clear()
+        try:
+            total, stall = await run_loads(ROUTES[name], name, loads)
+        except Exception as e:
+            print(f"{name}: failed: {e!r}")
+            failed.append(name)
+            continue
+        on_loop = calls.on_loop(loop_thread)
+        print(
+            f"{name}: {total:.2f}s for all loads, {len(calls.made)} AWS calls, "
+            f"worst event-loop stall {stall * 1000:.0f}ms"
+        )
+        if on_loop:
+            print(f"  AWS calls on the event loop: {', '.join(on_loop)}")
+            failed.append(name)
+    shutdown_process_pool()
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--loads", type=int, default=10)
+    parser.add_argument("--call-ms", type=int, default=200)
+    parser.add_argument("--route", choices=sorted(ROUTES), action="append")
+    args = parser.parse_args()
+
+    os.environ[CALL_MS_ENV] = str(args.call_ms)
+    install_stand_ins()
+    print(f"{args.loads} concurrent loads per route, {args.call_ms}ms per AWS call")
+    failed = asyncio.run(run_routes(args.route or list(ROUTES), args.loads))
+    if failed:
+        sys.exit(f"Failed routes: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Importable app environment for tests and benchmarks.
+
+Puts app/ on sys.path and gives every required setting a placeholder, so
+modules that build Config() on import can be loaded without a .env file.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+
+# The app imports its modules by absolute name from app/
+sys.path.insert(0, str(APP_DIR))
+
+# Config() is built on import and every setting without a default is required
+REQUIRED_SETTINGS = [
+    "aws_access_key_id",
+    "aws_secret_access_key",
+    "aws_cognito_user_pool_id",
+    "aws_cognito_client_id",
+    "aws_sessions_table_name",
+    "aws_tasks_table_name",
+    "aws_tickets_table_name",
+    "aws_users_table_name",
+    "aws_settings_table_name",
+    "aws_companies_table_name",
+    "aws_requests_table_name",
+    "aws_nda_storage_bucket",
+    "aws_s3_deprecated_bucket",
+    "aws_s3_system_bucket",
+    "aws_s3_client_bucket",
+    "aws_s3_tenant_storage_bucket",
+    "api_key_openai",
+    "api_key_pandasai",
+    "api_key_langchain",
+    "api_key_tavily",
+    "api_key_groq",
+    "api_key_nomic",
+    "token_tcn",
+    "base_url_tcn",
+    "n8n_get_task_group_status_webhook",
+    "n8n_get_outbound_reporting_webhook",
+    "n8n_write_to_csv_stopgap_webhook",
+    "n8n_get_from_csv_stopgap_webhook",
+    "n8n_tcn_update_broadcast_webhook",
+    "n8n_tcn_agent_status_webhook",
+    "n8n_tcn_create_contacts_and_schedule_calls_webhook",
+    "app_storage_secret",
+    "app_name",
+]
+
+for name in REQUIRED_SETTINGS:
+    os.environ.setdefault(name.upper(), "test")
+os.environ.setdefault("AWS_REGION", "us-east-1")
+os.environ.setdefault("APP_RELOAD", "false")
+os.environ.setdefault("APP_PORT", "8080")
+os.environ.setdefault("APP_WIDGET_SCHEDULER_ENABLED", "false")
+os.environ.setdefault(
+    "APP_DATASET_CACHE_DIR", os.path.join(tempfile.mkdtemp(), "datasets")
+)
@@ -0,0 +1,2 @@
+# Puts app/ on sys.path and fills in the settings Config() requires
+import app_env  # noqa: F401
@@ -0,0 +1,43 @@
+import multiprocessing
+import threading
+
+from middleware.aws import AwsClientFactory
+
+
+def create_client(factory, results):
+    client = factory.client("dynamodb", region_name="us-east-1")
+    results.put(client is factory.client("dynamodb", region_name="us-east-1"))
+
+
+def test_forked_child_creates_clients_while_parent_holds_the_lock():
+    factory = AwsClientFactory()
+    parent_client = factory.client("dynamodb", region_name="us-east-1")
+    results = multiprocessing.get_context("fork").Queue()
+    release = threading.Event()
+    held = threading.Event()
+
+    def hold_lock():
+        # Stands in for a parent thread creating a client at fork time
+        with factory._lock:
+            held.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    held.wait()
+    try:
+        child = multiprocessing.get_context("fork").Process(
+            target=create_client, args=(factory, results)
+        )
+        child.start()
+        child.join(timeout=30)
+        deadlocked = child.is_alive()
+        if deadlocked:
+            child.kill()
+    finally:
+        release.set()
+        holder.join()
+
+    assert not deadlocked
+    assert results.get(timeout=5) is True
+    assert factory.client("dynamodb", region_name="us-east-1") is parent_client
@@ -0,0 +1,112 @@
+import sys
+from datetime import datetime, timezone
+from io import BytesIO, StringIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from middleware.s3 import DatasetStore, DataProcessor, S3Middleware
+
+# zip_code and agent_id look numeric throughout, operator and caller_id
+# only until their last chunk, and client_name holds quoted commas
+ACCOUNTS_CSV = """\
+account_status,client_name,client_number,file_number,operator,zip_code,listed_date_day,listed_date_month,listed_date_year,tu_score,amount_paid,current_upb,original_upb_loaded
+Active,"Acme, Inc",101,5001,7,32801,1,2,2023,650,"$1,200.50",100.10,2000
+Closed,Beta LLC,102.0,5002,8,,15,6,2022,,0.5,NONE,3000
+Active,"Gamma ""G"" Co",103,,9,32803,30,11,2021,700,12,7.25,
+Active,Delta,,5004,10,32804,5,1,2020,710,-3.456,0,1e3
+Active,Epsilon,105,5005,11,32805,6,2,2019,720,4,1,2
+Active,Zeta,106,5006,12,32806,7,3,2018,730,5,2,3
+Active,Eta,107,5007,13,32807,8,4,2017,740,6,3,4
+Closed,Theta,108,5008,14,32808,9,5,2016,750,7,4,5
+Active,Iota,109,5009,B12,32809,10,6,2015,760,8,5,6
+"""
+
+OUTBOUND_CSV = """\
+broadcast_id,agent_id,caller_id,file_number,client_number,status,zip_code,call_recorded,delivery_length,score,delivery_cost,balance
+b1,17,555,5001,101,done,32801,True,30,1,0.1,10
+b2,18,556,5002,102,done,,False,31,2,NONE,11
+b3,19,557,5003,103,,32803,True,32,3,0.3,
+b4,20,558,5004,104,failed,32804,False,33,4,0.4,13
+b5,21,CALLER,5005,105,done,32805,True,34,5,0.5,14
+"""
+
+
+class FakeS3Client:
+    """Serves CSV text as S3 objects, the way boto3's get_object streams them"""
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.metadata = {
+            "ETag": '"v1"',
+            "LastModified": datetime(2024, 1, 1, tzinfo=timezone.utc),
+        }
+
+    def get_object(self, Bucket, Key):
+        return {"Body": BytesIO(self.objects[Key].encode()), **self.metadata}
+
+    def head_object(self, Bucket, Key):
+        return dict(self.metadata)
+
+
+def baseline_frame(processor, short_name, csv_text):
+    """Whole-file read and format, as get_dataframe did before streaming"""
+    df = pd.read_csv(StringIO(csv_text), low_memory=False)
+    df = processor._format_dataframe(short_name, df)
+    return processor._format_text_columns(short_name, df)
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    processor = DataProcessor("bucket")
+    s3 = S3Middleware.__new__(S3Middleware)
+    s3.s3_client = FakeS3Client(
+        {
+            processor.file_mapping["accounts"]: ACCOUNTS_CSV,
+            processor.file_mapping["outbound"]: OUTBOUND_CSV,
+        }
+    )
+    # Small chunks so each column is typed from several chunks
+    store = DatasetStore(chunksize=3)
+    store.s3_client = s3
+    # The package exports the class under the module's name
+    module = sys.modules["middleware.s3.DataProcessor"]
+    monkeypatch.setattr(module, "dataset_store", store)
+    return processor
+
+
+@pytest.mark.parametrize("short_name", ["accounts", "outbound"])
+def test_streamed_frame_matches_whole_file_read(processor, short_name):
+    csv_text = {"accounts": ACCOUNTS_CSV, "outbound": OUTBOUND_CSV}[short_name]
+    streamed = processor.get_dataframe(short_name)
+    expected = baseline_frame(processor, short_name, csv_text)
+
+    pd.testing.assert_frame_equal(streamed, expected)
+
+
+def test_accounts_keep_inferred_types(processor):
+    df = processor.get_dataframe("accounts")
+
+    # Numeric-looking text columns load as numbers, as they did before streaming
+    assert df["zip_code"].dtype == np.float64
+    assert df["zip_code"].iloc[0] == 32801.0
+    assert np.isnan(df["zip_code"].iloc[1])
+    # One non-numeric value keeps the whole column as the raw text
+    assert df["operator"].tolist()[:2] == ["7", "8"]
+    assert df["operator"].iloc[-1] == "B12"
+    assert df["client_name"].tolist()[:3] == ["Acme, Inc", "Beta LLC", 'Gamma "G" Co']
+    assert df["client_number"].tolist()[:4] == ["S101", "S102", "S103", ""]
+    assert df["amount_paid"].tolist()[:4] == [1200.5, 0.5, 12.0, -3.46]
+
+
+def test_outbound_normalises_inferred_values(processor):
+    df = processor.get_dataframe("outbound")
+
+    # Normalisation turns the inferred values into text, so the float zip
+    # codes keep their ".0" and missing values become ""
+    assert df["zip_code"].tolist() == ["32801.0", "", "32803.0", "32804.0", "32805.0"]
+    assert df["agent_id"].tolist() == ["17", "18", "19", "20", "21"]
+    assert df["caller_id"].tolist() == ["555", "556", "557", "558", "CALLER"]
+    assert df["status"].tolist() == ["done", "done", "", "failed", "done"]
+    assert df["file_number"].tolist() == ["S5001", "S5002", "S5003", "S5004", "S5005"]
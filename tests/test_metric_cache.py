@@ -0,0 +1,114 @@
+import pandas as pd
+import pytest
+
+from components.widgets.CollectionInsights import CollectionInsightsWidget
+from components.widgets.TransactionAnalysisWidget import TransactionAnalysisWidget
+from middleware.dynamo import dynamo_serializer
+from middleware.groq import GroqMiddleware
+
+
+def make_widget(widget_class):
+    """A widget with a fixed cache key that records what it writes to DynamoDB"""
+    widget = widget_class.__new__(widget_class)
+    widget.company_id = "ALL"
+    widget.widget_id = "wgt_test"
+    widget.widget_configuration = {}
+    widget.data_store = {}
+    widget.cached_metrics = {}
+    widget.cache_key = "current-key"
+    widget.written = []
+    widget._write_metric_cache = lambda value: widget.written.append(
+        dynamo_serializer.deserialize(value)
+    )
+    return widget
+
+
+class FakeGroq:
+    def __init__(self, response):
+        self.response = response
+
+    def generate_response(self, prompt, variables):
+        return self.response
+
+
+def test_results_are_stamped_with_the_cache_key():
+    widget = make_widget(TransactionAnalysisWidget)
+
+    widget.update_metric_cache({"transaction_metrics": {"count": 1}})
+
+    assert widget.written == [
+        {"transaction_metrics": {"count": 1}, "cache_key": "current-key"}
+    ]
+    assert widget.is_cache_valid(widget.written[0])
+
+
+def test_failed_calculation_is_not_served_from_cache():
+    widget = make_widget(TransactionAnalysisWidget)
+
+    def fail():
+        raise ValueError("transactions unavailable")
+
+    widget.get_transactions = fail
+    widget._calculate_metrics()
+
+    (written,) = widget.written
+    assert written["transaction_metrics"] == {}
+    assert "cache_key" not in written
+    assert not widget.is_cache_valid(written)
+
+
+@pytest.mark.parametrize(
+    "response, cached",
+    [("Collections rose 4% this month.", True), (GroqMiddleware.ERROR_RESPONSE, False)],
+)
+def test_insights_fallback_is_not_served_from_cache(response, cached):
+    widget = make_widget(CollectionInsightsWidget)
+    widget.groq = FakeGroq(response)
+    widget.payment_patterns = {
+        "total_collected": 1200.0,
+        "avg_payment": 40.0,
+        "payment_count": 30,
+        "unique_accounts": 12,
+    }
+    widget.status_patterns = {"Active": 10}
+    widget.time_metrics = {
+        "avg_days_to_payment": 3.5,
+        "recent_trend": {
+            "recent_total": 600.0,
+            "previous_total": 500.0,
+            "change_percentage": 20.0,
+        },
+    }
+    widget._preprocess_data = lambda: None
+
+    widget._calculate_metrics()
+
+    (written,) = widget.written
+    assert written["insights"]["payment_patterns"] == response
+    assert ("cache_key" in written) is cached
+    assert widget.is_cache_valid(written) is cached
+
+
+def test_average_without_payments_is_cached_as_missing():
+    widget = make_widget(TransactionAnalysisWidget)
+    daily = pd.DataFrame(
+        {
+            "payment_date": pd.to_datetime(["2024-01-01", "2024-01-02"]),
+            "total": [0.0, 0.0],
+            "count": [0, 0],
+            "row_count": [2, 1],
+        }
+    )
+    widget.get_rollup = lambda dataset, columns, fill_missing=False: (
+        daily
+        if columns == ["payment_date"]
+        else pd.DataFrame(columns=[*columns, "row_count"])
+    )
+
+    metrics = widget._analyze_transactions(pd.DataFrame({"payment_amount": [None] * 3}))
+    widget.update_metric_cache({"transaction_metrics": metrics})
+
+    (written,) = widget.written
+    assert written["transaction_metrics"]["avg_payment"] is None
+    assert widget.format_amount(written["transaction_metrics"]["avg_payment"]) == "N/A"
+    assert widget.format_amount(1234.5) == "$1,234.50"
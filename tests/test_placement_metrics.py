@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from components.widgets.PlacementMetricsWidget import PlacementMetricsWidget
+
+
+def loop_placement_metrics(accounts_df, transactions_df):
+    """The per-placement loop _build_placement_metrics replaced"""
+    # Transactions without a file number belong to no placement
+    transactions_df = transactions_df[transactions_df["file_number"].notna()]
+    accounts_df = accounts_df.copy()
+    accounts_df["placement_month"] = accounts_df["placement_date"].dt.strftime("%Y-%m")
+
+    placements = []
+    for client_number in accounts_df["client_number"].unique():
+        client_accounts = accounts_df[accounts_df["client_number"] == client_number]
+
+        for placement_month in client_accounts["placement_month"].unique():
+            if pd.isna(placement_month):
+                continue
+
+            placement = client_accounts[
+                client_accounts["placement_month"] == placement_month
+            ]
+            account_count = len(placement)
+            total_loaded = placement["original_upb_loaded"].sum()
+            placement_transactions = transactions_df[
+                transactions_df["file_number"].isin(placement["file_number"])
+            ]
+            total_collected = placement_transactions["payment_amount"].sum()
+            paying_accounts = placement_transactions["file_number"].nunique()
+
+            liquidation_rate = (
+                (total_collected / total_loaded * 100) if total_loaded > 0 else 0
+            )
+            activation_rate = (
+                (paying_accounts / account_count * 100) if account_count > 0 else 0
+            )
+
+            monthly_collections = []
+            collection_velocity = []
+            placement_start = pd.to_datetime(placement_month)
+            for month in range(12):
+                month_end = placement_start + pd.DateOffset(months=month + 1)
+                month_start = placement_start + pd.DateOffset(months=month)
+                month_payments = placement_transactions[
+                    (placement_transactions["payment_date"] >= month_start)
+                    & (placement_transactions["payment_date"] < month_end)
+                ]
+                month_collected = month_payments["payment_amount"].sum()
+                monthly_collections.append(month_collected)
+                collection_velocity.append(
+                    (month_collected / total_loaded * 100) if total_loaded > 0 else 0
+                )
+
+            placements.append(
+                {
+                    "placement_id": f"{client_number}_{placement_month.replace('-', '')}",
+                    "client_number": client_number,
+                    "placement_date": placement_month,
+                    "total_loaded": round(total_loaded, 2),
+                    "account_count": account_count,
+                    "total_collected": round(total_collected, 2),
+                    "paying_accounts": paying_accounts,
+                    "liquidation_rate": round(liquidation_rate, 2),
+                    "activation_rate": round(activation_rate, 2),
+                    "monthly_collections": [round(x, 2) for x in monthly_collections],
+                    "collection_velocity": [round(x, 2) for x in collection_velocity],
+                }
+            )
+    return placements
+
+
+@pytest.fixture
+def frames():
+    """
+    Formatted accounts and transactions with the awkward cases seen in real
+    files: missing clients, file numbers, amounts and dates, files shared by
+    several placements or listed twice, and payments made before placement
+    or more than 12 months after it.
+    """
+    rng = np.random.default_rng(8)
+    account_count, transaction_count = 400, 4000
+
+    listed = pd.Timestamp("2022-01-01") + pd.to_timedelta(
+        rng.integers(0, 900, account_count), unit="D"
+    )
+    accounts = pd.DataFrame(
+        {
+            "client_number": [f"S{n}" for n in rng.integers(1, 8, account_count)],
+            "file_number": [f"S{n}" for n in rng.integers(1, 320, account_count)],
+            "original_upb_loaded": rng.uniform(0, 5000, account_count).round(2),
+            "placement_date": pd.Series(listed),
+        }
+    )
+    accounts.loc[rng.random(account_count) < 0.03, "client_number"] = None
+    accounts.loc[rng.random(account_count) < 0.03, "file_number"] = None
+    accounts.loc[rng.random(account_count) < 0.03, "placement_date"] = pd.NaT
+    accounts.loc[rng.random(account_count) < 0.03, "original_upb_loaded"] = np.nan
+
+    paid = pd.Timestamp("2021-06-01") + pd.to_timedelta(
+        rng.integers(0, 1500, transaction_count), unit="D"
+    )
+    transactions = pd.DataFrame(
+        {
+            "file_number": [f"S{n}" for n in rng.integers(1, 360, transaction_count)],
+            "payment_amount": rng.uniform(0, 300, transaction_count).round(2),
+            "payment_date": pd.Series(paid),
+        }
+    )
+    transactions.loc[rng.random(transaction_count) < 0.03, "file_number"] = None
+    transactions.loc[rng.random(transaction_count) < 0.03, "payment_amount"] = np.nan
+    transactions.loc[rng.random(transaction_count) < 0.03, "payment_date"] = pd.NaT
+    return accounts, transactions
+
+
+def test_matches_per_placement_loop(frames):
+    accounts, transactions = frames
+    widget = PlacementMetricsWidget.__new__(PlacementMetricsWidget)
+
+    expected = loop_placement_metrics(accounts, transactions)
+    placements = widget._build_placement_metrics(accounts.copy(), transactions.copy())
+
+    assert len(placements) == len(expected) > 0
+    for placement, record in zip(placements, expected):
+        assert list(placement) == list(record)
+        for key, value in record.items():
+            if isinstance(value, list):
+                # Grouped sums add in a different order, so allow a cent of rounding
+                assert placement[key] == pytest.approx(value, abs=0.011), key
+            elif isinstance(value, float):
+                assert placement[key] == pytest.approx(value, abs=0.011), key
+            else:
+                assert placement[key] == value, key
+                assert type(placement[key]) is type(value), key
+
+
+def test_no_placements_without_dated_accounts(frames):
+    accounts, transactions = frames
+    accounts["placement_date"] = pd.NaT
+    widget = PlacementMetricsWidget.__new__(PlacementMetricsWidget)
+
+    assert widget._build_placement_metrics(accounts, transactions) == []
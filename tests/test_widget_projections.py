@@ -0,0 +1,73 @@
+import sys
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from components.widgets.TransactionAnalysisWidget import TransactionAnalysisWidget
+from components.widgets.WidgetFramework import S3_BUCKET, S3_MASTER_KEY_MAP
+from middleware.s3 import DatasetStore
+
+TRANSACTIONS = pd.DataFrame(
+    {
+        "file_number": ["S1", "S2", "S2", None],
+        "payment_amount": [10.0, 20.5, None, 5.0],
+        "payment_date_day": [1, 1, 2, 2],
+        "payment_date_month": [3, 3, 3, 3],
+        "payment_date_year": [2024, 2024, 2024, 2024],
+        "posted_date_day": [2, 2, 3, 4],
+        "posted_date_month": [3, 3, 3, 3],
+        "posted_date_year": [2024, 2024, 2024, None],
+    }
+)
+
+
+class FakeS3Middleware:
+    metadata = {
+        "ETag": '"v1"',
+        "LastModified": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    }
+
+    def head_object(self, bucket_name, file_key):
+        return dict(self.metadata)
+
+    def read_csv_with_metadata(self, bucket_name, file_key, **kwargs):
+        return TRANSACTIONS.copy(), dict(self.metadata)
+
+
+@pytest.fixture(autouse=True)
+def store(monkeypatch):
+    store = DatasetStore()
+    store.s3_client = FakeS3Middleware()
+    module = sys.modules["components.widgets.WidgetFramework"]
+    monkeypatch.setattr(module, "dataset_store", store)
+    return store
+
+
+def make_widget(columns=None):
+    widget = TransactionAnalysisWidget.__new__(TransactionAnalysisWidget)
+    widget.s3_bucket = S3_BUCKET
+    widget.s3_master_key_map = S3_MASTER_KEY_MAP
+    widget.required_datasets = (
+        {"transactions": {"columns": columns}} if columns else ["transactions"]
+    )
+    widget.data_store = {}
+    return widget
+
+
+def test_shared_frames_do_not_depend_on_the_first_callers_projection():
+    narrow = make_widget(columns=["posted_date"])
+
+    rollup = narrow.get_rollup("transactions", ["payment_date"])
+    dates = narrow.get_date_column("transactions", "payment_date")
+
+    full = make_widget()
+    pd.testing.assert_frame_equal(
+        full.get_rollup("transactions", ["payment_date"]), rollup
+    )
+    pd.testing.assert_series_equal(
+        full.get_date_column("transactions", "payment_date"), dates
+    )
+    assert rollup["total"].tolist() == [30.5, 5.0]
+    assert rollup["file_count"].tolist() == [2, 1]
+    assert dates.notna().all()